@@ -18,7 +18,10 @@ export const createBlog = async (blogData) => {
 };
 
 export const fetchAdminBlogs = async () => {
-  const response = await api.get(ENDPOINTS.adminBlogs);
+  // The editor needs each post's content, which lists omit by default
+  const response = await api.get(ENDPOINTS.adminBlogs, {
+    params: { full: 1 },
+  });
   return response.data;
 };
 
@@ -44,7 +44,7 @@ const Blog = () => {
 
     const title = (blog.title ?? "").toLowerCase();
     const author = (blog.author_name ?? "").toLowerCase();
-    const content = (blog.content ?? "").toLowerCase();
+    const content = (blog.content ?? blog.preview ?? "").toLowerCase();
 
     const matchesSearch =
       title.includes(searchTerm.toLowerCase()) ||
@@ -2,6 +2,8 @@ from flask import Flask, jsonify
 from flask_migrate import Migrate
 from flask_cors import CORS
 from routes import register_routes
+from commands import register_commands
+from utils.response_cache import response_cache
 from models import db
 from dotenv import load_dotenv
 import os
@@ -70,13 +72,19 @@ def create_app(config_name="development"):
 
     from models import (
         blog,
+        blog_related,
         booking,
+        booking_series,
+        cache_version,
         comment,
         document,
+        idempotency,
         invoice,
         newsletter_subscriber,
         payment,
+        revenue_rollup,
         service,
+        stats_counter,
         ticket_message,
         ticket,
         token,
@@ -86,6 +94,16 @@ def create_app(config_name="development"):
 
     # Register Blueprints
     register_routes(app)
+    register_commands(app)
+    response_cache.init_app(app)
+
+    @app.before_request
+    def start_background_workers():
+        from utils.blog_counters import blog_counter_buffer
+        from utils.booking_reminders import booking_reminder_scheduler
+
+        booking_reminder_scheduler.ensure_started()
+        blog_counter_buffer.ensure_started()
 
     # CORs setup
     netlify_pr_regex = r"^https:\/\/deploy-preview-\d+--ecovibe-develop\.netlify\.app$"
@@ -0,0 +1,299 @@
+"""
+Local stand-in for the Safaricom Daraja API.
+
+Implements the three endpoints ``utils.mpesa_utils`` talks to (OAuth token,
+STK push and STK push query) and delivers STK callbacks asynchronously to
+the ``CallBackURL`` from each push, with configurable latency and failure
+rates. Point the ``FLASK_MPESA_*_URL`` variables at it to exercise the
+payment path without the live sandbox:
+
+    python -m benchmarks.daraja_simulator --port 8000
+"""
+
+import argparse
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import requests
+from flask import Flask, jsonify, request
+from werkzeug.serving import make_server
+
+AUTH_PATH = "/oauth/v1/generate"
+STK_PUSH_PATH = "/mpesa/stkpush/v1/processrequest"
+STK_QUERY_PATH = "/mpesa/stkpushquery/v1/query"
+
+# Daraja result code sent when the customer cancels the prompt
+RESULT_CANCELLED = 1032
+
+
+def http_sender(url, payload, timeout=10):
+    """Deliver a callback over HTTP; return the response status code."""
+    try:
+        return requests.post(url, json=payload, timeout=timeout).status_code
+    except requests.exceptions.RequestException:
+        return None
+
+
+class DarajaSimulator:
+    """
+    In-process Daraja simulator.
+
+    ``callback_latency`` and ``callback_jitter`` (seconds) control how long
+    after a push its callback is sent. ``failure_rate`` is the share of
+    pushes whose callback reports a cancelled payment, ``reject_rate`` the
+    share of pushes refused outright and ``drop_rate`` the share of
+    callbacks that are never delivered. ``sender`` posts a callback and
+    returns the HTTP status code; tests can swap it for an in-memory sink.
+    """
+
+    def __init__(
+        self,
+        callback_latency=0.5,
+        callback_jitter=0.0,
+        failure_rate=0.0,
+        reject_rate=0.0,
+        drop_rate=0.0,
+        token_ttl=3599,
+        sender=http_sender,
+        seed=None,
+    ):
+        self.callback_latency = callback_latency
+        self.callback_jitter = callback_jitter
+        self.failure_rate = failure_rate
+        self.reject_rate = reject_rate
+        self.drop_rate = drop_rate
+        self.token_ttl = token_ttl
+        self.sender = sender
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._timers = set()
+
+        # CheckoutRequestID -> {"result_code", "status", "delivered_at", ...}
+        self.pushes = {}
+        self.stats = {
+            "tokens_issued": 0,
+            "pushes": 0,
+            "rejected": 0,
+            "callbacks_sent": 0,
+            "callbacks_acked": 0,
+            "callbacks_failed": 0,
+            "callbacks_dropped": 0,
+        }
+        self.app = self._create_app()
+
+    # --- Flask app ---
+    def _create_app(self):
+        app = Flask("daraja_simulator")
+
+        @app.route(AUTH_PATH, methods=["GET"])
+        def oauth():
+            if not request.headers.get("Authorization", "").startswith("Basic "):
+                return jsonify({"errorMessage": "Invalid Authentication"}), 400
+            self._count("tokens_issued")
+            return jsonify(
+                {"access_token": uuid.uuid4().hex, "expires_in": str(self.token_ttl)}
+            )
+
+        @app.route(STK_PUSH_PATH, methods=["POST"])
+        def stk_push():
+            return jsonify(self.handle_stk_push(request.get_json(silent=True) or {}))
+
+        @app.route(STK_QUERY_PATH, methods=["POST"])
+        def stk_query():
+            payload = request.get_json(silent=True) or {}
+            return jsonify(self.handle_stk_query(payload.get("CheckoutRequestID")))
+
+        return app
+
+    # --- Endpoint logic ---
+    def handle_stk_push(self, payload):
+        """Accept or reject a push and schedule its callback."""
+        self._count("pushes")
+
+        if self._random.random() < self.reject_rate:
+            self._count("rejected")
+            return {
+                "ResponseCode": "1",
+                "ResponseDescription": "Rejected by simulator",
+            }
+
+        checkout_request_id = f"ws_CO_{uuid.uuid4().hex[:20]}"
+        merchant_request_id = f"{self._random.randint(10000, 99999)}-sim"
+        failed = self._random.random() < self.failure_rate
+        push = {
+            "merchant_request_id": merchant_request_id,
+            "amount": payload.get("Amount"),
+            "phone_number": payload.get("PhoneNumber"),
+            "callback_url": payload.get("CallBackURL"),
+            "result_code": RESULT_CANCELLED if failed else 0,
+            "status": "pending",
+            "delivered_at": None,
+        }
+        with self._lock:
+            self.pushes[checkout_request_id] = push
+
+        if self._random.random() < self.drop_rate:
+            self._count("callbacks_dropped")
+            push["status"] = "dropped"
+        else:
+            delay = self.callback_latency + self._random.uniform(
+                0, self.callback_jitter
+            )
+            self._schedule(delay, checkout_request_id)
+
+        return {
+            "MerchantRequestID": merchant_request_id,
+            "CheckoutRequestID": checkout_request_id,
+            "ResponseCode": "0",
+            "ResponseDescription": "Success. Request accepted for processing",
+            "CustomerMessage": "Success. Request accepted for processing",
+        }
+
+    def handle_stk_query(self, checkout_request_id):
+        """Report the outcome of a push the way the query API does."""
+        push = self.pushes.get(checkout_request_id)
+        if not push:
+            return {
+                "ResponseCode": "1",
+                "ResponseDescription": "The transaction is being processed",
+            }
+        if push["status"] == "pending":
+            return {
+                "ResponseCode": "1",
+                "ResponseDescription": "The transaction is being processed",
+            }
+        return {
+            "ResponseCode": "0",
+            "ResponseDescription": "The service request has been accepted",
+            "MerchantRequestID": push["merchant_request_id"],
+            "CheckoutRequestID": checkout_request_id,
+            "ResultCode": str(push["result_code"]),
+            "ResultDesc": self._result_desc(push["result_code"]),
+        }
+
+    # --- Callbacks ---
+    def build_callback(self, checkout_request_id):
+        """Build the callback body Daraja would send for a push."""
+        push = self.pushes[checkout_request_id]
+        stk_callback = {
+            "MerchantRequestID": push["merchant_request_id"],
+            "CheckoutRequestID": checkout_request_id,
+            "ResultCode": push["result_code"],
+            "ResultDesc": self._result_desc(push["result_code"]),
+        }
+        if push["result_code"] == 0:
+            stk_callback["CallbackMetadata"] = {
+                "Item": [
+                    {"Name": "Amount", "Value": push["amount"]},
+                    {"Name": "MpesaReceiptNumber", "Value": self._receipt_number()},
+                    {
+                        "Name": "TransactionDate",
+                        "Value": int(datetime.now().strftime("%Y%m%d%H%M%S")),
+                    },
+                    {"Name": "PhoneNumber", "Value": push["phone_number"]},
+                ]
+            }
+        return {"Body": {"stkCallback": stk_callback}}
+
+    def deliver_callback(self, checkout_request_id):
+        """Send the callback for a push and record whether it was acked."""
+        push = self.pushes[checkout_request_id]
+        payload = self.build_callback(checkout_request_id)
+        self._count("callbacks_sent")
+        status_code = self.sender(push["callback_url"], payload)
+
+        push["delivered_at"] = time.monotonic()
+        if status_code == 200:
+            push["status"] = "acked"
+            self._count("callbacks_acked")
+        else:
+            push["status"] = "failed"
+            self._count("callbacks_failed")
+        return status_code
+
+    def _schedule(self, delay, checkout_request_id):
+        timer = threading.Timer(delay, self._fire, args=(checkout_request_id,))
+        timer.daemon = True
+        with self._lock:
+            self._timers.add(timer)
+        timer.start()
+
+    def _fire(self, checkout_request_id):
+        try:
+            self.deliver_callback(checkout_request_id)
+        finally:
+            with self._lock:
+                self._timers = {t for t in self._timers if t.is_alive()}
+
+    def pending_callbacks(self):
+        """Number of callbacks scheduled but not yet delivered."""
+        with self._lock:
+            return sum(1 for t in self._timers if t.is_alive())
+
+    # --- Helpers ---
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _receipt_number(self):
+        alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+        return "".join(self._random.choice(alphabet) for _ in range(10))
+
+    @staticmethod
+    def _result_desc(result_code):
+        if result_code == 0:
+            return "The service request is processed successfully."
+        return "Request cancelled by user"
+
+    # --- Serving ---
+    def serve(self, host="127.0.0.1", port=0):
+        """Serve the simulator on a background thread; return the server."""
+        server = make_server(host, port, self.app, threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        return server
+
+    def environment(self, base_url, callback_url):
+        """``FLASK_MPESA_*`` variables pointing ``mpesa_utility`` at us."""
+        return {
+            "FLASK_MPESA_CONSUMER_KEY": "simulator-key",
+            "FLASK_MPESA_CONSUMER_SECRET": "simulator-secret",
+            "FLASK_MPESA_BUSINESS_SHORTCODE": "174379",
+            "FLASK_MPESA_PASSKEY": "simulator-passkey",
+            "FLASK_MPESA_AUTH_URL": f"{base_url}{AUTH_PATH}",
+            "FLASK_MPESA_STK_PUSH_URL": f"{base_url}{STK_PUSH_PATH}",
+            "FLASK_MPESA_QUERY_URL": f"{base_url}{STK_QUERY_PATH}",
+            "FLASK_MPESA_CALLBACK_URL": callback_url,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local Daraja simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--callback-latency", type=float, default=0.5)
+    parser.add_argument("--callback-jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--reject-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    simulator = DarajaSimulator(
+        callback_latency=args.callback_latency,
+        callback_jitter=args.callback_jitter,
+        failure_rate=args.failure_rate,
+        reject_rate=args.reject_rate,
+        drop_rate=args.drop_rate,
+    )
+    base_url = f"http://{args.host}:{args.port}"
+    print(f"Daraja simulator listening on {base_url}")
+    for name, value in simulator.environment(base_url, "<your callback>").items():
+        print(f"  {name}={value}")
+    make_server(args.host, args.port, simulator.app, threaded=True).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
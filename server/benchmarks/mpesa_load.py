@@ -0,0 +1,357 @@
+"""
+End-to-end load benchmark for the M-Pesa payment path.
+
+Starts the API and a local Daraja simulator on loopback ports, seeds one
+pending invoice per transaction, then drives ``POST /mpesa/stk-push`` at a
+target rate. The simulator calls back into ``/mpesa/callback`` and the run
+waits for every accepted push to settle (invoice paid or transaction
+failed). Reports throughput, latency percentiles, SQL queries per
+transaction and lost callbacks:
+
+    python -m benchmarks.mpesa_load --rate 20 --duration 15
+    python -m benchmarks.mpesa_load --database-url postgresql://... --json
+
+Runs entirely offline; use a throwaway database because tables are created
+and seeded in it.
+"""
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import email_validator
+import requests
+from sqlalchemy import event
+from werkzeug.serving import make_server
+
+from benchmarks.daraja_simulator import DarajaSimulator, http_sender
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values`` (None when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(values):
+    """Latency summary in milliseconds."""
+    return {
+        "count": len(values),
+        "p50_ms": _ms(percentile(values, 50)),
+        "p90_ms": _ms(percentile(values, 90)),
+        "p99_ms": _ms(percentile(values, 99)),
+        "max_ms": _ms(max(values) if values else None),
+    }
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+class QueryCounter:
+    """Counts SQL statements issued by request threads."""
+
+    def __init__(self, engine):
+        self.count = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def ignore_current_thread(self):
+        self._local.ignore = True
+
+    def _on_execute(self, *args, **kwargs):
+        if getattr(self._local, "ignore", False):
+            return
+        with self._lock:
+            self.count += 1
+
+
+class MpesaLoadBenchmark:
+    def __init__(self, args):
+        self.args = args
+        self.total = max(1, int(args.rate * args.duration))
+        self.push_latencies = []
+        self.callback_latencies = []
+        self.settle_latencies = []
+        self.push_errors = 0
+        self.started = {}  # invoice_id -> monotonic start
+        self.settled = {}  # invoice_id -> transaction status
+        self._lock = threading.Lock()
+
+    # --- Setup ---
+    def setup(self):
+        # Seeded users must validate offline
+        email_validator.CHECK_DELIVERABILITY = False
+        for name in ("urllib3", "werkzeug"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+        self.simulator = DarajaSimulator(
+            callback_latency=self.args.callback_latency,
+            callback_jitter=self.args.callback_jitter,
+            failure_rate=self.args.failure_rate,
+            reject_rate=self.args.reject_rate,
+            drop_rate=self.args.drop_rate,
+            sender=self._timed_sender,
+            seed=self.args.seed,
+        )
+        simulator_server = self.simulator.serve()
+        simulator_url = f"http://127.0.0.1:{simulator_server.server_port}"
+
+        os.environ.setdefault("FLASK_CORS_ALLOWED_ORIGINS", "*")
+        os.environ["FLASK_SQLALCHEMY_DATABASE_URI"] = self.args.database_url
+
+        from app import create_app
+        from models import db
+        from routes import API
+
+        self.app = create_app()
+        self.db = db
+        app_server = make_server("127.0.0.1", 0, self.app, threaded=True)
+        self.base_url = f"http://127.0.0.1:{app_server.server_port}{API}"
+        os.environ.update(
+            self.simulator.environment(simulator_url, f"{self.base_url}/mpesa/callback")
+        )
+
+        with self.app.app_context():
+            db.create_all()
+            self.invoice_ids, self.token = self._seed()
+            self.queries = QueryCounter(db.engine)
+            self.backend = db.engine.url.get_backend_name()
+
+        threading.Thread(target=app_server.serve_forever, daemon=True).start()
+
+    def _seed(self):
+        from flask_jwt_extended import create_access_token
+        from models.invoice import Invoice, InvoiceStatus
+        from models.service import Service, ServiceStatus
+        from models.user import AccountStatus, Role, User
+
+        db = self.db
+        suffix = int(time.time())
+        user = User(
+            full_name="Benchmark Admin",
+            email=f"bench-{suffix}@ecovibe.co.ke",
+            phone_number=f"+2547{suffix % 100000000:08d}",
+            role=Role.ADMIN,
+            industry="Benchmark",
+            account_status=AccountStatus.ACTIVE,
+        )
+        user.set_password("Benchmark123")
+        db.session.add(user)
+        db.session.flush()
+
+        service = Service(
+            title="Benchmark Service",
+            description="Seeded by the M-Pesa load benchmark",
+            price=100.0,
+            duration="1 hr 0 min",
+            image=b"benchmark",
+            status=ServiceStatus.ACTIVE,
+            admin_id=user.id,
+        )
+        db.session.add(service)
+        db.session.flush()
+
+        invoices = [
+            Invoice(
+                amount=100,
+                client_id=user.id,
+                service_id=service.id,
+                due_date=date.today() + timedelta(days=30),
+                status=InvoiceStatus.pending,
+            )
+            for _ in range(self.total)
+        ]
+        db.session.add_all(invoices)
+        db.session.commit()
+        return [inv.id for inv in invoices], create_access_token(identity=str(user.id))
+
+    # --- Load ---
+    def _timed_sender(self, url, payload):
+        start = time.monotonic()
+        status_code = http_sender(url, payload)
+        with self._lock:
+            self.callback_latencies.append(time.monotonic() - start)
+        return status_code
+
+    def _push(self, invoice_id, not_before):
+        delay = not_before - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        start = time.monotonic()
+        try:
+            response = requests.post(
+                f"{self.base_url}/mpesa/stk-push",
+                json={
+                    "amount": 100,
+                    "phone_number": "254712345678",
+                    "invoice_id": invoice_id,
+                    "description": "Benchmark",
+                },
+                headers={"Authorization": f"Bearer {self.token}"},
+                timeout=30,
+            )
+            ok = response.status_code == 200
+        except requests.exceptions.RequestException:
+            ok = False
+        elapsed = time.monotonic() - start
+
+        with self._lock:
+            self.push_latencies.append(elapsed)
+            if ok:
+                self.started[invoice_id] = start
+            else:
+                self.push_errors += 1
+
+    def _poll_settled(self, stop):
+        from models.payment import MpesaTransaction
+
+        self.queries.ignore_current_thread()
+        with self.app.app_context():
+            while not stop.is_set():
+                with self._lock:
+                    outstanding = [i for i in self.started if i not in self.settled]
+                if outstanding:
+                    rows = (
+                        self.db.session.query(
+                            MpesaTransaction.invoice_id, MpesaTransaction.status
+                        )
+                        .filter(
+                            MpesaTransaction.invoice_id.in_(outstanding),
+                            MpesaTransaction.callback_received.is_(True),
+                        )
+                        .all()
+                    )
+                    now = time.monotonic()
+                    with self._lock:
+                        for invoice_id, status in rows:
+                            self.settled[invoice_id] = status
+                            self.settle_latencies.append(now - self.started[invoice_id])
+                    self.db.session.remove()
+                stop.wait(self.args.poll_interval)
+
+    def run(self):
+        self.setup()
+        stop = threading.Event()
+        poller = threading.Thread(target=self._poll_settled, args=(stop,), daemon=True)
+        poller.start()
+
+        interval = 1.0 / self.args.rate
+        t0 = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.args.concurrency) as pool:
+            for n, invoice_id in enumerate(self.invoice_ids):
+                pool.submit(self._push, invoice_id, t0 + n * interval)
+        push_elapsed = time.monotonic() - t0
+
+        # Wait for every callback the simulator actually sent to be applied
+        deadline = time.monotonic() + self.args.settle_timeout
+        while time.monotonic() < deadline:
+            stats = self.simulator.stats
+            undeliverable = stats["callbacks_dropped"] + stats["callbacks_failed"]
+            with self._lock:
+                done = len(self.settled) + undeliverable >= len(self.started)
+            if done and not self.simulator.pending_callbacks():
+                break
+            time.sleep(self.args.poll_interval)
+        total_elapsed = time.monotonic() - t0
+        stop.set()
+        poller.join()
+
+        return self.report(push_elapsed, total_elapsed)
+
+    # --- Report ---
+    def report(self, push_elapsed, total_elapsed):
+        accepted = len(self.started)
+        paid = sum(1 for status in self.settled.values() if status == "completed")
+        stats = self.simulator.stats
+        return {
+            "config": {
+                "target_rate": self.args.rate,
+                "transactions": self.total,
+                "concurrency": self.args.concurrency,
+                "callback_latency_s": self.args.callback_latency,
+                "failure_rate": self.args.failure_rate,
+                "reject_rate": self.args.reject_rate,
+                "drop_rate": self.args.drop_rate,
+                "database": self.backend,
+            },
+            "throughput": {
+                "stk_push_per_s": round(self.total / push_elapsed, 2),
+                "settled_per_s": round(len(self.settled) / total_elapsed, 2),
+            },
+            "stk_push_latency": summarize(self.push_latencies),
+            "callback_ack_latency": summarize(self.callback_latencies),
+            "push_to_settled_latency": summarize(self.settle_latencies),
+            "transactions": {
+                "attempted": self.total,
+                "accepted": accepted,
+                "push_errors": self.push_errors,
+                "settled": len(self.settled),
+                "invoices_paid": paid,
+                "failed": len(self.settled) - paid,
+            },
+            "callbacks": {
+                "sent": stats["callbacks_sent"],
+                "acked": stats["callbacks_acked"],
+                "rejected_by_api": stats["callbacks_failed"],
+                "dropped_by_simulator": stats["callbacks_dropped"],
+                "lost": accepted - len(self.settled),
+            },
+            "queries": {
+                "total": self.queries.count,
+                "per_transaction": (
+                    round(self.queries.count / accepted, 2) if accepted else None
+                ),
+            },
+        }
+
+
+def print_report(report):
+    print("M-Pesa payment path benchmark")
+    for section, values in report.items():
+        print(f"\n{section}")
+        for key, value in values.items():
+            print(f"  {key:<28} {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the M-Pesa payment path")
+    parser.add_argument("--rate", type=float, default=10.0, help="pushes per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--callback-latency", type=float, default=0.2)
+    parser.add_argument("--callback-jitter", type=float, default=0.3)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--reject-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--settle-timeout", type=float, default=30.0)
+    parser.add_argument("--poll-interval", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--database-url",
+        default=f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'mpesa_bench.db')}",
+        help="throwaway database (default: fresh SQLite file)",
+    )
+    parser.add_argument("--json", action="store_true", help="print JSON report")
+    args = parser.parse_args()
+
+    report = MpesaLoadBenchmark(args).run()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import click
+from flask import Flask
+from utils.availability import sync_booking_end_times
+from utils.blog_comments import recount_blog_comments
+from utils.blog_related import rebuild_related_blogs, refresh_pending_related_blogs
+from utils.booking_reminders import booking_reminder_scheduler
+from utils.idempotency import sweep_idempotency_keys
+from utils.invoice_aging import invoice_aging_summary, mark_overdue_invoices
+from utils.mpesa_inbox import drain_mpesa_inbox, INBOX_BATCH_SIZE
+from utils.revenue_rollup import refresh_revenue_rollup
+from utils.stats_counters import recompute_stats
+
+
+@click.command("process-mpesa-inbox")
+@click.option("--batch-size", default=INBOX_BATCH_SIZE, show_default=True)
+def process_mpesa_inbox_command(batch_size):
+    """Apply all pending MPESA callbacks from the inbox."""
+    processed = drain_mpesa_inbox(batch_size)
+    click.echo(f"Processed {processed} MPESA callback(s)")
+
+
+@click.command("sweep-idempotency-keys")
+def sweep_idempotency_keys_command():
+    """Delete expired Idempotency-Key records."""
+    removed = sweep_idempotency_keys()
+    click.echo(f"Removed {removed} expired idempotency key(s)")
+
+
+@click.command("sync-booking-end-times")
+@click.option("--service-id", type=int, default=None)
+def sync_booking_end_times_command(service_id):
+    """Realign upcoming bookings with their service's current duration."""
+    updated = sync_booking_end_times(service_id)
+    click.echo(f"Updated {updated} booking(s)")
+
+
+@click.command("send-booking-reminders")
+def send_booking_reminders_command():
+    """Send all booking reminders that are due."""
+    sent = booking_reminder_scheduler.run_pending()
+    click.echo(f"Sent {sent} booking reminder(s)")
+
+
+@click.command("recompute-stats")
+def recompute_stats_command():
+    """Rebuild the stats_counters table from the tracked tables."""
+    written = recompute_stats()
+    click.echo(f"Wrote {written} counter(s)")
+
+
+@click.command("refresh-revenue-rollup")
+@click.option("--full", is_flag=True, help="Rebuild every day, not just new ones.")
+def refresh_revenue_rollup_command(full):
+    """Bring the daily revenue rollup up to date."""
+    since = refresh_revenue_rollup(full)
+    click.echo(f"Recomputed revenue from {since or 'the first payment'}")
+
+
+@click.command("mark-overdue-invoices")
+def mark_overdue_invoices_command():
+    """Mark unpaid invoices past their due date overdue and charge late fees."""
+    moved = mark_overdue_invoices()
+    click.echo(f"Marked {moved} invoice(s) overdue")
+    for bucket in invoice_aging_summary():
+        click.echo(
+            f"{bucket['bucket']:>6} days: {bucket['count']} invoice(s), "
+            f"{bucket['amount']} outstanding"
+        )
+
+
+@click.command("rebuild-related-blogs")
+def rebuild_related_blogs_command():
+    """Recompute the related posts of every published blog."""
+    indexed = rebuild_related_blogs()
+    click.echo(f"Indexed {indexed} blog(s)")
+
+
+@click.command("refresh-related-blogs")
+def refresh_related_blogs_command():
+    """Update the related posts of blogs saved since the last refresh."""
+    refreshed = refresh_pending_related_blogs()
+    click.echo(f"Refreshed related posts of {refreshed} blog(s)")
+
+
+@click.command("recount-blog-comments")
+def recount_blog_comments_command():
+    """Recompute every blog's comment_count from the comments table."""
+    updated = recount_blog_comments()
+    click.echo(f"Recounted comments on {updated} blog(s)")
+
+
+def register_commands(app: Flask):
+    app.cli.add_command(process_mpesa_inbox_command)
+    app.cli.add_command(sweep_idempotency_keys_command)
+    app.cli.add_command(sync_booking_end_times_command)
+    app.cli.add_command(send_booking_reminders_command)
+    app.cli.add_command(recompute_stats_command)
+    app.cli.add_command(refresh_revenue_rollup_command)
+    app.cli.add_command(mark_overdue_invoices_command)
+    app.cli.add_command(rebuild_related_blogs_command)
+    app.cli.add_command(refresh_related_blogs_command)
+    app.cli.add_command(recount_blog_comments_command)
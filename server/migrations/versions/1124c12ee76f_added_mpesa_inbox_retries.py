@@ -0,0 +1,33 @@
+"""added mpesa inbox retries
+
+Revision ID: 1124c12ee76f
+Revises: 735323c017a5
+Create Date: 2026-10-20 09:14:52.306118
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "1124c12ee76f"
+down_revision = "735323c017a5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "mpesa_callback_inbox",
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "mpesa_callback_inbox",
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_column("mpesa_callback_inbox", "next_attempt_at")
+    op.drop_column("mpesa_callback_inbox", "attempts")
@@ -0,0 +1,29 @@
+"""added user calendar token
+
+Revision ID: 34023c477fb1
+Revises: b93865d5487c
+Create Date: 2026-10-19 20:12:30.774106
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "34023c477fb1"
+down_revision = "b93865d5487c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "users", sa.Column("calendar_token", sa.String(length=64), nullable=True)
+    )
+    op.create_unique_constraint("uq_users_calendar_token", "users", ["calendar_token"])
+
+
+def downgrade():
+    op.drop_constraint("uq_users_calendar_token", "users", type_="unique")
+    op.drop_column("users", "calendar_token")
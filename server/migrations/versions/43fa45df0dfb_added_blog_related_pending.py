@@ -0,0 +1,30 @@
+"""added blog related pending
+
+Revision ID: 43fa45df0dfb
+Revises: bb98f07a68b8
+Create Date: 2026-10-20 11:02:37.184206
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "43fa45df0dfb"
+down_revision = "bb98f07a68b8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "blog_related_pending",
+        sa.Column("blog_id", sa.Integer(), nullable=False),
+        sa.Column("queued_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("blog_id"),
+    )
+
+
+def downgrade():
+    op.drop_table("blog_related_pending")
@@ -0,0 +1,63 @@
+"""added booking reminder sent at
+
+Revision ID: 499208b01c3a
+Revises: 43fa45df0dfb
+Create Date: 2026-10-20 11:48:52.730164
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "499208b01c3a"
+down_revision = "43fa45df0dfb"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("bookings") as batch_op:
+        batch_op.add_column(
+            sa.Column("reminder_sent_at", sa.DateTime(timezone=True), nullable=True)
+        )
+    # Bookings the old watermark had passed were already reminded
+    op.execute(
+        """
+        UPDATE bookings SET reminder_sent_at = (
+            SELECT updated_at FROM reminder_watermarks
+            WHERE name = 'booking_reminders'
+        )
+        WHERE EXISTS (
+            SELECT 1 FROM reminder_watermarks w
+            WHERE w.name = 'booking_reminders'
+              AND (bookings.start_time < w.last_start_time
+                   OR (bookings.start_time = w.last_start_time
+                       AND bookings.id <= w.last_booking_id))
+        )
+        """
+    )
+    op.drop_table("reminder_watermarks")
+
+
+def downgrade():
+    op.create_table(
+        "reminder_watermarks",
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("last_start_time", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_booking_id", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.execute(
+        """
+        INSERT INTO reminder_watermarks
+            (name, last_start_time, last_booking_id, updated_at)
+        SELECT 'booking_reminders', start_time, id, CURRENT_TIMESTAMP
+        FROM bookings WHERE reminder_sent_at IS NOT NULL
+        ORDER BY start_time DESC, id DESC LIMIT 1
+        """
+    )
+    with op.batch_alter_table("bookings") as batch_op:
+        batch_op.drop_column("reminder_sent_at")
@@ -0,0 +1,38 @@
+"""added blog related
+
+Revision ID: 4a7d0fa50a66
+Revises: 7b6e3672cb90
+Create Date: 2026-10-19 23:48:20.511734
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "4a7d0fa50a66"
+down_revision = "7b6e3672cb90"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Filled by `flask rebuild-related-blogs`
+    op.create_table(
+        "blog_related",
+        sa.Column("blog_id", sa.Integer(), nullable=False),
+        sa.Column("related_id", sa.Integer(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["blog_id"], ["blogs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["related_id"], ["blogs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("blog_id", "related_id"),
+    )
+    op.create_index(
+        "ix_blog_related_related_id", "blog_related", ["related_id"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index("ix_blog_related_related_id", table_name="blog_related")
+    op.drop_table("blog_related")
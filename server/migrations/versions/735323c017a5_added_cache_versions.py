@@ -0,0 +1,30 @@
+"""added cache versions
+
+Revision ID: 735323c017a5
+Revises: b9de6ad8acd1
+Create Date: 2026-10-20 01:02:36.417820
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "735323c017a5"
+down_revision = "b9de6ad8acd1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "cache_versions",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade():
+    op.drop_table("cache_versions")
@@ -0,0 +1,76 @@
+"""added booking overlap guard
+
+Revision ID: 7a9f24b18fd9
+Revises: d4eec19da2fe
+Create Date: 2026-10-19 17:05:12.448019
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "7a9f24b18fd9"
+down_revision = "d4eec19da2fe"
+branch_labels = None
+depends_on = None
+
+ACTIVE_BOOKING = "is_deleted = FALSE AND status <> 'cancelled'"
+
+
+def upgrade():
+    op.create_index(
+        "ix_bookings_service_id_start_time",
+        "bookings",
+        ["service_id", "start_time"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_bookings_client_id_start_time",
+        "bookings",
+        ["client_id", "start_time"],
+        unique=False,
+    )
+
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    overlaps = bind.execute(
+        sa.text(
+            """
+            SELECT a.id, b.id FROM bookings a
+            JOIN bookings b ON a.service_id = b.service_id AND a.id < b.id
+                AND a.start_time < b.end_time AND b.start_time < a.end_time
+            WHERE a.is_deleted = FALSE AND a.status <> 'cancelled'
+                AND b.is_deleted = FALSE AND b.status <> 'cancelled'
+            LIMIT 20
+            """
+        )
+    ).fetchall()
+    if overlaps:
+        raise RuntimeError(
+            "Cancel or move overlapping bookings before applying this "
+            f"migration: {[tuple(pair) for pair in overlaps]}"
+        )
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        f"""
+        ALTER TABLE bookings ADD CONSTRAINT ex_bookings_service_time
+        EXCLUDE USING gist (
+            service_id WITH =,
+            tstzrange(start_time, end_time, '[)') WITH &&
+        ) WHERE ({ACTIVE_BOOKING})
+        """
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "ALTER TABLE bookings DROP CONSTRAINT IF EXISTS ex_bookings_service_time"
+        )
+    op.drop_index("ix_bookings_client_id_start_time", table_name="bookings")
+    op.drop_index("ix_bookings_service_id_start_time", table_name="bookings")
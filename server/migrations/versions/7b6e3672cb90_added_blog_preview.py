@@ -0,0 +1,69 @@
+"""added blog preview
+
+Revision ID: 7b6e3672cb90
+Revises: ba8cc69b8d1b
+Create Date: 2026-10-19 23:05:12.640318
+
+"""
+
+import html
+import json
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "7b6e3672cb90"
+down_revision = "ba8cc69b8d1b"
+branch_labels = None
+depends_on = None
+
+_TAG = re.compile(r"<[^>]+>")
+_MARKDOWN = re.compile(r"(^|\s)#{1,6}\s|[*_`~>]+|!?\[([^\]]*)\]\([^)]*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def _slate_text(nodes):
+    blocks = []
+    for node in nodes:
+        if not isinstance(node, dict):
+            continue
+        if "text" in node:
+            blocks.append(str(node["text"]))
+        else:
+            blocks.append(_slate_text(node.get("children") or []))
+    return "\n".join(blocks)
+
+
+def blog_preview(content):
+    """Same rules as utils.blog_text.blog_preview at this revision."""
+    content = content or ""
+    try:
+        nodes = json.loads(content)
+    except ValueError:
+        nodes = None
+    if isinstance(nodes, list):
+        text = _slate_text(nodes)
+    else:
+        text = html.unescape(_TAG.sub(" ", content))
+        text = _MARKDOWN.sub(lambda m: (m.group(1) or "") + (m.group(2) or ""), text)
+    text = _SPACE.sub(" ", text).strip()
+    return text[:100] + "..." if len(text) > 100 else text
+
+
+def upgrade():
+    op.add_column("blogs", sa.Column("preview", sa.String(length=120), nullable=True))
+
+    bind = op.get_bind()
+    blogs = bind.execute(sa.text("SELECT id, content FROM blogs")).fetchall()
+    for blog_id, content in blogs:
+        bind.execute(
+            sa.text("UPDATE blogs SET preview = :preview WHERE id = :id"),
+            {"preview": blog_preview(content), "id": blog_id},
+        )
+
+
+def downgrade():
+    op.drop_column("blogs", "preview")
@@ -0,0 +1,77 @@
+"""added stats counters
+
+Revision ID: aa14d777e03d
+Revises: 34023c477fb1
+Create Date: 2026-10-19 20:52:17.406113
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "aa14d777e03d"
+down_revision = "34023c477fb1"
+branch_labels = None
+depends_on = None
+
+TICKET_STATUSES = {
+    "OPEN": "open",
+    "CLOSED": "closed",
+    "IN_PROGRESS": "in_progress",
+    "DELETED": "deleted",
+}
+
+
+def upgrade():
+    op.create_table(
+        "stats_counters",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("scope_id", sa.Integer(), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("name", "scope_id"),
+    )
+
+    # Same counters as `flask recompute-stats`
+    for name, table in [
+        ("bookings", "bookings"),
+        ("services", "services"),
+        ("payments", "payments"),
+        ("blogs", "blogs"),
+        ("documents", "documents"),
+    ]:
+        op.execute(
+            f"INSERT INTO stats_counters (name, scope_id, value) "
+            f"SELECT '{name}', 0, COUNT(*) FROM {table}"
+        )
+    op.execute(
+        "INSERT INTO stats_counters (name, scope_id, value) "
+        "SELECT 'users.client', 0, COUNT(*) FROM users WHERE role = 'CLIENT'"
+    )
+    op.execute(
+        "INSERT INTO stats_counters (name, scope_id, value) "
+        "SELECT 'bookings.client', client_id, COUNT(*) FROM bookings "
+        "GROUP BY client_id"
+    )
+    op.execute(
+        "INSERT INTO stats_counters (name, scope_id, value) "
+        "SELECT 'invoices.paid.client', client_id, COUNT(*) FROM invoices "
+        "WHERE status = 'paid' GROUP BY client_id"
+    )
+    # Compared as text: the ticketstatus type may not list every model status
+    for stored, status in TICKET_STATUSES.items():
+        op.execute(
+            f"INSERT INTO stats_counters (name, scope_id, value) "
+            f"SELECT 'tickets.{status}', 0, COUNT(*) FROM tickets "
+            f"WHERE CAST(status AS VARCHAR) = '{stored}'"
+        )
+        op.execute(
+            f"INSERT INTO stats_counters (name, scope_id, value) "
+            f"SELECT 'tickets.{status}.client', client_id, COUNT(*) FROM tickets "
+            f"WHERE CAST(status AS VARCHAR) = '{stored}' GROUP BY client_id"
+        )
+
+
+def downgrade():
+    op.drop_table("stats_counters")
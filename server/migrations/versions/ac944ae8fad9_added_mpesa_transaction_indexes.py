@@ -0,0 +1,48 @@
+"""added mpesa transaction indexes
+
+Revision ID: ac944ae8fad9
+Revises: ee48be860037
+Create Date: 2026-10-19 15:02:41.604117
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "ac944ae8fad9"
+down_revision = "ee48be860037"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_mpesa_transactions_created_at_id",
+        "mpesa_transactions",
+        ["created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_mpesa_transactions_status"),
+        "mpesa_transactions",
+        ["status"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_mpesa_transactions_invoice_id"),
+        "mpesa_transactions",
+        ["invoice_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_mpesa_transactions_invoice_id"), table_name="mpesa_transactions"
+    )
+    op.drop_index(op.f("ix_mpesa_transactions_status"), table_name="mpesa_transactions")
+    op.drop_index(
+        "ix_mpesa_transactions_created_at_id", table_name="mpesa_transactions"
+    )
@@ -0,0 +1,85 @@
+"""added booking series
+
+Revision ID: b93865d5487c
+Revises: d50ebd4108d5
+Create Date: 2026-10-19 19:26:44.081657
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b93865d5487c"
+down_revision = "d50ebd4108d5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "booking_series",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("client_id", sa.Integer(), nullable=False),
+        sa.Column("service_id", sa.Integer(), nullable=False),
+        sa.Column("start_time", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("rrule", sa.String(length=255), nullable=False),
+        sa.Column("last_start_time", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["client_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["service_id"], ["services.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_booking_series_service_id"),
+        "booking_series",
+        ["service_id"],
+        unique=False,
+    )
+    op.create_table(
+        "booking_series_exceptions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("series_id", sa.Integer(), nullable=False),
+        sa.Column("occurrence_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("start_time", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("is_cancelled", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["series_id"], ["booking_series.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "series_id",
+            "occurrence_start",
+            name="uq_booking_series_exceptions_series_occurrence",
+        ),
+    )
+    op.add_column("bookings", sa.Column("series_id", sa.Integer(), nullable=True))
+    op.add_column(
+        "bookings",
+        sa.Column("occurrence_start", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_foreign_key(
+        "fk_bookings_series_id_booking_series",
+        "bookings",
+        "booking_series",
+        ["series_id"],
+        ["id"],
+    )
+    op.create_unique_constraint(
+        "uq_bookings_series_occurrence",
+        "bookings",
+        ["series_id", "occurrence_start"],
+    )
+
+
+def downgrade():
+    op.drop_constraint("uq_bookings_series_occurrence", "bookings", type_="unique")
+    op.drop_constraint(
+        "fk_bookings_series_id_booking_series", "bookings", type_="foreignkey"
+    )
+    op.drop_column("bookings", "occurrence_start")
+    op.drop_column("bookings", "series_id")
+    op.drop_table("booking_series_exceptions")
+    op.drop_index(op.f("ix_booking_series_service_id"), table_name="booking_series")
+    op.drop_table("booking_series")
@@ -0,0 +1,39 @@
+"""added blog comment count
+
+Revision ID: b9de6ad8acd1
+Revises: 4a7d0fa50a66
+Create Date: 2026-10-20 00:21:47.903215
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b9de6ad8acd1"
+down_revision = "4a7d0fa50a66"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "blogs",
+        sa.Column("comment_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        "UPDATE blogs SET comment_count = "
+        "(SELECT count(*) FROM comments WHERE comments.blog_id = blogs.id)"
+    )
+    op.create_index(
+        "ix_comments_blog_id_created_at_id",
+        "comments",
+        ["blog_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_comments_blog_id_created_at_id", table_name="comments")
+    op.drop_column("blogs", "comment_count")
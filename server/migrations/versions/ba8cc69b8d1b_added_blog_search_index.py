@@ -0,0 +1,69 @@
+"""added blog search index
+
+Revision ID: ba8cc69b8d1b
+Revises: c0204be99888
+Create Date: 2026-10-19 22:41:37.204116
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "ba8cc69b8d1b"
+down_revision = "c0204be99888"
+branch_labels = None
+depends_on = None
+
+# Same statements as utils/blog_search.py runs on a freshly created table
+PG_UPGRADE = (
+    "ALTER TABLE blogs ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(excerpt, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'C')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_blogs_search_vector "
+    "ON blogs USING gin (search_vector)",
+)
+
+SQLITE_UPGRADE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS blog_search USING fts5("
+    "title, excerpt, content, content='blogs', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS blog_search_insert AFTER INSERT ON blogs BEGIN "
+    "INSERT INTO blog_search (rowid, title, excerpt, content) "
+    "VALUES (new.id, new.title, new.excerpt, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS blog_search_delete AFTER DELETE ON blogs BEGIN "
+    "INSERT INTO blog_search (blog_search, rowid, title, excerpt, content) "
+    "VALUES ('delete', old.id, old.title, old.excerpt, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS blog_search_update AFTER UPDATE ON blogs BEGIN "
+    "INSERT INTO blog_search (blog_search, rowid, title, excerpt, content) "
+    "VALUES ('delete', old.id, old.title, old.excerpt, old.content); "
+    "INSERT INTO blog_search (rowid, title, excerpt, content) "
+    "VALUES (new.id, new.title, new.excerpt, new.content); END",
+    # Index the blogs that already exist
+    "INSERT INTO blog_search (blog_search) VALUES ('rebuild')",
+)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        statements = PG_UPGRADE
+    elif dialect == "sqlite":
+        statements = SQLITE_UPGRADE
+    else:
+        statements = ()
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_blogs_search_vector")
+        op.execute("ALTER TABLE blogs DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("insert", "delete", "update"):
+            op.execute(f"DROP TRIGGER IF EXISTS blog_search_{trigger}")
+        op.execute("DROP TABLE IF EXISTS blog_search")
@@ -0,0 +1,40 @@
+"""added stats counter slots
+
+Revision ID: bb98f07a68b8
+Revises: 1124c12ee76f
+Create Date: 2026-10-20 09:41:08.552910
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "bb98f07a68b8"
+down_revision = "1124c12ee76f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("stats_counters") as batch_op:
+        batch_op.add_column(
+            sa.Column("slot", sa.SmallInteger(), server_default="0", nullable=False)
+        )
+        batch_op.drop_constraint("stats_counters_pkey", type_="primary")
+        batch_op.create_primary_key("stats_counters_pkey", ["name", "scope_id", "slot"])
+
+
+def downgrade():
+    # Fold the slots back into one row per counter
+    op.execute(
+        "UPDATE stats_counters SET value = (SELECT SUM(s.value) FROM stats_counters s "
+        "WHERE s.name = stats_counters.name AND s.scope_id = stats_counters.scope_id) "
+        "WHERE slot = 0"
+    )
+    op.execute("DELETE FROM stats_counters WHERE slot <> 0")
+    with op.batch_alter_table("stats_counters") as batch_op:
+        batch_op.drop_constraint("stats_counters_pkey", type_="primary")
+        batch_op.create_primary_key("stats_counters_pkey", ["name", "scope_id"])
+        batch_op.drop_column("slot")
@@ -0,0 +1,35 @@
+"""added invoice late fee
+
+Revision ID: c0204be99888
+Revises: cc8ae820fe45
+Create Date: 2026-10-19 21:46:03.518207
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c0204be99888"
+down_revision = "cc8ae820fe45"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "invoices",
+        sa.Column("late_fee", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.create_index(
+        "ix_invoices_status_due_date",
+        "invoices",
+        ["status", "due_date"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_invoices_status_due_date", table_name="invoices")
+    op.drop_column("invoices", "late_fee")
@@ -0,0 +1,43 @@
+"""added daily revenue rollup
+
+Revision ID: cc8ae820fe45
+Revises: aa14d777e03d
+Create Date: 2026-10-19 21:18:40.215734
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "cc8ae820fe45"
+down_revision = "aa14d777e03d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "daily_revenue_rollup",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("service_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "payment_method",
+            # Reuse the type created for payments.payment_method
+            postgresql.ENUM(name="paymentmethod", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("currency", sa.String(length=10), nullable=False),
+        sa.Column("payment_count", sa.Integer(), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint("day", "service_id", "payment_method", "currency"),
+    )
+    # Lets incremental refreshes read only the newest payments
+    op.create_index("ix_payments_created_at", "payments", ["created_at"], unique=False)
+
+
+def downgrade():
+    op.drop_index("ix_payments_created_at", table_name="payments")
+    op.drop_table("daily_revenue_rollup")
@@ -0,0 +1,43 @@
+"""added paybill transaction indexes
+
+Revision ID: d4eec19da2fe
+Revises: ae5bbca5a81f
+Create Date: 2026-10-19 16:20:53.871204
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d4eec19da2fe"
+down_revision = "ae5bbca5a81f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        op.f("ix_paybill_transactions_transaction_code"),
+        "paybill_transactions",
+        ["transaction_code"],
+        unique=True,
+    )
+    op.create_index(
+        op.f("ix_paybill_transactions_account_number"),
+        "paybill_transactions",
+        ["account_number"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_paybill_transactions_account_number"),
+        table_name="paybill_transactions",
+    )
+    op.drop_index(
+        op.f("ix_paybill_transactions_transaction_code"),
+        table_name="paybill_transactions",
+    )
@@ -0,0 +1,39 @@
+"""added booking reminder watermark
+
+Revision ID: d50ebd4108d5
+Revises: ff95411b8886
+Create Date: 2026-10-19 18:41:09.532118
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d50ebd4108d5"
+down_revision = "ff95411b8886"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "reminder_watermarks",
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("last_start_time", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_booking_id", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_index(
+        "ix_bookings_start_time_status",
+        "bookings",
+        ["start_time", "status"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_bookings_start_time_status", table_name="bookings")
+    op.drop_table("reminder_watermarks")
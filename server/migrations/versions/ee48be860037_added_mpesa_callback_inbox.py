@@ -0,0 +1,53 @@
+"""added mpesa callback inbox
+
+Revision ID: ee48be860037
+Revises: 3d67fb05c1d4
+Create Date: 2026-10-19 09:12:04.118532
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "ee48be860037"
+down_revision = "3d67fb05c1d4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "mpesa_callback_inbox",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("checkout_request_id", sa.String(length=100), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("received_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("processing_error", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_mpesa_callback_inbox_checkout_request_id",
+        "mpesa_callback_inbox",
+        ["checkout_request_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_mpesa_callback_inbox_processed_at_id",
+        "mpesa_callback_inbox",
+        ["processed_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_mpesa_callback_inbox_processed_at_id", table_name="mpesa_callback_inbox"
+    )
+    op.drop_index(
+        "ix_mpesa_callback_inbox_checkout_request_id",
+        table_name="mpesa_callback_inbox",
+    )
+    op.drop_table("mpesa_callback_inbox")
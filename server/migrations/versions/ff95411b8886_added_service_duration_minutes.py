@@ -0,0 +1,57 @@
+"""added service duration minutes
+
+Revision ID: ff95411b8886
+Revises: 7a9f24b18fd9
+Create Date: 2026-10-19 18:02:37.215530
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "ff95411b8886"
+down_revision = "7a9f24b18fd9"
+branch_labels = None
+depends_on = None
+
+
+def parse_duration_minutes(duration_str):
+    """Same rules as models.service.parse_duration_minutes at this revision."""
+    try:
+        parts = duration_str.split()
+        hours = 0
+        minutes = 0
+        for i, part in enumerate(parts):
+            if part == "hr" and i > 0:
+                hours = int(parts[i - 1])
+            elif part == "min" and i > 0:
+                minutes = int(parts[i - 1])
+        return hours * 60 + minutes
+    except (AttributeError, ValueError, IndexError):
+        return 60
+
+
+def upgrade():
+    op.add_column(
+        "services", sa.Column("duration_minutes", sa.Integer(), nullable=True)
+    )
+
+    # Services share a handful of duration strings; one UPDATE per distinct value
+    bind = op.get_bind()
+    durations = bind.execute(sa.text("SELECT DISTINCT duration FROM services"))
+    for (duration,) in durations.fetchall():
+        bind.execute(
+            sa.text(
+                "UPDATE services SET duration_minutes = :minutes "
+                "WHERE duration = :duration"
+            ),
+            {"minutes": parse_duration_minutes(duration), "duration": duration},
+        )
+
+    op.alter_column("services", "duration_minutes", nullable=False)
+
+
+def downgrade():
+    op.drop_column("services", "duration_minutes")
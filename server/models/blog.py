@@ -2,6 +2,7 @@ import enum
 from datetime import datetime, timezone
 import os
 from sqlalchemy.orm import validates
+from utils.blog_text import blog_preview
 from . import db
 
 SERVER_HOST = os.getenv("FLASK_SERVER_URL", "http://localhost:5000").rstrip("/")
@@ -37,6 +38,8 @@ class Blog(db.Model):
     title = db.Column(db.String(255), nullable=False)
     likes = db.Column(db.Integer, default=0)
     views = db.Column(db.Integer, default=0)
+    # Kept in step with the comments table by utils.blog_comments
+    comment_count = db.Column(db.Integer, default=0, server_default="0", nullable=False)
     image = db.Column(db.LargeBinary, nullable=False)  # Storing image as binary
     image_content_type = db.Column(db.String(50), nullable=False)
     category = db.Column(db.String(100), nullable=False)
@@ -48,6 +51,8 @@ class Blog(db.Model):
     )
     excerpt = db.Column(db.String(500), nullable=True)
     content = db.Column(db.Text, nullable=False)
+    # Plain-text start of content, kept in step by the content validator
+    preview = db.Column(db.String(120), nullable=True)
     reading_duration = db.Column(db.String(50), nullable=False)
     type = db.Column(
         db.Enum(BlogType),
@@ -62,7 +67,9 @@ class Blog(db.Model):
 
     # --- Relationships ---
     admin = db.relationship("User", back_populates="blogs")
-    comments = db.relationship("Comment", back_populates="blog")
+    comments = db.relationship(
+        "Comment", back_populates="blog", cascade="all, delete-orphan"
+    )
 
     # --- Validations ---
     @validates(
@@ -95,6 +102,9 @@ class Blog(db.Model):
                 msg = f"Invalid image content type. Allowed types are: {allowed_str}"
                 raise ValueError(msg)
 
+        if key == "content":
+            self.preview = blog_preview(value.strip())
+
         return value.strip()
 
     @validates("likes", "views")
@@ -107,12 +117,13 @@ class Blog(db.Model):
         return value
 
     # --- Serialization ---
-    def to_dict(self):
+    def to_dict(self, include_content=True):
         """
         Return a JSON-serializable dictionary representation of the Blog.
+        List views pass include_content=False so ``content`` can stay
+        deferred; ``preview`` stands in for it.
         """
-
-        return {
+        data = {
             "id": self.id,
             "date_created": (
                 self.date_created.isoformat() if self.date_created else None
@@ -123,16 +134,20 @@ class Blog(db.Model):
             "title": self.title,
             "likes": self.likes,
             "views": self.views,
+            "comment_count": self.comment_count,
             "category": self.category,
             "author_name": self.author_name,
             "image": f"{SERVER_HOST}{api_endpoint}/blogs/image/{self.id}",
             "admin_id": self.admin_id,
-            "content": self.content,
             "excerpt": self.excerpt,
+            "preview": self.preview,
             "reading_duration": self.reading_duration,
             "type": self.type.value if self.type else None,
             "status": self.status.value if self.status else None,
         }
+        if include_content:
+            data["content"] = self.content
+        return data
 
     def __repr__(self):
         return f"<Blog id={self.id} title='{self.title}'>"
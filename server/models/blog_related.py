@@ -0,0 +1,39 @@
+from . import db
+
+
+class BlogRelated(db.Model):
+    """
+    One precomputed "related article" of a blog: ``related_id`` is among
+    the most similar published posts to ``blog_id`` by TF-IDF cosine
+    similarity.
+
+    Rows are written by ``utils.blog_related`` in the background after
+    posts are saved and can be rebuilt with ``flask rebuild-related-blogs``.
+    """
+
+    __tablename__ = "blog_related"
+
+    blog_id = db.Column(
+        db.Integer, db.ForeignKey("blogs.id", ondelete="CASCADE"), primary_key=True
+    )
+    related_id = db.Column(
+        db.Integer,
+        db.ForeignKey("blogs.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    score = db.Column(db.Float, nullable=False)
+
+
+class BlogRelatedPending(db.Model):
+    """
+    A blog whose related posts need refreshing after it was created, edited
+    or deleted. Queued by the blog routes and consumed by
+    ``utils.blog_related.refresh_pending_related_blogs``; no foreign key,
+    since deleted blogs are queued too.
+    """
+
+    __tablename__ = "blog_related_pending"
+
+    blog_id = db.Column(db.Integer, primary_key=True)
+    queued_at = db.Column(db.DateTime, nullable=False)
@@ -13,6 +13,16 @@ class BookingStatus(enum.Enum):
 
 class Booking(db.Model):
     __tablename__ = "bookings"
+    __table_args__ = (
+        db.Index("ix_bookings_service_id_start_time", "service_id", "start_time"),
+        db.Index("ix_bookings_client_id_start_time", "client_id", "start_time"),
+        db.Index("ix_bookings_start_time_status", "start_time", "status"),
+        db.UniqueConstraint(
+            "series_id",
+            "occurrence_start",
+            name="uq_bookings_series_occurrence",
+        ),
+    )
 
     # --- Schema Columns ---
     id = db.Column(db.Integer, primary_key=True)
@@ -41,9 +51,18 @@ class Booking(db.Model):
     )
     updated_at = db.Column(
         db.DateTime(timezone=True),
-        onupdate=db.func.now(),
+        onupdate=lambda: datetime.now(timezone.utc),
     )
     is_deleted = db.Column(db.Boolean, default=False, nullable=False)
+    # Set when the booking is a confirmed occurrence of a recurring series
+    series_id = db.Column(
+        db.Integer,
+        db.ForeignKey("booking_series.id"),
+        nullable=True,
+    )
+    occurrence_start = db.Column(db.DateTime(timezone=True), nullable=True)
+    # When the reminder for the current start_time was claimed for sending
+    reminder_sent_at = db.Column(db.DateTime(timezone=True), nullable=True)
 
     # --- Relationships ---
     client = db.relationship("User", back_populates="bookings")
@@ -62,6 +81,13 @@ class Booking(db.Model):
         if start_time_value < datetime.now(timezone.utc):
             raise ValueError("Start time cannot be in the past.")
 
+        # A moved booking is reminded again for its new time
+        current = self.start_time
+        if current is not None and current.tzinfo is None:
+            current = current.replace(tzinfo=timezone.utc)
+        if current != start_time_value:
+            self.reminder_sent_at = None
+
         # Return the normalized timezone-aware datetime
         return start_time_value
 
@@ -88,6 +114,7 @@ class Booking(db.Model):
             "service_id": self.service_id,
             "service_name": self.service.title if self.service else None,
             "service_duration": self.service.duration if self.service else None,
+            "series_id": self.series_id,
             "created_at": (self.created_at.isoformat() if self.created_at else None),
             "updated_at": (self.updated_at.isoformat() if self.updated_at else None),
         }
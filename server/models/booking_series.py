@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+from sqlalchemy.orm import validates
+from utils.recurrence import format_rrule, parse_rrule
+from . import db
+
+
+class BookingSeries(db.Model):
+    """
+    A recurring booking described by an RRULE.
+
+    Occurrences are not stored: they are expanded from ``rrule`` and
+    ``start_time`` for the window being looked at. An occurrence only gets
+    a Booking (and Invoice) row once it is confirmed, and single-occurrence
+    moves or cancellations are kept in ``booking_series_exceptions``.
+    """
+
+    __tablename__ = "booking_series"
+
+    id = db.Column(db.Integer, primary_key=True)
+    client_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    service_id = db.Column(
+        db.Integer, db.ForeignKey("services.id"), nullable=False, index=True
+    )
+    # Start of the first occurrence
+    start_time = db.Column(db.DateTime(timezone=True), nullable=False)
+    rrule = db.Column(db.String(255), nullable=False)
+    # Start of the final occurrence; None when the rule is open-ended
+    last_start_time = db.Column(db.DateTime(timezone=True), nullable=True)
+    created_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    is_deleted = db.Column(db.Boolean, default=False, nullable=False)
+
+    client = db.relationship("User")
+    service = db.relationship("Service")
+    exceptions = db.relationship(
+        "BookingSeriesException",
+        back_populates="series",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+    )
+
+    @validates("rrule")
+    def validate_rrule(self, key, value):
+        """Store the rule in canonical form."""
+        return format_rrule(parse_rrule(value))
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "client_id": self.client_id,
+            "client_name": self.client.full_name if self.client else None,
+            "service_id": self.service_id,
+            "service_name": self.service.title if self.service else None,
+            "start_time": self.start_time.isoformat() if self.start_time else None,
+            "rrule": self.rrule,
+            "last_start_time": (
+                self.last_start_time.isoformat() if self.last_start_time else None
+            ),
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+
+class BookingSeriesException(db.Model):
+    """A moved or cancelled occurrence of a booking series."""
+
+    __tablename__ = "booking_series_exceptions"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "series_id",
+            "occurrence_start",
+            name="uq_booking_series_exceptions_series_occurrence",
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    series_id = db.Column(
+        db.Integer, db.ForeignKey("booking_series.id"), nullable=False
+    )
+    # Start the occurrence has according to the rule
+    occurrence_start = db.Column(db.DateTime(timezone=True), nullable=False)
+    # New start when the occurrence was moved
+    start_time = db.Column(db.DateTime(timezone=True), nullable=True)
+    is_cancelled = db.Column(db.Boolean, default=False, nullable=False)
+    created_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+    series = db.relationship("BookingSeries", back_populates="exceptions")
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "series_id": self.series_id,
+            "occurrence_start": self.occurrence_start.isoformat(),
+            "start_time": self.start_time.isoformat() if self.start_time else None,
+            "is_cancelled": self.is_cancelled,
+        }
@@ -0,0 +1,14 @@
+from . import db
+
+
+class CacheVersion(db.Model):
+    """
+    Version of a body of cached data, e.g. "master_data". Writers bump it in
+    the same transaction as their change; each worker compares it with the
+    version its cache was filled at to notice writes made elsewhere.
+    """
+
+    __tablename__ = "cache_versions"
+
+    name = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
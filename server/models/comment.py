@@ -4,6 +4,10 @@ from datetime import datetime, timezone
 
 class Comment(db.Model):
     __tablename__ = "comments"
+    # Serves a blog's thread in order, one keyset page at a time
+    __table_args__ = (
+        db.Index("ix_comments_blog_id_created_at_id", "blog_id", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     description = db.Column(db.Text, nullable=False)
@@ -17,8 +21,10 @@ class Comment(db.Model):
         db.ForeignKey("blogs.id"),
         nullable=False,
     )
+    # Set in Python too so threads page on full-precision timestamps
     created_at = db.Column(
         db.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
         server_default=db.func.now(),
         nullable=False,
     )
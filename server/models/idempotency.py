@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+from . import db
+
+
+class IdempotencyKey(db.Model):
+    """
+    Outcome of a request sent with an ``Idempotency-Key`` header.
+
+    A row is inserted as ``in_progress`` before the request runs, which acts
+    as the lock for concurrent duplicates, and is marked ``completed`` with
+    the response once it finishes. ``expires_at`` is a short lease while
+    in progress and the replay window once completed.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        db.UniqueConstraint("key", "scope", name="uq_idempotency_keys_key_scope"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(255), nullable=False)
+    # Caller identity plus method and path, e.g. "12:POST /api/payments"
+    scope = db.Column(db.String(255), nullable=False)
+    request_hash = db.Column(db.String(64), nullable=False)
+    status = db.Column(
+        db.String(20), nullable=False, default="in_progress"
+    )  # in_progress, completed
+    response_status = db.Column(db.Integer, nullable=True)
+    response_body = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "key": self.key,
+            "scope": self.scope,
+            "status": self.status,
+            "response_status": self.response_status,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+        }
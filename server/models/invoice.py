@@ -15,6 +15,7 @@ class InvoiceStatus(enum.Enum):
 
 class Invoice(db.Model):
     __tablename__ = "invoices"
+    __table_args__ = (db.Index("ix_invoices_status_due_date", "status", "due_date"),)
 
     # --- Schema Columns ---
     id = db.Column(db.Integer, primary_key=True)
@@ -27,6 +28,8 @@ class Invoice(db.Model):
         db.Enum(InvoiceStatus), nullable=False, default=InvoiceStatus.pending
     )
     is_deleted = db.Column(db.Boolean, default=False, nullable=False)
+    # Charged once when the invoice becomes overdue
+    late_fee = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     # --- Relationships ---
     client = db.relationship("User", back_populates="invoices")
@@ -38,6 +41,11 @@ class Invoice(db.Model):
         lazy="joined",  # Changed from dynamic to joined or select
     )
 
+    @property
+    def amount_due(self):
+        """The amount plus any late fee charged; paying this settles it."""
+        return self.amount + (self.late_fee or 0)
+
     # --- Data Validations ---
     @validates("amount")
     def validate_amount(self, key, value):
@@ -65,4 +73,5 @@ class Invoice(db.Model):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "due_date": self.due_date.isoformat() if self.due_date else None,
             "status": self.status.value if self.status else None,
+            "late_fee": self.late_fee,
         }
@@ -6,12 +6,27 @@ from enum import Enum as PyEnum
 from sqlalchemy.orm import validates
 import re
 from decimal import Decimal
+from utils.master_data import MASTER_DATA_STALENESS_SECONDS, VersionedCache
 
 
 class ThemeColor(db.Model):
     """Stores system theme colors and UI configuration"""
 
     __tablename__ = "theme_colors"
+    # Columns GET /master/theme may show
+    PUBLIC_FIELDS = (
+        "primary_color",
+        "secondary_color",
+        "accent_color",
+        "background_color",
+        "text_color",
+        "border_color",
+        "logo_url",
+        "favicon_url",
+        "company_name",
+        "border_radius",
+        "font_family",
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     # Primary colors
@@ -64,6 +79,20 @@ class Bank(db.Model):
     """Master data for supported banks"""
 
     __tablename__ = "banks"
+    # Columns GET /master/banks may show; payers need the account details
+    PUBLIC_FIELDS = (
+        "id",
+        "name",
+        "code",
+        "swift_code",
+        "account_name",
+        "account_number",
+        "branch",
+        "currency",
+        "display_order",
+        "logo_url",
+        "website",
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False, unique=True)
@@ -109,6 +138,15 @@ class PaybillConfig(db.Model):
     """Master data for paybill numbers and configurations"""
 
     __tablename__ = "paybill_configs"
+    # Columns GET /master/paybills may show; never the API credentials
+    PUBLIC_FIELDS = (
+        "paybill_number",
+        "business_name",
+        "provider",
+        "provider_type",
+        "min_amount",
+        "max_amount",
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     paybill_number = db.Column(db.String(20), nullable=False, unique=True)
@@ -293,6 +331,16 @@ class TaxConfig(db.Model):
     """Tax rates and configurations"""
 
     __tablename__ = "tax_configs"
+    # Columns GET /master/tax-rates may show
+    PUBLIC_FIELDS = (
+        "id",
+        "name",
+        "rate",
+        "tax_type",
+        "is_default",
+        "applies_to_products",
+        "applies_to_services",
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)  # e.g., "VAT", "Sales Tax"
@@ -326,64 +374,106 @@ class TaxConfig(db.Model):
 
 # Utility functions for master data
 class MasterDataManager:
-    """Helper class for managing master data"""
+    """
+    Helper class for managing master data.
+
+    Lookups return read-only snapshots (tuples of them for lists) from
+    ``master_data_cache``; load the model itself to change a row.
+    """
 
     @staticmethod
     def get_active_banks():
         """Get all active banks"""
-        return (
-            Bank.query.filter_by(is_active=True)
+        return master_data_cache.get(
+            "active_banks",
+            lambda: Bank.query.filter_by(is_active=True)
             .order_by(Bank.display_order, Bank.name)
-            .all()
+            .all(),
         )
 
     @staticmethod
     def get_active_paybills():
         """Get all active paybill configurations"""
-        return (
-            PaybillConfig.query.filter_by(is_active=True)
+        return master_data_cache.get(
+            "active_paybills",
+            lambda: PaybillConfig.query.filter_by(is_active=True)
             .order_by(PaybillConfig.provider)
-            .all()
+            .all(),
         )
 
     @staticmethod
     def get_default_paybill():
         """Get the default paybill configuration"""
-        return PaybillConfig.query.filter_by(is_active=True, is_default=True).first()
+        return master_data_cache.get(
+            "default_paybill",
+            lambda: PaybillConfig.query.filter_by(
+                is_active=True, is_default=True
+            ).first(),
+        )
 
     @staticmethod
     def get_system_config():
         """Get system configuration (singleton)"""
-        config = SystemConfig.query.first()
-        if not config:
-            # Create default configuration if none exists
-            config = SystemConfig(company_name="Your Company")
-            db.session.add(config)
-            db.session.commit()
-        return config
+
+        def load():
+            config = SystemConfig.query.first()
+            if not config:
+                # Create default configuration if none exists
+                config = SystemConfig(company_name="Your Company")
+                db.session.add(config)
+                db.session.commit()
+            return config
+
+        return master_data_cache.get("system_config", load)
 
     @staticmethod
     def get_active_theme():
         """Get active theme configuration"""
-        theme = ThemeColor.query.filter_by(is_active=True).first()
-        if not theme:
-            # Create default theme if none exists
-            theme = ThemeColor()
-            db.session.add(theme)
-            db.session.commit()
-        return theme
+
+        def load():
+            theme = ThemeColor.query.filter_by(is_active=True).first()
+            if not theme:
+                # Create default theme if none exists
+                theme = ThemeColor()
+                db.session.add(theme)
+                db.session.commit()
+            return theme
+
+        return master_data_cache.get("active_theme", load)
 
     @staticmethod
     def get_email_config():
         """Get email configuration"""
-        return EmailConfig.query.filter_by(is_active=True).first()
+        return master_data_cache.get(
+            "email_config", lambda: EmailConfig.query.filter_by(is_active=True).first()
+        )
 
     @staticmethod
     def get_tax_rates():
         """Get all active tax rates"""
-        return TaxConfig.query.filter_by(is_active=True).all()
+        return master_data_cache.get(
+            "tax_rates", lambda: TaxConfig.query.filter_by(is_active=True).all()
+        )
 
     @staticmethod
     def get_default_tax():
         """Get default tax rate"""
-        return TaxConfig.query.filter_by(is_active=True, is_default=True).first()
+        return master_data_cache.get(
+            "default_tax",
+            lambda: TaxConfig.query.filter_by(is_active=True, is_default=True).first(),
+        )
+
+
+master_data_cache = VersionedCache(
+    "master_data",
+    (
+        ThemeColor,
+        Bank,
+        PaybillConfig,
+        EmailConfig,
+        SystemConfig,
+        NotificationTemplate,
+        TaxConfig,
+    ),
+    MASTER_DATA_STALENESS_SECONDS,
+)
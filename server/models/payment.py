@@ -107,6 +107,9 @@ class CardTransaction(db.Model):
 
 class MpesaTransaction(db.Model):
     __tablename__ = "mpesa_transactions"
+    __table_args__ = (
+        db.Index("ix_mpesa_transactions_created_at_id", "created_at", "id"),
+    )
     id = db.Column(db.Integer, primary_key=True)
 
     # Original fields
@@ -143,7 +146,7 @@ class MpesaTransaction(db.Model):
 
     # Status tracking
     status = db.Column(
-        db.String(50), default="pending"
+        db.String(50), default="pending", index=True
     )  # pending, completed, failed, cancelled
     callback_received = db.Column(db.Boolean, default=False)
     callback_received_at = db.Column(db.DateTime(timezone=True), nullable=True)
@@ -152,7 +155,9 @@ class MpesaTransaction(db.Model):
     raw_callback_data = db.Column(db.JSON, nullable=True)
 
     # Invoice reference
-    invoice_id = db.Column(db.Integer, db.ForeignKey("invoices.id"), nullable=True)
+    invoice_id = db.Column(
+        db.Integer, db.ForeignKey("invoices.id"), nullable=True, index=True
+    )
 
     @validates("amount")
     def validate_amount(self, key, amount_to_check):
@@ -181,9 +186,9 @@ class MpesaTransaction(db.Model):
             )
         return phone_number
 
-    def to_dict(self):
+    def to_dict(self, include_raw=False):
         """Serialize the MpesaTransaction into a dictionary."""
-        return {
+        data = {
             "id": self.id,
             "amount": self.amount,
             "payment_date": self.payment_date.isoformat(),
@@ -211,6 +216,53 @@ class MpesaTransaction(db.Model):
             ),
             "invoice_id": self.invoice_id,
         }
+        if include_raw:
+            data["raw_callback_data"] = self.raw_callback_data
+        return data
+
+
+class MpesaCallbackInbox(db.Model):
+    """
+    Append-only store of raw STK callbacks.
+
+    Callbacks are written here and acknowledged straight away; the inbox
+    processor applies them to transactions, payments and invoices later.
+    """
+
+    __tablename__ = "mpesa_callback_inbox"
+    __table_args__ = (
+        db.Index("ix_mpesa_callback_inbox_processed_at_id", "processed_at", "id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    checkout_request_id = db.Column(db.String(100), nullable=False, index=True)
+    payload = db.Column(db.JSON, nullable=False)
+    received_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    processed_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    processing_error = db.Column(db.Text, nullable=True)
+    # Callbacks that arrive before their transaction is committed are retried
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = db.Column(db.DateTime(timezone=True), nullable=True)
+
+    def to_dict(self):
+        """Serialize the inbox row (without the raw payload)."""
+        return {
+            "id": self.id,
+            "checkout_request_id": self.checkout_request_id,
+            "received_at": self.received_at.isoformat(),
+            "processed_at": (
+                self.processed_at.isoformat() if self.processed_at else None
+            ),
+            "processing_error": self.processing_error,
+            "attempts": self.attempts,
+            "next_attempt_at": (
+                self.next_attempt_at.isoformat() if self.next_attempt_at else None
+            ),
+        }
 
 
 class BankTransferTransaction(db.Model):
@@ -298,9 +350,9 @@ class PaybillTransaction(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     amount = db.Column(Numeric(12, 2), nullable=False, default=Decimal("0.00"))
     paybill_number = db.Column(db.String(20), nullable=False)
-    account_number = db.Column(db.String(100), nullable=False)  # Invoice ID
+    account_number = db.Column(db.String(100), nullable=False, index=True)  # Invoice ID
     provider = db.Column(db.String(20), nullable=False)  # mpesa, airtel
-    transaction_code = db.Column(db.String(50), nullable=True)
+    transaction_code = db.Column(db.String(50), nullable=True, unique=True, index=True)
     phone_number = db.Column(db.String(15), nullable=True)
     transaction_date = db.Column(db.DateTime(timezone=True), nullable=True)
     status = db.Column(
@@ -395,6 +447,7 @@ class Payment(db.Model):
         db.DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
         nullable=False,
+        index=True,
     )
 
     # Relationships
@@ -0,0 +1,31 @@
+from . import db
+from .payment import PaymentMethod
+
+
+class DailyRevenueRollup(db.Model):
+    """
+    Payments collected per day, service, payment method and currency.
+
+    Rows are derived from ``payments`` joined to their invoice and
+    transaction and are rebuilt by ``utils.revenue_rollup``; they are never
+    edited by hand.
+    """
+
+    __tablename__ = "daily_revenue_rollup"
+
+    day = db.Column(db.Date, primary_key=True)
+    service_id = db.Column(db.Integer, primary_key=True)
+    payment_method = db.Column(db.Enum(PaymentMethod), primary_key=True)
+    currency = db.Column(db.String(10), primary_key=True)
+    payment_count = db.Column(db.Integer, nullable=False, default=0)
+    amount = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "day": self.day.isoformat(),
+            "service_id": self.service_id,
+            "payment_method": self.payment_method.value,
+            "currency": self.currency,
+            "payment_count": self.payment_count,
+            "amount": float(self.amount),
+        }
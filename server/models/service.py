@@ -4,6 +4,27 @@ import base64
 from sqlalchemy.orm import validates
 from . import db
 
+# Used when a duration string cannot be parsed
+DEFAULT_DURATION_MINUTES = 60
+
+
+def parse_duration_minutes(duration_str):
+    """Total minutes in a duration string like "2 hr 30 min"."""
+    try:
+        parts = duration_str.split()
+        hours = 0
+        minutes = 0
+
+        for i, part in enumerate(parts):
+            if part == "hr" and i > 0:
+                hours = int(parts[i - 1])
+            elif part == "min" and i > 0:
+                minutes = int(parts[i - 1])
+
+        return hours * 60 + minutes
+    except (AttributeError, ValueError, IndexError):
+        return DEFAULT_DURATION_MINUTES
+
 
 class ServiceStatus(enum.Enum):
     ACTIVE = "active"
@@ -24,6 +45,10 @@ class Service(db.Model):
         nullable=False,
     )
     duration = db.Column(db.String(50), nullable=False)
+    # Kept in sync with ``duration`` so durations can be used in SQL
+    duration_minutes = db.Column(
+        db.Integer, nullable=False, default=DEFAULT_DURATION_MINUTES
+    )
     image = db.Column(db.LargeBinary, nullable=False)  # Storing image as binary
     status = db.Column(db.Enum(ServiceStatus), nullable=False)
     created_at = db.Column(
@@ -60,7 +85,10 @@ class Service(db.Model):
         """Ensures that key text fields are not empty."""
         if not value or (isinstance(value, str) and not value.strip()):
             raise ValueError(f"{key.capitalize()} cannot be empty.")
-        return value.strip() if isinstance(value, str) else value
+        value = value.strip() if isinstance(value, str) else value
+        if key == "duration":
+            self.duration_minutes = parse_duration_minutes(value)
+        return value
 
     @validates("image")
     def validate_image_size(self, key, value):
@@ -87,9 +115,9 @@ class Service(db.Model):
         """
         Return a dictionary representation of the Service model.
 
-        Includes scalar fields (id, title, description, duration, price,
-        admin_id, currency) and timestamp fields `created_at` / `updated_at`
-        converted to ISO 8601 strings or None when not set.
+        Includes scalar fields (id, title, description, duration,
+        duration_minutes, price, admin_id, currency) and timestamp fields
+        `created_at` / `updated_at` converted to ISO 8601 strings or None when not set.
         Converts image from binary to base64 string.
         """
         # Convert binary image to base64
@@ -110,6 +138,7 @@ class Service(db.Model):
             "currency": self.currency,
             "price": self.price,
             "duration": self.duration,
+            "duration_minutes": self.duration_minutes,
             "image": image_base64,  # Now returns base64 string instead of binary
             "status": self.status.value if self.status else None,
             "admin_id": self.admin_id,
@@ -0,0 +1,32 @@
+from . import db
+
+
+class StatsCounter(db.Model):
+    """
+    Running row count for one tracked dimension, e.g. ("tickets.open", 0)
+    for all open tickets or ("bookings.client", 12) for one client's
+    bookings. ``scope_id`` is 0 for counters that are not per client.
+
+    Counters that are not per client are bumped by every writer of their
+    table, so each is spread over several ``slot`` rows picked at random
+    per flush; concurrent writers rarely wait on the same row lock. The
+    value of a counter is the sum over its slots.
+
+    Rows are kept up to date by the flush hooks in ``utils.stats_counters``
+    and can be rebuilt with ``flask recompute-stats``.
+    """
+
+    __tablename__ = "stats_counters"
+
+    name = db.Column(db.String(64), primary_key=True)
+    scope_id = db.Column(db.Integer, primary_key=True, default=0)
+    slot = db.Column(db.SmallInteger, primary_key=True, default=0)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "scope_id": self.scope_id,
+            "slot": self.slot,
+            "value": self.value,
+        }
@@ -62,6 +62,8 @@ class User(db.Model):
     )
     # add soft delete
     is_deleted = db.Column(db.Boolean, default=False, nullable=False)
+    # Secret in the user's .ics booking feed URL
+    calendar_token = db.Column(db.String(64), unique=True, nullable=True)
     password_hash = db.Column(db.String(255), nullable=False)
 
     @property
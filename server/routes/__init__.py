@@ -4,13 +4,19 @@ from .mpesa import mpesa_bp
 from .auth import auth_bp
 from .ping import ping_bp
 from .blog import blogs_bp
+from .comment import comments_bp
 from .newsletter import newsletter_bp
 from .quote import quote_bp
 from .ticket import tickets_bp
+from .master import master_bp
 from .document import document_bp
 from .payment import payment_bp
 from .dashboard import dashboard_bp
 from .booking import booking_bp
+from .booking_series import booking_series_bp
+from .calendar import calendar_bp
+from .report import reports_bp
+from .export import exports_bp
 from .service import services_bp
 
 from .user_management import user_management_bp
@@ -26,6 +32,7 @@ def register_routes(app):
     app.register_blueprint(auth_bp, url_prefix=API)
     app.register_blueprint(mpesa_bp, url_prefix=API)
     app.register_blueprint(blogs_bp, url_prefix=API)
+    app.register_blueprint(comments_bp, url_prefix=API)
     app.register_blueprint(user_management_bp, url_prefix=API)
     app.register_blueprint(newsletter_bp, url_prefix=API)
     app.register_blueprint(tickets_bp, url_prefix=API)
@@ -33,5 +40,10 @@ def register_routes(app):
     app.register_blueprint(payment_bp, url_prefix=API)
     app.register_blueprint(dashboard_bp, url_prefix=API)
     app.register_blueprint(booking_bp, url_prefix=API)
+    app.register_blueprint(booking_series_bp, url_prefix=API)
+    app.register_blueprint(calendar_bp, url_prefix=API)
+    app.register_blueprint(reports_bp, url_prefix=API)
+    app.register_blueprint(exports_bp, url_prefix=API)
     app.register_blueprint(services_bp, url_prefix=API)
     app.register_blueprint(quote_bp, url_prefix=API)
+    app.register_blueprint(master_bp, url_prefix=API)
@@ -4,9 +4,17 @@ from flask_restful import Resource, Api
 from flask import Blueprint, request, send_file, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
+from sqlalchemy.orm import defer
 from utils.responses import restful_response
+from utils.pagination import paginate
+from utils.blog_search import blog_search_query, search_hit
+from utils.blog_counters import blog_counter_buffer, counter_flush_listeners
+from utils.blog_trending import TRENDING_SIZE, trending_ranking
+from utils.blog_related import RELATED_SIZE, queue_related_refresh, related_blogs
+from utils.response_cache import response_cache
 from models import db
 from models.blog import Blog, BlogType, BlogStatus
+from models.comment import Comment
 from models.user import User, Role
 from models.newsletter_subscriber import NewsletterSubscriber
 import threading
@@ -23,24 +31,127 @@ client_host = os.getenv("FLASK_CLIENT_URL", "http://localhost:3000").rstrip("/")
 server_host = os.getenv("FLASK_SERVER_URL", "http://localhost:5000").rstrip("/")
 api_endpoint = os.getenv("FLASK_API", "/api").rstrip("/")
 
+# Cached blog responses go stale when a blog or its comment count changes,
+# or when buffered view and like counts are written
+response_cache.bump_on_commit("blogs", (Blog, Comment))
+counter_flush_listeners.append(lambda deltas: response_cache.bump("blogs"))
+
+
+def blog_list(query):
+    """
+    One page of ``query`` as a blog list response. Lists carry ``preview``
+    instead of ``content`` unless the caller passes ``full=1``, so neither
+    column is read from the database when it is not returned.
+    """
+    full = request.args.get("full") == "1"
+    query = query.options(defer(Blog.image))
+    if not full:
+        query = query.options(defer(Blog.content))
+    # Ids follow date_created, which only has second resolution
+    try:
+        blogs, pagination = paginate(query, Blog.id, Blog.id, request.args)
+    except ValueError as e:
+        return restful_response(status="error", message=str(e), status_code=400)
+
+    return {
+        "status": "success",
+        "message": "Blogs fetched successfully",
+        "data": [
+            blog_counter_buffer.overlay(blog.to_dict(include_content=full))
+            for blog in blogs
+        ],
+        "pagination": pagination,
+    }, 200
+
 
 # --- Resource for all blogs ---
 class BlogListResource(Resource):
+    @response_cache.cached("blogs")
     def get(self):
-        blogs = Blog.query.order_by(Blog.date_created.desc()).all()
-        blog_list = []
-        for blog in blogs:
-            blog_dict = blog.to_dict()
-            content = str(blog_dict.get("content") or "")
-            preview = content[:100] + "..." if len(content) > 100 else content
-            blog_dict["preview"] = preview
-            blog_list.append(blog_dict)
+        return blog_list(Blog.query)
 
-        return {
-            "status": "success",
-            "message": "Blogs fetched successfully",
-            "data": blog_list,
-        }, 200
+
+# --- Resource for searching blogs ---
+class BlogSearchResource(Resource):
+    def get(self):
+        """
+        Published blogs matching ``q``, best match first, each with a
+        highlighted snippet. Paginated like the blog list.
+        """
+        query, rank = blog_search_query(request.args.get("q", ""))
+        if query is None:
+            return restful_response(
+                status="error", message="q is required", status_code=400
+            )
+        try:
+            hits, pagination = paginate(query, rank, Blog.id, request.args)
+        except ValueError as e:
+            return restful_response(status="error", message=str(e), status_code=400)
+
+        return restful_response(
+            status="success",
+            message="Blogs fetched successfully",
+            data=[search_hit(hit) for hit in hits],
+            pagination=pagination,
+        )
+
+
+# --- Resource for trending blogs ---
+class BlogTrendingResource(Resource):
+    def get(self):
+        """
+        Recent published blogs with the most engagement, discounted by age.
+        Served from the precomputed ranking; ``limit`` is at most
+        TRENDING_SIZE.
+        """
+        limit = min(max(request.args.get("limit", 5, type=int), 1), TRENDING_SIZE)
+        trending_ranking.ensure_fresh()
+        ranked = trending_ranking.top(limit)
+
+        blogs = {
+            blog.id: blog
+            for blog in Blog.query.options(defer(Blog.content), defer(Blog.image))
+            .filter(Blog.id.in_([blog_id for blog_id, _ in ranked]))
+            .all()
+        }
+        data = []
+        for blog_id, score in ranked:
+            if blog_id in blogs:
+                blog_dict = blogs[blog_id].to_dict(include_content=False)
+                blog_dict["trending_score"] = round(score, 2)
+                data.append(blog_counter_buffer.overlay(blog_dict))
+
+        return restful_response(
+            status="success", message="Trending blogs fetched successfully", data=data
+        )
+
+
+# --- Resource for related blogs ---
+class BlogRelatedResource(Resource):
+    def get(self, blog_id):
+        """
+        Published blogs most similar in wording to a blog, each with its
+        ``similarity`` (0-1). Read from the precomputed blog_related table;
+        ``limit`` is at most RELATED_SIZE.
+        """
+        if not db.session.query(Blog.id).filter_by(id=blog_id).first():
+            return restful_response(
+                status="error", message="Blog not found", status_code=404
+            )
+        limit = min(max(request.args.get("limit", 5, type=int), 1), RELATED_SIZE)
+        rows = related_blogs(
+            blog_id, limit, options=(defer(Blog.content), defer(Blog.image))
+        )
+
+        data = []
+        for blog, score in rows:
+            blog_dict = blog.to_dict(include_content=False)
+            blog_dict["similarity"] = round(score, 3)
+            data.append(blog_counter_buffer.overlay(blog_dict))
+
+        return restful_response(
+            status="success", message="Related blogs fetched successfully", data=data
+        )
 
 
 # --- Resource for all blogs by admin ---
@@ -62,36 +173,19 @@ class AdminBlogListResource(Resource):
                 status="error", message="Unauthorized", status_code=403
             )
 
-        if admin.role.value == Role.SUPER_ADMIN.value:
-            blogs = Blog.query.order_by(Blog.date_created.desc()).all()
-        else:
-            blogs = (
-                Blog.query.filter_by(admin_id=admin_id)
-                .order_by(Blog.date_created.desc())
-                .all()
-            )
-
-        blog_list = []
-        for blog in blogs:
-            blog_dict = blog.to_dict()
-            content = str(blog_dict.get("content") or "")
-            preview = content[:100] + "..." if len(content) > 100 else content
-            blog_dict["preview"] = preview
-            blog_list.append(blog_dict)
-
-        return {
-            "status": "success",
-            "message": "Blogs fetched successfully",
-            "data": blog_list,
-        }, 200
+        query = Blog.query
+        if admin.role.value != Role.SUPER_ADMIN.value:
+            query = query.filter_by(admin_id=admin_id)
+        return blog_list(query)
 
 
 # --- Resource for a single blog ---
 class BlogResource(Resource):
+    @response_cache.cached("blogs")
     def get(self, blog_id):
         blog = Blog.query.get_or_404(blog_id)
         content = str(blog.content or "")
-        blog_dict = blog.to_dict()
+        blog_dict = blog_counter_buffer.overlay(blog.to_dict())
         blog_dict["content"] = content  # ensure content is normalized
 
         return {
@@ -101,6 +195,42 @@ class BlogResource(Resource):
         }, 200
 
 
+# --- Resources for counting views and likes ---
+class BlogCounterResource(Resource):
+    counter = None
+
+    def post(self, blog_id):
+        """
+        Count one view or like. The increment is buffered and written in a
+        batch later; the counts returned already include it.
+        """
+        blog = (
+            db.session.query(Blog.id, Blog.views, Blog.likes)
+            .filter_by(id=blog_id)
+            .first()
+        )
+        if blog is None:
+            return restful_response(
+                status="error", message="Blog not found", status_code=404
+            )
+
+        blog_counter_buffer.add(blog_id, self.counter)
+        counts = blog_counter_buffer.overlay(
+            {"id": blog.id, "views": blog.views, "likes": blog.likes}
+        )
+        return restful_response(
+            status="success", message=f"Blog {self.counter} updated", data=counts
+        )
+
+
+class BlogViewResource(BlogCounterResource):
+    counter = "views"
+
+
+class BlogLikeResource(BlogCounterResource):
+    counter = "likes"
+
+
 class BlogNewsletterResource(Resource):
     @jwt_required()
     def post(self):
@@ -195,6 +325,7 @@ class BlogNewsletterResource(Resource):
             # Add to the session and commit
             db.session.add(new_blog)
             db.session.commit()
+            queue_related_refresh(new_blog.id)
 
             is_newsletter = new_blog.type == BlogType.NEWSLETTER
             is_published = new_blog.status == BlogStatus.PUBLISHED
@@ -306,6 +437,7 @@ class BlogNewsletterUpdateResource(Resource):
 
             db.session.add(blog)
             db.session.commit()
+            queue_related_refresh(blog_id)
 
             # Send newsletter emails to subscribers
             if blog.type == BlogType.NEWSLETTER and blog.status == BlogStatus.PUBLISHED:
@@ -368,6 +500,7 @@ class BlogNewsletterUpdateResource(Resource):
         try:
             db.session.delete(blog)
             db.session.commit()
+            queue_related_refresh(blog_id)
             return restful_response(
                 status="success",
                 message="Blog deleted successfully",
@@ -452,8 +585,13 @@ class SendNewsletterResource(Resource):
 
 api.add_resource(BlogListResource, "/blogs")
 api.add_resource(AdminBlogListResource, "/admin/blogs")
+api.add_resource(BlogSearchResource, "/blogs/search")
+api.add_resource(BlogTrendingResource, "/blogs/trending")
 api.add_resource(BlogResource, "/blogs/<int:blog_id>")
+api.add_resource(BlogRelatedResource, "/blogs/<int:blog_id>/related")
 api.add_resource(BlogNewsletterResource, "/blogs")
 api.add_resource(BlogNewsletterUpdateResource, "/blogs/<int:blog_id>")
 api.add_resource(BlogImageResource, "/blogs/image/<int:blog_id>")
+api.add_resource(BlogViewResource, "/blogs/<int:blog_id>/view")
+api.add_resource(BlogLikeResource, "/blogs/<int:blog_id>/like")
 api.add_resource(SendNewsletterResource, "/blogs/send-newsletter/<int:blog_id>")
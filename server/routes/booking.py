@@ -6,15 +6,25 @@ from flask_jwt_extended import jwt_required
 from models import db
 from models.booking import Booking, BookingStatus
 from models.user import User, Role
-from models.service import Service
+from models.service import Service, parse_duration_minutes
 from utils.responses import restful_response
 from utils.auth_helpers import get_current_user_and_role
+from utils.idempotency import idempotent
+from utils.pagination import paginate
+from utils.availability import (
+    BatchConflictChecker,
+    find_booking_conflict,
+    is_overlap_violation,
+)
 from datetime import datetime, date, timedelta, timezone
 from models.invoice import Invoice, InvoiceStatus
 
 booking_bp = Blueprint("booking", __name__)
 api = Api(booking_bp)
 
+# Maximum number of bookings accepted by POST /bookings/bulk
+MAX_BULK_BOOKINGS = 500
+
 
 def parse_booking_fields(data):
     """Parse booking fields from JSON to correct Python types."""
@@ -37,23 +47,30 @@ def parse_booking_fields(data):
 
 
 def calculate_end_time(start_time, duration_str):
-    """Calculate end_time based on start_time and service duration"""
-    try:
-        # Parse duration string like "2 hr 30 min"
-        parts = duration_str.split()
-        hours = 0
-        minutes = 0
-
-        for i, part in enumerate(parts):
-            if part == "hr" and i > 0:
-                hours = int(parts[i - 1])
-            elif part == "min" and i > 0:
-                minutes = int(parts[i - 1])
-
-        return start_time + timedelta(hours=hours, minutes=minutes)
-    except (ValueError, IndexError):
-        # Default to 1 hour if parsing fails
-        return start_time + timedelta(hours=1)
+    """Calculate end_time based on start_time and a duration string"""
+    return start_time + timedelta(minutes=parse_duration_minutes(duration_str))
+
+
+def new_booking_with_invoice(client_id, service, start_time, **fields):
+    """Unsaved Booking of ``service`` at ``start_time`` and its Invoice."""
+    booking = Booking(
+        client_id=client_id,
+        service_id=service.id,
+        start_time=start_time,
+        end_time=start_time + timedelta(minutes=service.duration_minutes),
+        booking_date=date.today(),  # Set booking_date to today in routes
+        status=BookingStatus.pending,  # Default status
+        **fields,
+    )
+    invoice = Invoice(
+        amount=int(service.price),
+        client_id=client_id,
+        service_id=service.id,
+        created_at=date.today(),
+        due_date=date.today() + timedelta(days=30),
+        status=InvoiceStatus.pending,
+    )
+    return booking, invoice
 
 
 class BookingListResource(Resource):
@@ -74,16 +91,22 @@ class BookingListResource(Resource):
                 joinedload(Booking.client), joinedload(Booking.service)
             )
 
-            if role == Role.ADMIN.value or role == Role.SUPER_ADMIN.value:
-                bookings = base_query.all()
-            else:
-                bookings = base_query.filter_by(client_id=current_user.id).all()
+            if role not in (Role.ADMIN.value, Role.SUPER_ADMIN.value):
+                base_query = base_query.filter_by(client_id=current_user.id)
+
+            try:
+                bookings, pagination = paginate(
+                    base_query, Booking.id, Booking.id, request.args, descending=False
+                )
+            except ValueError as e:
+                return restful_response(status="error", message=str(e), status_code=400)
 
             return restful_response(
                 status="success",
                 data=[booking.to_dict() for booking in bookings],
                 message="Bookings retrieved successfully",
                 status_code=200,
+                pagination=pagination,
             )
         except Exception as e:
             return restful_response(
@@ -93,6 +116,7 @@ class BookingListResource(Resource):
             )
 
     @jwt_required()
+    @idempotent
     def post(self):
         """Create a new booking (admin can assign client, client can book self)."""
         try:
@@ -200,28 +224,21 @@ class BookingListResource(Resource):
                 )
 
             # --- Calculate end_time from service duration ---
-            end_time = calculate_end_time(start_time, service.duration)
-
-            # --- Create Booking ---
-            booking = Booking(
-                client_id=client_id,
-                service_id=service_id,
-                start_time=start_time,
-                end_time=end_time,
-                booking_date=date.today(),  # Set booking_date to today in routes
-                status=BookingStatus.pending,  # Default status
-            )
+            end_time = start_time + timedelta(minutes=service.duration_minutes)
 
-            # --- Create Invoice ---
-            amount = int(service.price)
-            invoice = Invoice(
-                amount=amount,
-                client_id=client_id,
-                service_id=service_id,
-                created_at=date.today(),
-                due_date=date.today() + timedelta(days=30),
-                status=InvoiceStatus.pending,
+            # --- Reject overlapping bookings ---
+            conflict = find_booking_conflict(
+                service_id, client_id, start_time, end_time
             )
+            if conflict:
+                return restful_response(
+                    status="error",
+                    message=conflict,
+                    status_code=409,
+                )
+
+            # --- Create Booking and Invoice ---
+            booking, invoice = new_booking_with_invoice(client_id, service, start_time)
 
             # --- Save Booking and Invoice ---
             db.session.add(booking)
@@ -246,8 +263,14 @@ class BookingListResource(Resource):
                 message=str(e),
                 status_code=400,
             )
-        except IntegrityError:
+        except IntegrityError as e:
             db.session.rollback()
+            if is_overlap_violation(e):
+                return restful_response(
+                    status="error",
+                    message="This time slot is already booked for the selected service",
+                    status_code=409,
+                )
             return restful_response(
                 status="error",
                 message="Database integrity error",
@@ -262,6 +285,207 @@ class BookingListResource(Resource):
             )
 
 
+def parse_bulk_item(item):
+    """Return (client_id, service_id, start_time) of one bulk booking item."""
+    if not isinstance(item, dict):
+        raise ValueError("Each booking must be an object")
+    try:
+        client_id = int(item.get("client_id"))
+        service_id = int(item.get("service_id"))
+    except (ValueError, TypeError):
+        raise ValueError("Valid client_id and service_id are required")
+    try:
+        start_time = parse_booking_fields({"start_time": item["start_time"]})[
+            "start_time"
+        ]
+    except (KeyError, ValueError, TypeError):
+        raise ValueError("Invalid start time format")
+    if start_time < datetime.now(timezone.utc):
+        raise ValueError("Start time cannot be in the past")
+    return client_id, service_id, start_time
+
+
+class BookingBulkResource(Resource):
+    @jwt_required()
+    @idempotent
+    def post(self):
+        """
+        Create many bookings in one transaction (admins only).
+
+        Body: ``{"bookings": [{client_id, service_id, start_time}, ...],
+        "atomic": false}``. Clients and services are looked up with one
+        query each and conflicts are checked in memory, including between
+        items of the batch. Valid items are inserted together with their
+        invoices; with ``atomic`` nothing is inserted unless every item is
+        valid. Returns one result per item, in order.
+        """
+        try:
+            current_user, role = get_current_user_and_role()
+            if not current_user:
+                return restful_response(
+                    status="error",
+                    message="Authentication required",
+                    status_code=401,
+                )
+            if role not in [Role.ADMIN.value, Role.SUPER_ADMIN.value]:
+                return restful_response(
+                    status="error",
+                    message="Only administrators can create bookings in bulk",
+                    status_code=403,
+                )
+
+            data = request.get_json() or {}
+            items = data.get("bookings")
+            if not isinstance(items, list) or not items:
+                return restful_response(
+                    status="error",
+                    message="A non-empty 'bookings' list is required",
+                    status_code=400,
+                )
+            if len(items) > MAX_BULK_BOOKINGS:
+                return restful_response(
+                    status="error",
+                    message=f"At most {MAX_BULK_BOOKINGS} bookings per request",
+                    status_code=400,
+                )
+
+            results = [None] * len(items)
+            parsed = {}
+            for index, item in enumerate(items):
+                try:
+                    parsed[index] = parse_bulk_item(item)
+                except ValueError as e:
+                    results[index] = {
+                        "index": index,
+                        "status": "error",
+                        "message": str(e),
+                    }
+
+            # --- Set-based lookups ---
+            client_ids = {client_id for client_id, _, _ in parsed.values()}
+            service_ids = {service_id for _, service_id, _ in parsed.values()}
+            clients = {
+                client_id
+                for (client_id,) in db.session.query(User.id).filter(
+                    User.id.in_(client_ids), User.is_deleted.is_(False)
+                )
+            }
+            services = {
+                service.id: service
+                for service in Service.query.filter(
+                    Service.id.in_(service_ids), Service.is_deleted.is_(False)
+                )
+            }
+
+            candidates = []
+            for index, (client_id, service_id, start_time) in parsed.items():
+                service = services.get(service_id)
+                if client_id not in clients or not service:
+                    results[index] = {
+                        "index": index,
+                        "status": "error",
+                        "message": (
+                            "Client not found" if service else "Service not found"
+                        ),
+                    }
+                    continue
+                end_time = start_time + timedelta(minutes=service.duration_minutes)
+                candidates.append((index, client_id, service, start_time, end_time))
+
+            # --- Conflict checks against existing and earlier batch items ---
+            new_rows = []
+            if candidates:
+                checker = BatchConflictChecker(
+                    min(candidate[3] for candidate in candidates),
+                    max(candidate[4] for candidate in candidates),
+                    service_ids,
+                    client_ids,
+                )
+            for index, client_id, service, start_time, end_time in candidates:
+                try:
+                    message = checker.check(service.id, client_id, start_time, end_time)
+                    if message:
+                        raise ValueError(message)
+                    booking, invoice = new_booking_with_invoice(
+                        client_id, service, start_time
+                    )
+                except ValueError as e:
+                    results[index] = {
+                        "index": index,
+                        "status": "error",
+                        "message": str(e),
+                    }
+                    continue
+
+                checker.add(("new", index), service.id, client_id, start_time, end_time)
+                new_rows.append((index, booking, invoice))
+
+            failed = len(items) - len(new_rows)
+            if failed and data.get("atomic"):
+                for index, _, _ in new_rows:
+                    results[index] = {
+                        "index": index,
+                        "status": "skipped",
+                        "message": "Not created because other items failed",
+                    }
+                return restful_response(
+                    status="error",
+                    data=results,
+                    message=f"{failed} booking(s) failed validation; none created",
+                    status_code=400,
+                )
+
+            # --- Insert bookings and invoices together ---
+            db.session.add_all(
+                [booking for _, booking, _ in new_rows]
+                + [invoice for _, _, invoice in new_rows]
+            )
+            db.session.flush()
+            for index, booking, invoice in new_rows:
+                results[index] = {
+                    "index": index,
+                    "status": "created",
+                    "booking_id": booking.id,
+                    "invoice_id": invoice.id,
+                    "start_time": booking.start_time.isoformat(),
+                    "end_time": booking.end_time.isoformat(),
+                }
+            db.session.commit()
+
+            if not new_rows:
+                status, status_code = "error", 400
+            elif failed:
+                status, status_code = "success", 207
+            else:
+                status, status_code = "success", 201
+            return restful_response(
+                status=status,
+                data=results,
+                message=f"{len(new_rows)} booking(s) created, {failed} failed",
+                status_code=status_code,
+            )
+        except IntegrityError as e:
+            db.session.rollback()
+            if is_overlap_violation(e):
+                return restful_response(
+                    status="error",
+                    message="A time slot in the batch was booked concurrently",
+                    status_code=409,
+                )
+            return restful_response(
+                status="error",
+                message="Database integrity error",
+                status_code=400,
+            )
+        except Exception as e:
+            db.session.rollback()
+            return restful_response(
+                status="error",
+                message=f"Error creating bookings: {str(e)}",
+                status_code=500,
+            )
+
+
 class BookingResource(Resource):
     @jwt_required()
     def get(self, booking_id):
@@ -371,8 +595,8 @@ class BookingResource(Resource):
             if recalculate_end_time:
                 if not new_start_time:
                     new_start_time = booking.start_time
-                booking.end_time = calculate_end_time(
-                    new_start_time, new_service.duration
+                booking.end_time = new_start_time + timedelta(
+                    minutes=new_service.duration_minutes
                 )
 
             # Apply other parsed fields (status)
@@ -412,6 +636,25 @@ class BookingResource(Resource):
                         )
                     booking.client_id = client_id
 
+            # --- Reject overlapping bookings ---
+            if booking.status != BookingStatus.cancelled and (
+                recalculate_end_time or "status" in parsed_fields or "client_id" in data
+            ):
+                conflict = find_booking_conflict(
+                    booking.service_id,
+                    booking.client_id,
+                    booking.start_time,
+                    booking.end_time,
+                    ignore_id=booking.id,
+                )
+                if conflict:
+                    db.session.rollback()
+                    return restful_response(
+                        status="error",
+                        message=conflict,
+                        status_code=409,
+                    )
+
             db.session.commit()
 
             return restful_response(
@@ -427,6 +670,19 @@ class BookingResource(Resource):
                 message=str(e),
                 status_code=400,
             )
+        except IntegrityError as e:
+            db.session.rollback()
+            if is_overlap_violation(e):
+                return restful_response(
+                    status="error",
+                    message="This time slot is already booked for the selected service",
+                    status_code=409,
+                )
+            return restful_response(
+                status="error",
+                message="Database integrity error",
+                status_code=400,
+            )
         except Exception as e:
             print("PATCH error:", e)
             db.session.rollback()
@@ -485,4 +741,5 @@ class BookingResource(Resource):
 
 
 api.add_resource(BookingListResource, "/bookings")
+api.add_resource(BookingBulkResource, "/bookings/bulk")
 api.add_resource(BookingResource, "/bookings/<int:booking_id>")
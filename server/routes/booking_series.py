@@ -0,0 +1,505 @@
+import heapq
+from datetime import datetime, timedelta, timezone
+from flask import request, Blueprint
+from flask_restful import Resource, Api
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from flask_jwt_extended import jwt_required
+from models import db
+from models.booking import Booking
+from models.booking_series import BookingSeries, BookingSeriesException
+from models.user import User, Role
+from models.service import Service
+from routes.booking import new_booking_with_invoice
+from utils.responses import restful_response
+from utils.auth_helpers import get_current_user_and_role
+from utils.availability import find_booking_conflict, is_overlap_violation
+from utils.booking_series import (
+    active_series,
+    find_occurrence,
+    occurrence_to_dict,
+    refresh_series_bounds,
+    series_occurrences,
+)
+from utils.idempotency import idempotent
+from utils.recurrence import as_utc
+
+booking_series_bp = Blueprint("booking_series", __name__)
+api = Api(booking_series_bp)
+
+DEFAULT_OCCURRENCE_WINDOW = timedelta(days=90)
+MAX_OCCURRENCE_WINDOW = timedelta(days=366)
+
+
+def is_admin(role):
+    return role in [Role.ADMIN.value, Role.SUPER_ADMIN.value]
+
+
+def parse_utc(value):
+    """Parse an ISO 8601 datetime, assuming UTC when it is naive."""
+    return as_utc(datetime.fromisoformat(value))
+
+
+def parse_window(args):
+    """(from, to) query parameters, defaulting to the next 90 days."""
+    window_start = (
+        parse_utc(args["from"]) if args.get("from") else datetime.now(timezone.utc)
+    )
+    window_end = (
+        parse_utc(args["to"])
+        if args.get("to")
+        else window_start + DEFAULT_OCCURRENCE_WINDOW
+    )
+    if window_end <= window_start:
+        raise ValueError("'to' must be after 'from'")
+    if window_end - window_start > MAX_OCCURRENCE_WINDOW:
+        raise ValueError("Occurrences can be listed for at most 366 days")
+    return window_start, window_end
+
+
+def get_visible_series(series_id, current_user, role):
+    """The series if it exists and the user may see it, else None."""
+    series = (
+        active_series()
+        .options(joinedload(BookingSeries.service), joinedload(BookingSeries.client))
+        .filter(BookingSeries.id == series_id)
+        .first()
+    )
+    if series and (is_admin(role) or series.client_id == current_user.id):
+        return series
+    return None
+
+
+class BookingSeriesListResource(Resource):
+    @jwt_required()
+    def get(self):
+        """List recurring series (admins see all, clients only see theirs)."""
+        current_user, role = get_current_user_and_role()
+        if not current_user:
+            return restful_response(
+                status="error", message="Authentication required", status_code=401
+            )
+
+        query = active_series().options(
+            joinedload(BookingSeries.client), joinedload(BookingSeries.service)
+        )
+        if not is_admin(role):
+            query = query.filter(BookingSeries.client_id == current_user.id)
+
+        return restful_response(
+            status="success",
+            data=[series.to_dict() for series in query.order_by(BookingSeries.id)],
+            message="Booking series retrieved successfully",
+            status_code=200,
+        )
+
+    @jwt_required()
+    @idempotent
+    def post(self):
+        """Create a recurring series; no bookings are created until confirmed."""
+        try:
+            data = request.get_json() or {}
+            current_user, role = get_current_user_and_role()
+            if not current_user:
+                return restful_response(
+                    status="error", message="Authentication required", status_code=401
+                )
+
+            if is_admin(role):
+                client_id = data.get("client_id")
+                if not client_id:
+                    return restful_response(
+                        status="error",
+                        message="Client is required for admin users",
+                        status_code=400,
+                    )
+            else:
+                client_id = current_user.id
+
+            try:
+                client_id = int(client_id)
+                service_id = int(data.get("service_id"))
+            except (ValueError, TypeError):
+                return restful_response(
+                    status="error",
+                    message="Valid client and service IDs are required",
+                    status_code=400,
+                )
+
+            if not User.query.filter_by(id=client_id, is_deleted=False).first():
+                return restful_response(
+                    status="error", message="Client not found", status_code=400
+                )
+            service = Service.query.filter_by(id=service_id, is_deleted=False).first()
+            if not service:
+                return restful_response(
+                    status="error", message="Service not found", status_code=400
+                )
+
+            try:
+                start_time = parse_utc(data.get("start_time"))
+            except (ValueError, TypeError):
+                return restful_response(
+                    status="error",
+                    message="Invalid start time format",
+                    status_code=400,
+                )
+            if start_time < datetime.now(timezone.utc):
+                return restful_response(
+                    status="error",
+                    message="Start time cannot be in the past",
+                    status_code=400,
+                )
+
+            series = BookingSeries(
+                client_id=client_id,
+                service_id=service_id,
+                start_time=start_time,
+                rrule=data.get("rrule"),
+            )
+            series.service = service
+            refresh_series_bounds(series)
+
+            # Check the first stretch of the series against existing bookings
+            for occurrence in series_occurrences(
+                series, start_time, start_time + DEFAULT_OCCURRENCE_WINDOW
+            ):
+                conflict = find_booking_conflict(
+                    service_id, client_id, occurrence.start_time, occurrence.end_time
+                )
+                if conflict:
+                    db.session.rollback()
+                    return restful_response(
+                        status="error",
+                        message=f"{conflict} ({occurrence.start_time.isoformat()})",
+                        status_code=409,
+                    )
+
+            db.session.add(series)
+            db.session.commit()
+
+            return restful_response(
+                status="success",
+                data=series.to_dict(),
+                message="Booking series created successfully",
+                status_code=201,
+            )
+        except ValueError as e:
+            db.session.rollback()
+            return restful_response(status="error", message=str(e), status_code=400)
+        except Exception as e:
+            db.session.rollback()
+            return restful_response(
+                status="error",
+                message=f"Error creating booking series: {str(e)}",
+                status_code=500,
+            )
+
+
+class BookingSeriesResource(Resource):
+    @jwt_required()
+    def get(self, series_id):
+        """Retrieve a series with its exceptions."""
+        current_user, role = get_current_user_and_role()
+        series = current_user and get_visible_series(series_id, current_user, role)
+        if not series:
+            return restful_response(
+                status="error", message="Booking series not found", status_code=404
+            )
+
+        data = series.to_dict()
+        data["exceptions"] = [exception.to_dict() for exception in series.exceptions]
+        return restful_response(
+            status="success",
+            data=data,
+            message="Booking series retrieved successfully",
+            status_code=200,
+        )
+
+    @jwt_required()
+    def delete(self, series_id):
+        """End a series. Confirmed bookings are kept."""
+        current_user, role = get_current_user_and_role()
+        series = current_user and get_visible_series(series_id, current_user, role)
+        if not series:
+            return restful_response(
+                status="error", message="Booking series not found", status_code=404
+            )
+
+        series.is_deleted = True
+        db.session.commit()
+        return restful_response(
+            status="success",
+            message="Booking series deleted successfully",
+            status_code=200,
+        )
+
+
+class BookingSeriesOccurrencesResource(Resource):
+    @jwt_required()
+    def get(self, series_id):
+        """Occurrences of one series between ``from`` and ``to``."""
+        current_user, role = get_current_user_and_role()
+        series = current_user and get_visible_series(series_id, current_user, role)
+        if not series:
+            return restful_response(
+                status="error", message="Booking series not found", status_code=404
+            )
+
+        try:
+            window_start, window_end = parse_window(request.args)
+        except ValueError as e:
+            return restful_response(status="error", message=str(e), status_code=400)
+
+        occurrences = series_occurrences(series, window_start, window_end)
+        return restful_response(
+            status="success",
+            data=[occurrence_to_dict(occurrence) for occurrence in occurrences],
+            message="Occurrences retrieved successfully",
+            status_code=200,
+        )
+
+    @jwt_required()
+    def patch(self, series_id):
+        """
+        Move or cancel a single occurrence.
+
+        Body: ``occurrence_start`` plus either ``start_time`` or
+        ``"status": "cancelled"``. Confirmed occurrences are edited through
+        their booking instead.
+        """
+        try:
+            current_user, role = get_current_user_and_role()
+            series = current_user and get_visible_series(series_id, current_user, role)
+            if not series:
+                return restful_response(
+                    status="error",
+                    message="Booking series not found",
+                    status_code=404,
+                )
+
+            data = request.get_json() or {}
+            try:
+                occurrence_start = parse_utc(data.get("occurrence_start"))
+            except (ValueError, TypeError):
+                return restful_response(
+                    status="error",
+                    message="A valid occurrence_start is required",
+                    status_code=400,
+                )
+
+            occurrence = find_occurrence(series, occurrence_start)
+            if occurrence is None:
+                return restful_response(
+                    status="error", message="Occurrence not found", status_code=404
+                )
+            if occurrence.booking_id:
+                return restful_response(
+                    status="error",
+                    message="Occurrence is already booked; update booking "
+                    f"{occurrence.booking_id} instead",
+                    status_code=409,
+                )
+
+            exception = next(
+                (
+                    e
+                    for e in series.exceptions
+                    if as_utc(e.occurrence_start) == occurrence_start
+                ),
+                None,
+            ) or BookingSeriesException(occurrence_start=occurrence_start)
+
+            if data.get("status") == "cancelled":
+                exception.is_cancelled = True
+                exception.start_time = None
+            elif data.get("start_time"):
+                start_time = parse_utc(data["start_time"])
+                if start_time < datetime.now(timezone.utc):
+                    raise ValueError("Start time cannot be in the past")
+                end_time = start_time + timedelta(
+                    minutes=series.service.duration_minutes
+                )
+                conflict = find_booking_conflict(
+                    series.service_id,
+                    series.client_id,
+                    start_time,
+                    end_time,
+                    ignore_series_id=series.id,
+                )
+                if conflict:
+                    return restful_response(
+                        status="error", message=conflict, status_code=409
+                    )
+                exception.start_time = start_time
+            else:
+                return restful_response(
+                    status="error",
+                    message="Provide a new start_time or status 'cancelled'",
+                    status_code=400,
+                )
+
+            if exception.id is None:
+                series.exceptions.append(exception)
+            db.session.commit()
+
+            return restful_response(
+                status="success",
+                data=exception.to_dict(),
+                message="Occurrence updated successfully",
+                status_code=200,
+            )
+        except ValueError as e:
+            db.session.rollback()
+            return restful_response(status="error", message=str(e), status_code=400)
+        except Exception as e:
+            db.session.rollback()
+            return restful_response(
+                status="error",
+                message=f"Error updating occurrence: {str(e)}",
+                status_code=500,
+            )
+
+
+class BookingSeriesConfirmResource(Resource):
+    @jwt_required()
+    @idempotent
+    def post(self, series_id):
+        """Turn one occurrence into a real Booking and Invoice."""
+        try:
+            current_user, role = get_current_user_and_role()
+            series = current_user and get_visible_series(series_id, current_user, role)
+            if not series:
+                return restful_response(
+                    status="error",
+                    message="Booking series not found",
+                    status_code=404,
+                )
+
+            data = request.get_json() or {}
+            try:
+                occurrence_start = parse_utc(data.get("occurrence_start"))
+            except (ValueError, TypeError):
+                return restful_response(
+                    status="error",
+                    message="A valid occurrence_start is required",
+                    status_code=400,
+                )
+
+            occurrence = find_occurrence(series, occurrence_start)
+            if occurrence is None:
+                return restful_response(
+                    status="error", message="Occurrence not found", status_code=404
+                )
+            if occurrence.booking_id:
+                return restful_response(
+                    status="error",
+                    message="Occurrence is already booked",
+                    status_code=409,
+                )
+
+            conflict = find_booking_conflict(
+                series.service_id,
+                series.client_id,
+                occurrence.start_time,
+                occurrence.end_time,
+                ignore_series_id=series.id,
+            )
+            if conflict:
+                return restful_response(
+                    status="error", message=conflict, status_code=409
+                )
+
+            booking, invoice = new_booking_with_invoice(
+                series.client_id,
+                series.service,
+                occurrence.start_time,
+                series_id=series.id,
+                occurrence_start=occurrence_start,
+            )
+            db.session.add(booking)
+            db.session.add(invoice)
+            db.session.commit()
+
+            booking = Booking.query.options(
+                joinedload(Booking.client), joinedload(Booking.service)
+            ).get(booking.id)
+            return restful_response(
+                status="success",
+                data=booking.to_dict(),
+                message="Occurrence confirmed successfully",
+                status_code=201,
+            )
+        except ValueError as e:
+            db.session.rollback()
+            return restful_response(status="error", message=str(e), status_code=400)
+        except IntegrityError as e:
+            db.session.rollback()
+            if is_overlap_violation(e):
+                return restful_response(
+                    status="error",
+                    message="This time slot is already booked for the selected service",
+                    status_code=409,
+                )
+            return restful_response(
+                status="error",
+                message="Occurrence is already booked",
+                status_code=409,
+            )
+        except Exception as e:
+            db.session.rollback()
+            return restful_response(
+                status="error",
+                message=f"Error confirming occurrence: {str(e)}",
+                status_code=500,
+            )
+
+
+class OccurrenceListResource(Resource):
+    @jwt_required()
+    def get(self):
+        """Occurrences of all visible series between ``from`` and ``to``."""
+        current_user, role = get_current_user_and_role()
+        if not current_user:
+            return restful_response(
+                status="error", message="Authentication required", status_code=401
+            )
+
+        try:
+            window_start, window_end = parse_window(request.args)
+        except ValueError as e:
+            return restful_response(status="error", message=str(e), status_code=400)
+
+        query = (
+            active_series()
+            .options(joinedload(BookingSeries.service))
+            .filter(BookingSeries.start_time < window_end)
+        )
+        if not is_admin(role):
+            query = query.filter(BookingSeries.client_id == current_user.id)
+        if request.args.get("service_id", type=int):
+            query = query.filter(
+                BookingSeries.service_id == request.args.get("service_id", type=int)
+            )
+
+        occurrences = heapq.merge(
+            *(series_occurrences(series, window_start, window_end) for series in query)
+        )
+        return restful_response(
+            status="success",
+            data=[occurrence_to_dict(occurrence) for occurrence in occurrences],
+            message="Occurrences retrieved successfully",
+            status_code=200,
+        )
+
+
+api.add_resource(BookingSeriesListResource, "/booking-series")
+api.add_resource(OccurrenceListResource, "/booking-series/occurrences")
+api.add_resource(BookingSeriesResource, "/booking-series/<int:series_id>")
+api.add_resource(
+    BookingSeriesOccurrencesResource, "/booking-series/<int:series_id>/occurrences"
+)
+api.add_resource(
+    BookingSeriesConfirmResource,
+    "/booking-series/<int:series_id>/occurrences/confirm",
+)
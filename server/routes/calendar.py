@@ -0,0 +1,151 @@
+import hashlib
+import os
+import secrets
+from datetime import datetime, timedelta, timezone
+from flask import Blueprint, Response, jsonify, request, stream_with_context, url_for
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import func
+from models import db
+from models.booking import Booking
+from models.service import Service
+from models.user import User, Role
+from utils.ical import booking_event, calendar_footer, calendar_header
+
+calendar_bp = Blueprint("calendar", __name__)
+
+# Bookings that started longer ago than this are left out of feeds
+FEED_HISTORY_DAYS = int(os.getenv("FLASK_CALENDAR_FEED_HISTORY_DAYS", "365"))
+FEED_BATCH_SIZE = 500
+
+
+def feed_filters(user):
+    """Bookings shown in a user's feed (admins see all, clients only theirs)."""
+    since = datetime.now(timezone.utc) - timedelta(days=FEED_HISTORY_DAYS)
+    filters = [Booking.is_deleted.is_(False), Booking.start_time >= since]
+    if user.role not in (Role.ADMIN, Role.SUPER_ADMIN):
+        filters.append(Booking.client_id == user.id)
+    return filters
+
+
+def feed_etag(user):
+    """
+    ETag of a user's feed from one aggregate query.
+
+    Any booking insert, edit or soft delete changes the row count or the
+    latest change time, and service renames change the service maximum.
+    """
+    changed_at = func.coalesce(Booking.updated_at, Booking.created_at)
+    count, last_change, last_service_change = (
+        db.session.query(
+            func.count(Booking.id),
+            func.max(changed_at),
+            func.max(Service.updated_at),
+        )
+        .join(Service, Booking.service_id == Service.id)
+        .filter(*feed_filters(user))
+        .one()
+    )
+    key = f"{user.id}:{user.calendar_token}:{count}:{last_change}:{last_service_change}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def generate_feed(user):
+    """Yield the feed line by line from a server-side cursor."""
+    rows = (
+        db.session.query(
+            Booking.id,
+            Booking.start_time,
+            Booking.end_time,
+            Booking.status,
+            func.coalesce(Booking.updated_at, Booking.created_at),
+            Service.title,
+            User.full_name,
+        )
+        .join(Service, Booking.service_id == Service.id)
+        .join(User, Booking.client_id == User.id)
+        .filter(*feed_filters(user))
+        .order_by(Booking.start_time.asc(), Booking.id.asc())
+        .execution_options(yield_per=FEED_BATCH_SIZE)
+    )
+    is_admin = user.role in (Role.ADMIN, Role.SUPER_ADMIN)
+
+    yield from calendar_header(f"EcoVibe bookings - {user.full_name}")
+    for booking_id, start, end, status, changed_at, title, client_name in rows:
+        yield from booking_event(
+            booking_id,
+            start,
+            end,
+            status,
+            changed_at,
+            title,
+            client_name if is_admin else None,
+        )
+    yield from calendar_footer()
+
+
+@calendar_bp.route("/calendar/<string:token>.ics", methods=["GET"])
+def booking_feed(token):
+    """
+    iCalendar feed of the token owner's bookings. The token in the URL is
+    the only credential, as calendar apps cannot send a JWT.
+    """
+    user = User.query.filter_by(calendar_token=token, is_deleted=False).first()
+    if not user:
+        return jsonify({"status": "failed", "message": "Calendar not found"}), 404
+
+    etag = feed_etag(user)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    response = Response(
+        stream_with_context(generate_feed(user)),
+        mimetype="text/calendar",
+    )
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, max-age=0, must-revalidate"
+    response.headers["Content-Disposition"] = 'inline; filename="bookings.ics"'
+    return response
+
+
+@calendar_bp.route("/calendar/token", methods=["POST"])
+@jwt_required()
+def create_calendar_token():
+    """Create or rotate the current user's feed URL."""
+    user = User.query.filter_by(id=get_jwt_identity(), is_deleted=False).first()
+    if not user:
+        return jsonify({"status": "failed", "message": "User not found"}), 404
+
+    user.calendar_token = secrets.token_urlsafe(32)
+    db.session.commit()
+
+    feed_url = url_for(
+        "calendar.booking_feed", token=user.calendar_token, _external=True
+    )
+    return (
+        jsonify(
+            {
+                "status": "success",
+                "message": "Calendar feed created successfully",
+                "data": {"feed_url": feed_url},
+            }
+        ),
+        201,
+    )
+
+
+@calendar_bp.route("/calendar/token", methods=["DELETE"])
+@jwt_required()
+def revoke_calendar_token():
+    """Disable the current user's feed URL."""
+    user = User.query.filter_by(id=get_jwt_identity(), is_deleted=False).first()
+    if not user:
+        return jsonify({"status": "failed", "message": "User not found"}), 404
+
+    user.calendar_token = None
+    db.session.commit()
+    return (
+        jsonify({"status": "success", "message": "Calendar feed disabled"}),
+        200,
+    )
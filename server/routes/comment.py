@@ -0,0 +1,147 @@
+from flask_restful import Resource, Api
+from flask import Blueprint, request, current_app
+from flask_jwt_extended import jwt_required
+from sqlalchemy.orm import joinedload, load_only
+from utils.responses import restful_response
+from utils.auth_helpers import get_current_user_and_role
+from utils.blog_comments import MAX_COMMENT_LENGTH
+from utils.pagination import paginate
+from models import db
+from models.blog import Blog, BlogStatus
+from models.comment import Comment
+from models.user import User, Role
+
+comments_bp = Blueprint("comments", __name__)
+api = Api(comments_bp)
+
+
+def comment_dict(comment):
+    data = comment.to_dict()
+    data["author_name"] = comment.client.full_name if comment.client else None
+    return data
+
+
+class BlogCommentListResource(Resource):
+    def get(self, blog_id):
+        """
+        Comments on a published blog, oldest first, one keyset page at a
+        time (``limit``, ``cursor``).
+        """
+        blog = (
+            db.session.query(Blog.id)
+            .filter_by(id=blog_id, status=BlogStatus.PUBLISHED)
+            .first()
+        )
+        if blog is None:
+            return restful_response(
+                status="error", message="Blog not found", status_code=404
+            )
+
+        query = Comment.query.filter(Comment.blog_id == blog_id).options(
+            joinedload(Comment.client).load_only(User.id, User.full_name)
+        )
+        try:
+            comments, pagination = paginate(
+                query, Comment.created_at, Comment.id, request.args, descending=False
+            )
+        except ValueError as e:
+            return restful_response(status="error", message=str(e), status_code=400)
+
+        return restful_response(
+            status="success",
+            message="Comments fetched successfully",
+            data=[comment_dict(comment) for comment in comments],
+            pagination=pagination,
+        )
+
+    @jwt_required()
+    def post(self, blog_id):
+        """Add a comment to a published blog as the current user."""
+        user, _ = get_current_user_and_role()
+        if not user:
+            return restful_response(
+                status="error", message="User not found", status_code=404
+            )
+
+        blog = (
+            db.session.query(Blog.id)
+            .filter_by(id=blog_id, status=BlogStatus.PUBLISHED)
+            .first()
+        )
+        if blog is None:
+            return restful_response(
+                status="error", message="Blog not found", status_code=404
+            )
+
+        data = request.get_json(silent=True) or {}
+        description = str(data.get("description") or "").strip()
+        if not description:
+            return restful_response(
+                status="error", message="Comment cannot be empty", status_code=400
+            )
+        if len(description) > MAX_COMMENT_LENGTH:
+            return restful_response(
+                status="error",
+                message=f"Comment cannot exceed {MAX_COMMENT_LENGTH} characters",
+                status_code=400,
+            )
+
+        try:
+            comment = Comment(
+                description=description, client_id=user.id, blog_id=blog_id
+            )
+            db.session.add(comment)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            current_app.logger.exception(f"Error adding comment to blog {blog_id}")
+            return restful_response(
+                status="error", message="Internal server error", status_code=500
+            )
+
+        return restful_response(
+            status="success",
+            message="Comment added successfully",
+            data=comment_dict(comment),
+            status_code=201,
+        )
+
+
+class CommentResource(Resource):
+    @jwt_required()
+    def delete(self, comment_id):
+        """Delete a comment; clients may delete their own only."""
+        user, user_role = get_current_user_and_role()
+        if not user:
+            return restful_response(
+                status="error", message="User not found", status_code=404
+            )
+
+        comment = Comment.query.get(comment_id)
+        if comment is None:
+            return restful_response(
+                status="error", message="Comment not found", status_code=404
+            )
+        is_admin = user_role in [Role.ADMIN.value, Role.SUPER_ADMIN.value]
+        if comment.client_id != user.id and not is_admin:
+            return restful_response(
+                status="error", message="Access denied", status_code=403
+            )
+
+        try:
+            db.session.delete(comment)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            current_app.logger.exception(f"Error deleting comment {comment_id}")
+            return restful_response(
+                status="error", message="Internal server error", status_code=500
+            )
+
+        return restful_response(
+            status="success", message="Comment deleted successfully"
+        )
+
+
+api.add_resource(BlogCommentListResource, "/blogs/<int:blog_id>/comments")
+api.add_resource(CommentResource, "/comments/<int:comment_id>")
@@ -1,14 +1,17 @@
+import os
 from flask_restful import Resource, Api
 from flask import Blueprint
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from utils.responses import restful_response
+from utils.response_cache import response_cache
+from utils.snapshot_cache import SnapshotCache
+from utils.stats_counters import GLOBAL, read_counters, ticket_status_keys
 from models.user import User, Role
 from models.booking import Booking
 from models.document import Document
 from models.ticket import Ticket
 from models import db
-from sqlalchemy import func
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import defer, joinedload
 from models.invoice import Invoice
 from models.blog import Blog
 from models.payment import Payment
@@ -18,6 +21,158 @@ from models.service import Service
 dashboard_bp = Blueprint("dashboard", __name__)
 api = Api(dashboard_bp)
 
+# How long a dashboard snapshot is served before it is rebuilt
+DASHBOARD_TTL_SECONDS = float(os.getenv("FLASK_DASHBOARD_TTL_SECONDS", "30"))
+
+ADMIN_SNAPSHOT = ("admin",)
+
+dashboard_cache = SnapshotCache(DASHBOARD_TTL_SECONDS)
+
+
+def snapshot_keys(obj):
+    """Snapshots made stale by a change to ``obj`` (None means all of them)."""
+    if isinstance(obj, Document):
+        return None
+    client_id = getattr(obj, "client_id", None)
+    if client_id is not None:
+        return [ADMIN_SNAPSHOT, ("client", client_id)]
+    return [ADMIN_SNAPSHOT]
+
+
+dashboard_cache.invalidate_on_commit(
+    (Booking, Service, Payment, User, Blog, Invoice, Document, Ticket),
+    snapshot_keys,
+)
+
+
+def recent_documents():
+    return (
+        Document.query.options(defer(Document.file_data))
+        .order_by(Document.created_at.desc())
+        .limit(5)
+        .all()
+    )
+
+
+def client_snapshot(client_id):
+    """Client dashboard payload, without the per-request user name."""
+    upcoming_appointments = (
+        Booking.query.options(joinedload(Booking.service))
+        .filter_by(client_id=client_id)
+        .order_by(Booking.booking_date.asc())
+        .limit(3)
+        .all()
+    )
+
+    appointments_data = []
+    for b in upcoming_appointments:
+        appointments_data.append(
+            {
+                "id": b.id,
+                "booking_date": (
+                    b.booking_date.isoformat() if b.booking_date else None
+                ),
+                "start_time": b.start_time.isoformat() if b.start_time else None,
+                "end_time": b.end_time.isoformat() if b.end_time else None,
+                "status": b.status.value if b.status else None,
+                "service_id": b.service_id,
+                "service_name": b.service.title if b.service else None,
+            }
+        )
+
+    ticket_keys = ticket_status_keys(client_id)
+    total_bookings, paid_invoices, total_documents, *ticket_counts = read_counters(
+        [
+            ("bookings.client", client_id),
+            ("invoices.paid.client", client_id),
+            ("documents", GLOBAL),
+            *ticket_keys,
+        ]
+    )
+    ticket_raised = sum(ticket_counts)
+
+    return {
+        "stats": {
+            "totalBookings": total_bookings,
+            "paidInvoices": paid_invoices,
+            "ticketsRaised": ticket_raised,
+            "documentsDownloaded": total_documents,
+        },
+        "upcomingAppointments": appointments_data,
+        "documents": [d.to_dict() for d in recent_documents()],
+    }
+
+
+def admin_snapshot():
+    """Admin dashboard payload, shared by all admins."""
+    total_bookings, total_services, total_payments, total_clients, blog_post = (
+        read_counters(
+            [
+                ("bookings", GLOBAL),
+                ("services", GLOBAL),
+                ("payments", GLOBAL),
+                ("users.client", GLOBAL),
+                ("blogs", GLOBAL),
+            ]
+        )
+    )
+
+    recent_bookings = (
+        Booking.query.options(joinedload(Booking.client), joinedload(Booking.service))
+        .order_by(Booking.created_at.desc())
+        .limit(5)
+        .all()
+    )
+    recent_bookings_data = []
+    for b in recent_bookings:
+        recent_bookings_data.append(
+            {
+                "id": b.id,
+                "booking_date": b.booking_date.isoformat(),
+                "start_time": b.start_time.isoformat(),
+                "end_time": b.end_time.isoformat(),
+                "status": b.status.value,
+                "client_id": b.client_id,
+                "service_id": b.service_id,
+                "client_name": b.client.full_name,
+                "service_title": b.service.title,
+                "created_at": b.created_at.isoformat() if b.created_at else None,
+                "updated_at": b.updated_at.isoformat() if b.updated_at else None,
+            }
+        )
+
+    recent_payments = (
+        Invoice.query.options(joinedload(Invoice.client), joinedload(Invoice.service))
+        .filter(Invoice.status == "paid")
+        .order_by(Invoice.created_at.desc())
+        .limit(5)
+        .all()
+    )
+    payments_data = []
+    for inv in recent_payments:
+        payments_data.append(
+            {
+                "id": inv.id,
+                "client_name": inv.client.full_name,
+                "service_title": inv.service.title,
+                "amount": inv.amount,
+                "payment_date": inv.created_at.isoformat(),
+            }
+        )
+
+    return {
+        "stats": {
+            "totalBookings": total_bookings,
+            "registeredUsers": total_clients,
+            "blogPosts": blog_post,
+            "paymentRecords": total_payments,
+            "totalServices": total_services,
+        },
+        "recentBookings": recent_bookings_data,
+        "recentPayments": payments_data,
+        "documents": [d.to_dict() for d in recent_documents()],
+    }
+
 
 class DashboardResource(Resource):
     @jwt_required()
@@ -36,146 +191,22 @@ class DashboardResource(Resource):
             )
 
         if user.role.value == Role.CLIENT.value:
-            upcoming_appointments = (
-                Booking.query.options(joinedload(Booking.service))
-                .filter_by(client_id=user.id)
-                .order_by(Booking.booking_date.asc())
-                .limit(3)
-                .all()
-            )
-
-            appointments_data = []
-            for b in upcoming_appointments:
-                appointments_data.append(
-                    {
-                        "id": b.id,
-                        "booking_date": (
-                            b.booking_date.isoformat() if b.booking_date else None
-                        ),
-                        "start_time": (
-                            b.start_time.isoformat() if b.start_time else None
-                        ),
-                        "end_time": b.end_time.isoformat() if b.end_time else None,
-                        "status": b.status.value if b.status else None,
-                        "service_id": b.service_id,
-                        "service_name": b.service.title if b.service else None,
-                    }
-                )
-            documents = (
-                Document.query.order_by(Document.created_at.desc()).limit(5).all()
-            )
-
-            total_bookings = (
-                db.session.query(func.count(Booking.id))
-                .filter(Booking.client_id == user.id)
-                .scalar()
-                or 0
-            )
-            total_documents = db.session.query(func.count(Document.id)).scalar() or 0
-
-            paid_invoices = (
-                db.session.query(func.count(Invoice.id))
-                .filter(Invoice.client_id == user.id, Invoice.status == "paid")
-                .scalar()
-                or 0
-            )
-            ticket_raised = (
-                db.session.query(func.count(Ticket.id))
-                .filter(Ticket.client_id == user.id)
-                .scalar()
-                or 0
+            snapshot = dashboard_cache.get(
+                ("client", user.id), lambda: client_snapshot(user.id)
             )
-
             return restful_response(
                 status="success",
                 message="Client dashboard data fetched successfully",
-                data={
-                    "name": user.full_name,
-                    "stats": {
-                        "totalBookings": total_bookings,
-                        "paidInvoices": paid_invoices,
-                        "ticketsRaised": ticket_raised,
-                        "documentsDownloaded": total_documents,
-                    },
-                    "upcomingAppointments": appointments_data,
-                    "documents": [d.to_dict() for d in documents],
-                },
+                data={"name": user.full_name, **snapshot},
                 status_code=200,
             )
 
         elif user.role.value in [Role.ADMIN.value, Role.SUPER_ADMIN.value]:
-            total_bookings = db.session.query(func.count(Booking.id)).scalar() or 0
-            total_services = db.session.query(func.count(Service.id)).scalar() or 0
-            total_payments = db.session.query(func.count(Payment.id)).scalar() or 0
-            total_clients = (
-                db.session.query(func.count(User.id))
-                .filter(User.role == Role.CLIENT)
-                .scalar()
-                or 0
-            )
-            recent_bookings = (
-                Booking.query.order_by(Booking.created_at.desc()).limit(5).all()
-            )
-            recent_bookings_data = []
-            for b in recent_bookings:
-                recent_bookings_data.append(
-                    {
-                        "id": b.id,
-                        "booking_date": b.booking_date.isoformat(),
-                        "start_time": b.start_time.isoformat(),
-                        "end_time": b.end_time.isoformat(),
-                        "status": b.status.value,
-                        "client_id": b.client_id,
-                        "service_id": b.service_id,
-                        "client_name": b.client.full_name,
-                        "service_title": b.service.title,
-                        "created_at": (
-                            b.created_at.isoformat() if b.created_at else None
-                        ),
-                        "updated_at": (
-                            b.updated_at.isoformat() if b.updated_at else None
-                        ),
-                    }
-                )
-            blog_post = db.session.query(func.count(Blog.id)).scalar() or 0
-
-            recent_payments = (
-                Invoice.query.filter(Invoice.status == "paid")
-                .order_by(Invoice.created_at.desc())
-                .limit(5)
-                .all()
-            )
-            payments_data = []
-            for inv in recent_payments:
-                payments_data.append(
-                    {
-                        "id": inv.id,
-                        "client_name": inv.client.full_name,
-                        "service_title": inv.service.title,
-                        "amount": inv.amount,
-                        "payment_date": inv.created_at.isoformat(),
-                    }
-                )
-            documents = (
-                Document.query.order_by(Document.created_at.desc()).limit(5).all()
-            )
-
+            snapshot = dashboard_cache.get(ADMIN_SNAPSHOT, admin_snapshot)
             return restful_response(
                 status="success",
                 message="Admin dashboard data fetched successfully",
-                data={
-                    "name": user.full_name,
-                    "stats": {
-                        "totalBookings": total_bookings,
-                        "registeredUsers": total_clients,
-                        "blogPosts": blog_post,
-                        "paymentRecords": total_payments,
-                        "totalServices": total_services,
-                    },
-                    "recentBookings": recent_bookings_data,
-                    "recentPayments": payments_data,
-                    "documents": [d.to_dict() for d in documents],
-                },
+                data={"name": user.full_name, **snapshot},
                 status_code=200,
             )
 
@@ -184,5 +215,29 @@ class DashboardResource(Resource):
         )
 
 
+class ResponseCacheStatsResource(Resource):
+    @jwt_required()
+    def get(self):
+        """Hits, misses and hit ratio of the public response cache per route."""
+        try:
+            user = User.query.get(int(get_jwt_identity()))
+        except (TypeError, ValueError):
+            user = None
+        if not user or user.role.value not in [
+            Role.ADMIN.value,
+            Role.SUPER_ADMIN.value,
+        ]:
+            return restful_response(
+                status="error", message="Unauthorized", status_code=403
+            )
+
+        return restful_response(
+            status="success",
+            message="Response cache stats fetched successfully",
+            data=response_cache.stats(),
+        )
+
+
 # Register route
 api.add_resource(DashboardResource, "/dashboard")
+api.add_resource(ResponseCacheStatsResource, "/dashboard/cache-stats")
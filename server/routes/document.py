@@ -7,6 +7,7 @@ from datetime import datetime, timezone
 from models import db
 from models.user import User, Role
 from models.document import Document
+from utils.pagination import paginate
 
 document_bp = Blueprint("documents", __name__)
 api = Api(document_bp)
@@ -66,20 +67,30 @@ class DocumentListResource(Resource):
         if file_type:
             query = query.filter(Document.mimetype == file_type)
 
-        query = query.order_by(Document.created_at.desc())
-
-        docs = query.paginate(page=page, per_page=per_page, error_out=False)
-
-        return {
-            "status": "success",
-            "message": "Documents retrieved successfully",
-            "data": [d.to_dict() for d in docs.items],
-            "pagination": {
+        if "cursor" in request.args or "limit" in request.args:
+            # Keyset mode: cost stays flat however deep the caller pages
+            try:
+                items, pagination = paginate(
+                    query, Document.created_at, Document.id, request.args
+                )
+            except ValueError as e:
+                return error(str(e), 400)
+        else:
+            query = query.order_by(Document.created_at.desc())
+            docs = query.paginate(page=page, per_page=per_page, error_out=False)
+            items = docs.items
+            pagination = {
                 "page": docs.page,
                 "pages": docs.pages,
                 "total": docs.total,
                 "per_page": docs.per_page,
-            },
+            }
+
+        return {
+            "status": "success",
+            "message": "Documents retrieved successfully",
+            "data": [d.to_dict() for d in items],
+            "pagination": pagination,
         }, 200
 
     @jwt_required()
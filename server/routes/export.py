@@ -0,0 +1,196 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from flask_jwt_extended import jwt_required
+from sqlalchemy import func
+from models import db
+from models.booking import Booking
+from models.invoice import Invoice
+from models.payment import Payment
+from models.user import User, Role
+from utils.auth_helpers import get_current_user_and_role
+from utils.revenue_rollup import TRANSACTIONS
+
+exports_bp = Blueprint("exports", __name__)
+
+# Rows fetched per round trip and written per streamed chunk
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def invoice_export(user, is_admin):
+    """Same rows as GET /invoices."""
+    query = db.session.query(
+        Invoice.id,
+        Invoice.client_id,
+        Invoice.service_id,
+        Invoice.amount,
+        Invoice.late_fee,
+        Invoice.status,
+        Invoice.created_at,
+        Invoice.due_date,
+    )
+    if not is_admin:
+        query = query.filter(Invoice.client_id == user.id)
+    return query.order_by(Invoice.created_at.desc(), Invoice.id.desc())
+
+
+def payment_export(user, is_admin):
+    """Same rows as GET /payments, with the amount of the linked transaction."""
+    query = db.session.query(
+        Payment.id,
+        Payment.invoice_id,
+        Invoice.client_id,
+        Payment.payment_method,
+        func.coalesce(*(model.amount for model, _ in TRANSACTIONS)).label("amount"),
+        func.coalesce(*(model.currency for model, _ in TRANSACTIONS)).label("currency"),
+        Payment.created_at,
+    ).join(Invoice, Payment.invoice_id == Invoice.id)
+    for model, foreign_key in TRANSACTIONS:
+        query = query.outerjoin(model, foreign_key == model.id)
+    if not is_admin:
+        query = query.filter(Invoice.client_id == user.id)
+    return query.order_by(Payment.created_at.desc(), Payment.id.desc())
+
+
+def booking_export(user, is_admin):
+    """Same rows as GET /bookings."""
+    query = db.session.query(
+        Booking.id,
+        Booking.client_id,
+        Booking.service_id,
+        Booking.status,
+        Booking.booking_date,
+        Booking.start_time,
+        Booking.end_time,
+        Booking.created_at,
+    ).filter(Booking.is_deleted.is_(False))
+    if not is_admin:
+        query = query.filter(Booking.client_id == user.id)
+    return query.order_by(Booking.id.asc())
+
+
+def user_export(user, is_admin):
+    """Same rows as GET /users; None for callers who may not list users."""
+    if not is_admin:
+        return None
+    query = db.session.query(
+        User.id,
+        User.full_name,
+        User.email,
+        User.phone_number,
+        User.role,
+        User.industry,
+        User.account_status,
+        User.created_at,
+    ).filter(User.id != user.id, ~User.is_deleted)
+    if user.role == Role.ADMIN:
+        query = query.filter(User.role == Role.CLIENT)
+    return query.order_by(User.id.asc())
+
+
+EXPORTS = {
+    "invoices": invoice_export,
+    "payments": payment_export,
+    "bookings": booking_export,
+    "users": user_export,
+}
+
+
+def plain(value):
+    """JSON-compatible form of a column value."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def csv_chunks(query, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for count, row in enumerate(query, 1):
+        writer.writerow(["" if value is None else plain(value) for value in row])
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def ndjson_chunks(query, columns):
+    lines = []
+    for row in query:
+        lines.append(json.dumps(dict(zip(columns, map(plain, row)))))
+        if len(lines) == EXPORT_BATCH_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@exports_bp.route("/exports/<string:entity>", methods=["GET"])
+@jwt_required()
+def export_entity(entity):
+    """
+    Stream every row of ``entity`` as CSV or NDJSON. Rows are read from a
+    server-side cursor in batches, so memory use does not grow with the
+    export. ``?gzip=1`` compresses the stream on the fly.
+    """
+    build_query = EXPORTS.get(entity)
+    if not build_query:
+        return jsonify({"status": "failed", "message": "Unknown export"}), 404
+
+    export_format = request.args.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        return (
+            jsonify({"status": "failed", "message": "format must be csv or ndjson"}),
+            400,
+        )
+
+    user, role = get_current_user_and_role()
+    if not user:
+        return jsonify({"status": "failed", "message": "User not found"}), 404
+
+    query = build_query(user, role in [Role.ADMIN.value, Role.SUPER_ADMIN.value])
+    if query is None:
+        return jsonify({"status": "failed", "message": "Forbidden"}), 403
+
+    columns = [column["name"] for column in query.column_descriptions]
+    rows = query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+    if export_format == "csv":
+        chunks = csv_chunks(rows, columns)
+    else:
+        chunks = ndjson_chunks(rows, columns)
+
+    compress = request.args.get("gzip", "").lower() in ("1", "true")
+    if compress:
+        chunks = gzip_chunks(chunks)
+
+    response = Response(
+        stream_with_context(chunks), mimetype=EXPORT_FORMATS[export_format]
+    )
+    response.headers["Content-Disposition"] = (
+        f'attachment; filename="{entity}.{export_format}"'
+    )
+    if compress:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
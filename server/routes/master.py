@@ -0,0 +1,49 @@
+from flask import Blueprint, jsonify, request
+from models.master import MasterDataManager
+
+# Create the blueprint
+master_bp = Blueprint("master", __name__)
+
+
+def conditional(message, data):
+    """
+    JSON response with an ETag of its body. Browsers revalidate on every
+    use and get an empty 304 while the data is unchanged.
+    """
+    response = jsonify({"status": "success", "message": message, "data": data})
+    response.add_etag()
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@master_bp.route("/master/theme", methods=["GET"])
+def get_theme():
+    """Active theme colors and branding."""
+    theme = MasterDataManager.get_active_theme()
+    return conditional("Theme fetched successfully", theme.to_dict())
+
+
+@master_bp.route("/master/banks", methods=["GET"])
+def get_banks():
+    """Active banks payments can be made to, in display order."""
+    banks = MasterDataManager.get_active_banks()
+    return conditional("Banks fetched successfully", [bank.to_dict() for bank in banks])
+
+
+@master_bp.route("/master/paybills", methods=["GET"])
+def get_paybills():
+    """Active paybill and till numbers."""
+    paybills = MasterDataManager.get_active_paybills()
+    return conditional(
+        "Paybills fetched successfully",
+        [paybill.to_dict() for paybill in paybills],
+    )
+
+
+@master_bp.route("/master/tax-rates", methods=["GET"])
+def get_tax_rates():
+    """Active tax rates."""
+    rates = MasterDataManager.get_tax_rates()
+    return conditional(
+        "Tax rates fetched successfully", [rate.to_dict() for rate in rates]
+    )
@@ -5,15 +5,19 @@ from models.payment import MpesaTransaction, Payment, PaymentMethod
 from models.invoice import Invoice
 from models.user import User
 from datetime import datetime, timezone
+from sqlalchemy.orm import defer
 from utils.mpesa_utils import mpesa_utility
-
-from models.invoice import InvoiceStatus
+from utils.mpesa_inbox import enqueue_mpesa_callback, mpesa_inbox_worker
+from utils.pagination import approximate_count, keyset_paginate
+from utils.paybill import C2B_ACCEPTED, paybill_batcher, validate_c2b_payment
+from utils.idempotency import idempotent
 
 mpesa_bp = Blueprint("mpesa", __name__)
 
 
 @mpesa_bp.route("/mpesa/stk-push", methods=["POST"])
 @jwt_required()
+@idempotent
 def initiate_stk_push():
     """
     Initiate MPESA STK push payment
@@ -193,21 +197,20 @@ def validate_phone_number(phone_number):
 def mpesa_callback():
     """
     MPESA payment callback - No JWT required for callbacks
+
+    The raw callback is appended to the inbox and acknowledged immediately;
+    the inbox worker applies it to the transaction and invoice afterwards.
     """
     try:
-        callback_data = request.get_json()
+        callback_data = request.get_json(silent=True)
 
         if not callback_data:
             return jsonify({"ResultCode": 1, "ResultDesc": "Empty callback data"}), 400
 
-        # Parse MPESA callback structure
         if "Body" in callback_data and "stkCallback" in callback_data["Body"]:
-            stk_callback = callback_data["Body"]["stkCallback"]
-            checkout_request_id = stk_callback.get("CheckoutRequestID")
-            result_code = stk_callback.get("ResultCode")
-            result_desc = stk_callback.get("ResultDesc")
+            entry = enqueue_mpesa_callback(callback_data)
 
-            if not checkout_request_id:
+            if not entry:
                 return (
                     jsonify(
                         {"ResultCode": 1, "ResultDesc": "Missing CheckoutRequestID"}
@@ -215,61 +218,7 @@ def mpesa_callback():
                     400,
                 )
 
-            # Find transaction by checkout_request_id
-            transaction = MpesaTransaction.query.filter_by(
-                checkout_request_id=checkout_request_id
-            ).first()
-
-            if not transaction:
-                return (
-                    jsonify({"ResultCode": 1, "ResultDesc": "Transaction not found"}),
-                    404,
-                )
-
-            # Extract transaction details from callback metadata
-            transaction_code = None
-            transaction_date = None
-
-            if "CallbackMetadata" in stk_callback:
-                for item in stk_callback["CallbackMetadata"]["Item"]:
-                    name = item.get("Name")
-                    value = item.get("Value")
-
-                    if name == "MpesaReceiptNumber":
-                        transaction_code = value
-                    elif name == "TransactionDate":
-                        transaction_date = value
-
-            # Update transaction with callback data
-            transaction.result_code = result_code
-            transaction.result_desc = result_desc
-            transaction.mpesa_receipt_number = transaction_code
-            transaction.transaction_date = transaction_date
-            transaction.raw_callback_data = callback_data
-            transaction.callback_received = True
-            transaction.callback_received_at = datetime.now(timezone.utc)
-
-            # Update status based on result code
-            if result_code == 0:
-                transaction.status = "completed"
-                if transaction_code:
-                    transaction.transaction_code = transaction_code
-
-                # Create Payment record
-                payment = Payment(
-                    invoice_id=transaction.invoice_id,
-                    payment_method=PaymentMethod.MPESA,
-                    mpesa_transaction_id=transaction.id,
-                    created_at=datetime.now(timezone.utc),
-                )
-                invoice = Invoice.query.filter_by(id=transaction.invoice_id).first()
-                if invoice:
-                    invoice.status = InvoiceStatus.paid
-                db.session.add(payment)
-            else:
-                transaction.status = "failed"
-
-            db.session.commit()
+            mpesa_inbox_worker.notify()
             return jsonify({"ResultCode": 0, "ResultDesc": "Success"})
 
         return jsonify({"ResultCode": 1, "ResultDesc": "Invalid callback format"}), 400
@@ -283,33 +232,120 @@ def mpesa_callback():
         )
 
 
+@mpesa_bp.route("/mpesa/c2b/validation", methods=["POST"])
+def c2b_validation():
+    """
+    Paybill C2B validation - No JWT required for Daraja webhooks
+
+    Accepts the payment only if the BillRefNumber refers to an open invoice.
+    """
+    try:
+        payload = request.get_json(silent=True)
+        if not payload:
+            return jsonify({"ResultCode": 1, "ResultDesc": "Empty request data"}), 400
+
+        result_code, result_desc = validate_c2b_payment(payload)
+        return jsonify({"ResultCode": result_code, "ResultDesc": result_desc})
+
+    except Exception as e:
+        current_app.logger.exception(f"Error validating C2B payment {e}")
+        # Never block a customer's payment because of our own error
+        return jsonify({"ResultCode": C2B_ACCEPTED, "ResultDesc": "Accepted"})
+
+
+@mpesa_bp.route("/mpesa/c2b/confirmation", methods=["POST"])
+def c2b_confirmation():
+    """
+    Paybill C2B confirmation - No JWT required for Daraja webhooks
+
+    Confirmations are written in batches by the paybill batcher; the
+    response is sent once this receipt has been committed.
+    """
+    try:
+        payload = request.get_json(silent=True)
+        if not payload:
+            return jsonify({"ResultCode": 1, "ResultDesc": "Empty request data"}), 400
+
+        if paybill_batcher.submit(payload) == "invalid":
+            return (
+                jsonify({"ResultCode": 1, "ResultDesc": "Invalid confirmation"}),
+                400,
+            )
+
+        return jsonify({"ResultCode": 0, "ResultDesc": "Success"})
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.exception(f"Error processing C2B confirmation {e}")
+        return (
+            jsonify({"ResultCode": 1, "ResultDesc": "Error processing confirmation"}),
+            500,
+        )
+
+
 @mpesa_bp.route("/mpesa/transactions", methods=["GET"])
 @jwt_required()
 def get_mpesa_transactions():
-    """Get MPESA transactions with filtering - JWT protected"""
+    """
+    Get MPESA transactions newest first with filtering - JWT protected
+
+    Paginated by keyset: pass the returned ``next_cursor`` as ``cursor`` to
+    fetch the next page. ``total`` is included on the first page (or with
+    ``include_total=1``) and may be a planner estimate for unfiltered lists.
+    """
     try:
-        page = request.args.get("page", 1, type=int)
-        per_page = request.args.get("per_page", 20, type=int)
+        cursor = request.args.get("cursor")
+        per_page = min(max(request.args.get("per_page", 20, type=int), 1), 100)
         status = request.args.get("status")
+        invoice_id = request.args.get("invoice_id", type=int)
+        include_raw = request.args.get("include_raw") == "1"
+        include_total = request.args.get("include_total", "0" if cursor else "1")
 
         query = MpesaTransaction.query
+        if not include_raw:
+            query = query.options(defer(MpesaTransaction.raw_callback_data))
 
         if status:
             query = query.filter(MpesaTransaction.status == status)
+        if invoice_id:
+            query = query.filter(MpesaTransaction.invoice_id == invoice_id)
 
-        transactions = query.order_by(MpesaTransaction.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        try:
+            transactions, next_cursor, prev_cursor = keyset_paginate(
+                query,
+                MpesaTransaction.created_at,
+                MpesaTransaction.id,
+                cursor=cursor,
+                limit=per_page,
+            )
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+
+        pagination = {
+            "limit": per_page,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+            "has_more": next_cursor is not None,
+        }
+        if include_total == "1":
+            pagination["total"], pagination["total_is_estimate"] = approximate_count(
+                query, MpesaTransaction, filtered=bool(status or invoice_id)
+            )
 
-        return jsonify(
-            {
-                "success": True,
-                "transactions": [t.to_dict() for t in transactions.items],
-                "total": transactions.total,
-                "pages": transactions.pages,
-                "current_page": page,
-            }
-        )
+        # Top-level keys predate the shared pagination envelope
+        response = {
+            "success": True,
+            "transactions": [t.to_dict(include_raw=include_raw) for t in transactions],
+            "per_page": per_page,
+            "next_cursor": next_cursor,
+            "has_more": pagination["has_more"],
+            "pagination": pagination,
+        }
+        for key in ("total", "total_is_estimate"):
+            if key in pagination:
+                response[key] = pagination[key]
+
+        return jsonify(response)
 
     except Exception as e:
         return (
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_restful import Api, Resource
 from email_validator import validate_email, EmailNotValidError
 from utils.responses import restful_response
+from utils.pagination import paginate
 
 from models import db
 from models.newsletter_subscriber import NewsletterSubscriber
@@ -57,13 +58,23 @@ class NewsletterResource(Resource):
 
     def get(self):
         """Retrieve all newsletter subscribers"""
-        subscribers = NewsletterSubscriber.query.all()
+        try:
+            subscribers, pagination = paginate(
+                NewsletterSubscriber.query,
+                NewsletterSubscriber.id,
+                NewsletterSubscriber.id,
+                request.args,
+                descending=False,
+            )
+        except ValueError as e:
+            return restful_response(status="error", message=str(e), status_code=400)
         subscribers_data = [subscriber.to_dict() for subscriber in subscribers]
         return restful_response(
             status="success",
             data=subscribers_data,
             message="Newsletter subscribers retrieved successfully",
             status_code=200,
+            pagination=pagination,
         )
 
     def delete(self):
@@ -2,7 +2,6 @@ from flask import Blueprint, request, jsonify
 from flask_restful import Api, Resource
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, timezone, date
-from sqlalchemy import desc
 
 from models import db
 from models.user import User, Role
@@ -10,6 +9,9 @@ from models.payment import Payment, PaymentMethod, MpesaTransaction, CashTransac
 from models.invoice import Invoice, InvoiceStatus
 
 from models.service import Service
+from utils.idempotency import idempotent
+from utils.invoice_aging import invoice_aging_summary
+from utils.pagination import paginate
 
 payment_bp = Blueprint("payments", __name__)
 api = Api(payment_bp)
@@ -32,8 +34,11 @@ def error(message, code=400):
     return {"status": "error", "message": message, "data": None}, code
 
 
-def success(message, data=None, code=200):
-    return {"status": "success", "message": message, "data": data}, code
+def success(message, data=None, code=200, pagination=None):
+    body = {"status": "success", "message": message, "data": data}
+    if pagination is not None:
+        body["pagination"] = pagination
+    return body, code
 
 
 # --- Invoice Resources ---
@@ -43,16 +48,16 @@ class InvoiceListResource(Resource):
         """Get invoices - all for admin, only user's for client"""
         current_user = get_current_user()
 
-        if require_admin():
-            # Admin gets all invoices
-            invoices = Invoice.query.order_by(desc(Invoice.created_at)).all()
-        else:
+        query = Invoice.query
+        if not require_admin():
             # Client gets only their invoices
-            invoices = (
-                Invoice.query.filter_by(client_id=current_user.id)
-                .order_by(desc(Invoice.created_at))
-                .all()
+            query = query.filter_by(client_id=current_user.id)
+        try:
+            invoices, pagination = paginate(
+                query, Invoice.created_at, Invoice.id, request.args
             )
+        except ValueError as e:
+            return error(str(e), 400)
 
         # Format response with services and transaction data
         invoices_data = []
@@ -60,7 +65,11 @@ class InvoiceListResource(Resource):
             invoice_data = self.format_invoice_response(invoice)
             invoices_data.append(invoice_data)
 
-        return success("Invoices retrieved successfully", {"invoices": invoices_data})
+        return success(
+            "Invoices retrieved successfully",
+            {"invoices": invoices_data},
+            pagination=pagination,
+        )
 
     def format_invoice_response(self, invoice):
         """Format invoice response with services and transaction data"""
@@ -73,8 +82,8 @@ class InvoiceListResource(Resource):
 
         # Add service description and details
         if invoice.service:
-            invoice_data["description"] = invoice.service.name
-            invoice_data["services"] = [invoice.service.name]
+            invoice_data["description"] = invoice.service.title
+            invoice_data["services"] = [invoice.service.title]
             invoice_data["service_details"] = invoice.service.to_dict()
         else:
             invoice_data["description"] = "Service Invoice"
@@ -180,16 +189,16 @@ class ClientInvoiceListResource(Resource):
         """Get invoices - all for admin, only user's for client"""
         current_user = get_current_user()
 
-        if require_admin():
-            # Admin gets all invoices
-            invoices = Invoice.query.order_by(desc(Invoice.created_at)).all()
-        else:
+        query = Invoice.query
+        if not require_admin():
             # Client gets only their invoices
-            invoices = (
-                Invoice.query.filter_by(client_id=current_user.id)
-                .order_by(desc(Invoice.created_at))
-                .all()
+            query = query.filter_by(client_id=current_user.id)
+        try:
+            invoices, pagination = paginate(
+                query, Invoice.created_at, Invoice.id, request.args
             )
+        except ValueError as e:
+            return error(str(e), 400)
 
         print(f"invoices{invoices}")
         # Format response with services and transaction data
@@ -198,7 +207,11 @@ class ClientInvoiceListResource(Resource):
             invoice_data = self.format_invoice_response(invoice)
             invoices_data.append(invoice_data)
 
-        return success("Invoices retrieved successfully", {"invoices": invoices_data})
+        return success(
+            "Invoices retrieved successfully",
+            {"invoices": invoices_data},
+            pagination=pagination,
+        )
 
     def format_invoice_response(self, invoice):
         """Format invoice response with services and transaction data"""
@@ -381,6 +394,19 @@ class InvoiceResource(Resource):
         return success("Invoice retrieved successfully", {"invoice": invoice_data})
 
 
+class InvoiceAgingResource(Resource):
+    @jwt_required()
+    def get(self):
+        """Unpaid overdue invoices per aging bucket - all for admin, own for client"""
+        current_user = get_current_user()
+        client_id = None if require_admin() else current_user.id
+
+        return success(
+            "Invoice aging retrieved successfully",
+            {"buckets": invoice_aging_summary(client_id=client_id)},
+        )
+
+
 # --- Payment Resources ---
 class PaymentListResource(Resource):
     @jwt_required()
@@ -388,22 +414,26 @@ class PaymentListResource(Resource):
         """Get payments based on user role"""
         current_user = get_current_user()
 
-        if require_admin():
-            # Admin gets all payments
-            payments = Payment.query.order_by(desc(Payment.created_at)).all()
-        else:
+        query = Payment.query
+        if not require_admin():
             # Client gets payments for their invoices
-            payments = (
-                Payment.query.join(Invoice)
-                .filter(Invoice.client_id == current_user.id)
-                .order_by(desc(Payment.created_at))
-                .all()
+            query = query.join(Invoice).filter(Invoice.client_id == current_user.id)
+        try:
+            payments, pagination = paginate(
+                query, Payment.created_at, Payment.id, request.args
             )
+        except ValueError as e:
+            return error(str(e), 400)
 
         payments_data = [p.to_dict() for p in payments]
-        return success("Payments retrieved successfully", {"payments": payments_data})
+        return success(
+            "Payments retrieved successfully",
+            {"payments": payments_data},
+            pagination=pagination,
+        )
 
     @jwt_required()
+    @idempotent
     def post(self):
         """Create a new payment"""
         if not require_admin():
@@ -446,7 +476,7 @@ class PaymentListResource(Resource):
 
             # Update invoice status if fully paid
             total_paid = sum(p.amount for p in invoice.payments if hasattr(p, "amount"))
-            if total_paid >= invoice.amount:
+            if total_paid >= invoice.amount_due:
                 invoice.status = InvoiceStatus.paid
 
             db.session.commit()
@@ -537,6 +567,7 @@ class CancelTransactionResource(Resource):
 # --- Register routes ---
 api.add_resource(InvoiceListResource, "/invoices")
 api.add_resource(InvoiceResource, "/invoices/<int:invoice_id>")
+api.add_resource(InvoiceAgingResource, "/invoices/aging")
 api.add_resource(PaymentListResource, "/payments")
 api.add_resource(PaymentResource, "/payments/<int:payment_id>")
 api.add_resource(CancelTransactionResource, "/transaction/cancel")
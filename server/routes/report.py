@@ -0,0 +1,114 @@
+from datetime import date, timedelta
+from flask import request, Blueprint
+from flask_restful import Resource, Api
+from flask_jwt_extended import jwt_required
+from models.user import Role
+from utils.responses import restful_response
+from utils.auth_helpers import get_current_user_and_role
+from utils.revenue_rollup import (
+    REPORT_GROUPS,
+    collections_report,
+    ensure_revenue_rollup_fresh,
+    revenue_report,
+)
+
+reports_bp = Blueprint("reports", __name__)
+api = Api(reports_bp)
+
+DEFAULT_REPORT_DAYS = 30
+MAX_REPORT_DAYS = 3 * 366
+
+
+def parse_report_range(args):
+    """(from, to) dates, inclusive, defaulting to the last 30 days."""
+    end_day = date.fromisoformat(args["to"]) if args.get("to") else date.today()
+    start_day = (
+        date.fromisoformat(args["from"])
+        if args.get("from")
+        else end_day - timedelta(days=DEFAULT_REPORT_DAYS - 1)
+    )
+    if end_day < start_day:
+        raise ValueError("'to' must not be before 'from'")
+    if (end_day - start_day).days >= MAX_REPORT_DAYS:
+        raise ValueError("Reports can cover at most three years")
+    return start_day, end_day
+
+
+def admin_report_guard():
+    """Error response for non-admins, None when the caller may read reports."""
+    user, role = get_current_user_and_role()
+    if not user:
+        return restful_response(
+            status="error", message="User not found", status_code=404
+        )
+    if role not in [Role.ADMIN.value, Role.SUPER_ADMIN.value]:
+        return restful_response(
+            status="error", message="Admin access required", status_code=403
+        )
+    return None
+
+
+class RevenueReportResource(Resource):
+    """Handle GET /reports/revenue"""
+
+    @jwt_required()
+    def get(self):
+        denied = admin_report_guard()
+        if denied:
+            return denied
+
+        group_by = request.args.get("group_by", "day")
+        if group_by not in REPORT_GROUPS:
+            return restful_response(
+                status="error",
+                message=f"group_by must be one of: {', '.join(REPORT_GROUPS)}",
+                status_code=400,
+            )
+        try:
+            start_day, end_day = parse_report_range(request.args)
+        except ValueError as e:
+            return restful_response(status="error", message=str(e), status_code=400)
+
+        ensure_revenue_rollup_fresh()
+        return restful_response(
+            status="success",
+            message="Revenue report fetched successfully",
+            data={
+                "from": start_day.isoformat(),
+                "to": end_day.isoformat(),
+                "group_by": group_by,
+                "rows": revenue_report(start_day, end_day, group_by),
+            },
+            status_code=200,
+        )
+
+
+class CollectionsReportResource(Resource):
+    """Handle GET /reports/collections"""
+
+    @jwt_required()
+    def get(self):
+        denied = admin_report_guard()
+        if denied:
+            return denied
+
+        try:
+            start_day, end_day = parse_report_range(request.args)
+        except ValueError as e:
+            return restful_response(status="error", message=str(e), status_code=400)
+
+        ensure_revenue_rollup_fresh()
+        return restful_response(
+            status="success",
+            message="Collections report fetched successfully",
+            data={
+                "from": start_day.isoformat(),
+                "to": end_day.isoformat(),
+                "days": collections_report(start_day, end_day),
+            },
+            status_code=200,
+        )
+
+
+api.add_resource(RevenueReportResource, "/reports/revenue")
+api.add_resource(CollectionsReportResource, "/reports/collections")
@@ -2,16 +2,24 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.exceptions import NotFound, BadRequest, Forbidden
 from sqlalchemy.exc import SQLAlchemyError
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import base64
 from models import db
 from models.service import Service, ServiceStatus
 from models.user import User, Role, AccountStatus
+from utils.availability import as_utc, availability_index, subtract_intervals
+from utils.booking_series import tentative_intervals
+from utils.pagination import paginate
+from utils.response_cache import response_cache
 import re
 
 # Create blueprint
 services_bp = Blueprint("services", __name__)
 
+MAX_AVAILABILITY_WINDOW = timedelta(days=31)
+
+response_cache.bump_on_commit("services", (Service,))
+
 
 def require_admin():
     """
@@ -71,28 +79,39 @@ def validate_duration(duration_str):
 
 
 @services_bp.route("/services", methods=["GET"])
+@response_cache.cached("services")
 def get_all_services():
     """
     Retrieve all services. Available to all users.
     Image is automatically converted to base64 in to_dict() method.
     """
     try:
-        services = Service.query.filter_by(is_deleted=False).all()
+        services, pagination = paginate(
+            Service.query.filter_by(is_deleted=False),
+            Service.id,
+            Service.id,
+            request.args,
+            descending=False,
+        )
         return (
             jsonify(
                 {
                     "status": "success",
                     "message": "Services fetched successfully",
                     "data": [service.to_dict() for service in services],
+                    "pagination": pagination,
                 }
             ),
             200,
         )
+    except ValueError as e:
+        return jsonify({"status": "failed", "message": str(e)}), 400
     except SQLAlchemyError as e:
         return jsonify({"status": "failed", "message": str(e)}), 500
 
 
 @services_bp.route("/services/<int:id>", methods=["GET"])
+@response_cache.cached("services")
 def get_service(id):
     """
     Retrieve a service by ID. Available to all users.
@@ -121,6 +140,75 @@ def get_service(id):
         return jsonify({"status": "failed", "message": str(e)}), 500
 
 
+@services_bp.route("/services/<int:id>/availability", methods=["GET"])
+def get_service_availability(id):
+    """
+    Free time windows for a service between ``from`` and ``to`` (ISO 8601,
+    default: the next 7 days). Only gaps long enough to fit the service's
+    duration are returned. Available to all users.
+    """
+    try:
+        service = Service.query.filter(
+            Service.id == id, Service.is_deleted.is_(False)
+        ).first()
+        if not service:
+            raise NotFound(f"Service with ID {id} not found")
+
+        try:
+            window_start = as_utc(
+                datetime.fromisoformat(request.args["from"])
+                if request.args.get("from")
+                else datetime.now(timezone.utc)
+            )
+            window_end = as_utc(
+                datetime.fromisoformat(request.args["to"])
+                if request.args.get("to")
+                else window_start + timedelta(days=7)
+            )
+        except ValueError:
+            raise BadRequest("'from' and 'to' must be ISO 8601 datetimes")
+
+        if window_end <= window_start:
+            raise BadRequest("'to' must be after 'from'")
+        if window_end - window_start > MAX_AVAILABILITY_WINDOW:
+            raise BadRequest("Availability can be requested for at most 31 days")
+
+        slot_length = timedelta(minutes=service.duration_minutes)
+        free = subtract_intervals(
+            availability_index.free_windows(
+                service.id, window_start, window_end, slot_length
+            ),
+            tentative_intervals(service.id, window_start, window_end),
+            slot_length,
+        )
+
+        return (
+            jsonify(
+                {
+                    "status": "success",
+                    "message": "Availability fetched successfully",
+                    "data": {
+                        "service_id": service.id,
+                        "from": window_start.isoformat(),
+                        "to": window_end.isoformat(),
+                        "slot_minutes": int(slot_length.total_seconds() // 60),
+                        "free": [
+                            {"start": start.isoformat(), "end": end.isoformat()}
+                            for start, end in free
+                        ],
+                    },
+                }
+            ),
+            200,
+        )
+    except NotFound as e:
+        return jsonify({"status": "failed", "message": str(e)}), 404
+    except BadRequest as e:
+        return jsonify({"status": "failed", "message": e.description}), 400
+    except SQLAlchemyError as e:
+        return jsonify({"status": "failed", "message": str(e)}), 500
+
+
 @services_bp.route("/services", methods=["POST"])
 @jwt_required()
 def create_service():
@@ -535,7 +623,13 @@ def get_services_by_status(status):
         if status not in [s.value for s in ServiceStatus]:
             return jsonify({"status": "failed", "message": "Invalid status."}), 400
 
-        services = Service.query.filter_by(status=ServiceStatus(status)).all()
+        services, pagination = paginate(
+            Service.query.filter_by(status=ServiceStatus(status)),
+            Service.id,
+            Service.id,
+            request.args,
+            descending=False,
+        )
 
         return (
             jsonify(
@@ -544,6 +638,7 @@ def get_services_by_status(status):
                     "message": f"Services with status '{status}' fetched successfully",
                     "data": [service.to_dict() for service in services],
                     "count": len(services),
+                    "pagination": pagination,
                 }
             ),
             200,
@@ -560,5 +655,7 @@ def get_services_by_status(status):
             ),
             403,
         )
+    except ValueError as e:
+        return jsonify({"status": "failed", "message": str(e)}), 400
     except SQLAlchemyError as e:
         return jsonify({"status": "failed", "message": str(e)}), 500
@@ -9,6 +9,9 @@ from models.ticket_message import TicketMessage
 from models.user import User, Role
 from sqlalchemy import or_, cast, func
 from utils.auth_helpers import get_current_user_and_role
+from utils.idempotency import idempotent
+from utils.stats_counters import read_counters, ticket_status_keys
+from utils.pagination import paginate
 
 tickets_bp = Blueprint("tickets", __name__)
 api = Api(tickets_bp)
@@ -79,12 +82,34 @@ class TicketListResource(Resource):
                     )
                 )
 
-            query = query.order_by(Ticket.created_at.desc())
-            paginated = query.paginate(page=page, per_page=per_page, error_out=False)
+            if "cursor" in request.args or "limit" in request.args:
+                # Keyset mode: cost stays flat however deep the caller pages
+                try:
+                    items, pagination = paginate(
+                        query, Ticket.created_at, Ticket.id, request.args
+                    )
+                except ValueError as e:
+                    return restful_response(
+                        status="error", message=str(e), status_code=400
+                    )
+            else:
+                query = query.order_by(Ticket.created_at.desc())
+                paginated = query.paginate(
+                    page=page, per_page=per_page, error_out=False
+                )
+                items = paginated.items
+                pagination = {
+                    "page": paginated.page,
+                    "pages": paginated.pages,
+                    "per_page": paginated.per_page,
+                    "total": paginated.total,
+                    "has_next": paginated.has_next,
+                    "has_prev": paginated.has_prev,
+                }
 
             # Batch-load related data to avoid N1
             tickets = []
-            ticket_ids = [t.id for t in paginated.items]
+            ticket_ids = [t.id for t in items]
             message_counts = {
                 tid: cnt
                 for (tid, cnt) in db.session.query(
@@ -94,13 +119,13 @@ class TicketListResource(Resource):
                 .group_by(TicketMessage.ticket_id)
             }
             user_ids = set()
-            for t in paginated.items:
+            for t in items:
                 user_ids.add(t.client_id)
                 if t.admin_id:
                     user_ids.add(t.admin_id)
             users = db.session.query(User).filter(User.id.in_(user_ids)).all()
             user_map = {u.id: u for u in users}
-            for ticket in paginated.items:
+            for ticket in items:
                 client = user_map.get(ticket.client_id)
                 admin = user_map.get(ticket.admin_id) if ticket.admin_id else None
                 message_count = message_counts.get(ticket.id, 0)
@@ -125,17 +150,7 @@ class TicketListResource(Resource):
             return restful_response(
                 status="success",
                 message="Tickets fetched successfully",
-                data={
-                    "tickets": tickets,
-                    "pagination": {
-                        "page": paginated.page,
-                        "pages": paginated.pages,
-                        "per_page": paginated.per_page,
-                        "total": paginated.total,
-                        "has_next": paginated.has_next,
-                        "has_prev": paginated.has_prev,
-                    },
-                },
+                data={"tickets": tickets, "pagination": pagination},
                 status_code=200,
             )
 
@@ -146,6 +161,7 @@ class TicketListResource(Resource):
             )
 
     @jwt_required()
+    @idempotent
     def post(self):
         """Create a new ticket"""
         try:
@@ -311,24 +327,15 @@ class TicketStatsResource(Resource):
                     status="error", message="User not found", status_code=404
                 )
 
-            q = Ticket.query
-            if user_role == Role.CLIENT.value:
-                q = q.filter(Ticket.client_id == user.id)
-
-            # Build subquery first if needed
-            subq = q.subquery()
-
-            # Grouped query using the subquery
-            counts = dict(
-                db.session.query(subq.c.status, func.count(subq.c.id))
-                .group_by(subq.c.status)
-                .all()
+            keys = ticket_status_keys(
+                user.id if user_role == Role.CLIENT.value else None
             )
+            counts = dict(zip(TicketStatus, read_counters(keys)))
 
-            total = q.count()
-            open_count = counts.get(TicketStatus.OPEN, 0)
-            in_progress_count = counts.get(TicketStatus.IN_PROGRESS, 0)
-            closed_count = counts.get(TicketStatus.CLOSED, 0)
+            total = sum(counts.values())
+            open_count = counts[TicketStatus.OPEN]
+            in_progress_count = counts[TicketStatus.IN_PROGRESS]
+            closed_count = counts[TicketStatus.CLOSED]
 
             stats = {
                 "total": total,
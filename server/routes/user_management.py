@@ -12,6 +12,7 @@ from sqlalchemy.exc import IntegrityError
 from models import db
 from models.user import User, Role, AccountStatus
 from utils.mail_templates import send_invitation_email
+from utils.pagination import paginate
 
 user_management_bp = Blueprint("user_management", __name__)
 api = Api(user_management_bp)
@@ -167,13 +168,19 @@ class UserListResource(Resource):
                 query = query.filter(User.role == Role.CLIENT)
 
             query = query.filter(~User.is_deleted)
-            users = query.all()
+            try:
+                users, pagination = paginate(
+                    query, User.id, User.id, request.args, descending=False
+                )
+            except ValueError as e:
+                return {"status": "error", "message": str(e)}, 400
             users_data = [UserService.serialize_user(user) for user in users]
 
             return {
                 "status": "success",
                 "message": "Users retrieved successfully",
                 "data": {"users": users_data},
+                "pagination": pagination,
             }, 200
 
         except Exception as e:
@@ -6,6 +6,13 @@ from models.user import User, Role
 from models.service import Service, ServiceStatus
 from models.booking import Booking, BookingStatus
 from models.invoice import Invoice, InvoiceStatus
+from utils.availability import availability_index
+from routes.dashboard import dashboard_cache
+from utils.blog_counters import blog_counter_buffer
+from utils.blog_trending import trending_ranking
+from utils.blog_related import reset_related_index
+from utils.response_cache import response_cache
+from models.master import master_data_cache
 
 root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 if root_dir not in sys.path:
@@ -69,6 +76,14 @@ def session(db, request):
         transaction.rollback()
         connection.close()
         session.remove()
+        # Committed bookings were rolled back; drop their cached schedules
+        availability_index.invalidate()
+        dashboard_cache.clear()
+        blog_counter_buffer.drain()
+        trending_ranking.clear()
+        reset_related_index()
+        response_cache.clear()
+        master_data_cache.clear()
 
     request.addfinalizer(teardown)
     return session
@@ -78,11 +93,13 @@ def session(db, request):
 def create_test_user(db):
     """Fixture to create test users"""
 
-    def _create_user(email, role, industry="Test Industry"):
+    def _create_user(
+        email, role, industry="Test Industry", phone_number="+254712345678"
+    ):
         user = User(
             full_name="Test User",
             email=email,
-            phone_number="+254712345678",
+            phone_number=phone_number,
             role=role,
             industry=industry,
             account_status="active",
@@ -0,0 +1,156 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from models.booking import Booking, BookingStatus
+from models.user import Role
+from models.service import parse_duration_minutes
+from utils.availability import ServiceSchedule, sync_booking_end_times
+
+
+def at(hour, minute=0):
+    return datetime(2030, 1, 15, hour, minute, tzinfo=timezone.utc)
+
+
+class TestServiceSchedule:
+    """Test cases for the sorted-array interval index"""
+
+    def test_find_conflict(self):
+        schedule = ServiceSchedule([(1, at(9), at(10)), (2, at(13), at(14))])
+
+        assert schedule.find_conflict(at(9, 30), at(10, 30)) == 1
+        assert schedule.find_conflict(at(12), at(13, 30)) == 2
+        assert schedule.find_conflict(at(10), at(13)) is None
+        assert schedule.find_conflict(at(9), at(10), ignore_id=1) is None
+
+    def test_long_legacy_booking_is_not_missed(self):
+        """A long booking hidden behind shorter ones still conflicts"""
+        schedule = ServiceSchedule([(1, at(8), at(18)), (2, at(9), at(10))])
+
+        assert schedule.find_conflict(at(15), at(16)) == 1
+
+    def test_add_and_remove(self):
+        schedule = ServiceSchedule()
+        schedule.add(1, at(9), at(10))
+        schedule.add(2, at(11), at(12))
+        schedule.add(1, at(15), at(16))  # moved
+
+        assert schedule.starts == [at(11), at(15)]
+        assert schedule.find_conflict(at(9), at(10)) is None
+
+        schedule.remove(2)
+        assert len(schedule) == 1
+        assert schedule.find_conflict(at(11), at(12)) is None
+
+    def test_free_windows(self):
+        schedule = ServiceSchedule([(1, at(9), at(10)), (2, at(10, 30), at(12))])
+
+        windows = schedule.free_windows(at(8), at(14), timedelta(hours=1))
+
+        assert windows == [(at(8), at(9)), (at(12), at(14))]
+
+
+class TestBookingAvailability:
+    """Test cases for overlap checks and the availability endpoint"""
+
+    @pytest.fixture
+    def client_user(self, session, create_test_user):
+        return create_test_user("client@slots.com", Role.CLIENT)
+
+    @pytest.fixture
+    def services(self, session, create_test_user, create_test_service):
+        admin = create_test_user(
+            "admin@slots.com", Role.ADMIN, phone_number="+254712345679"
+        )
+        return (
+            create_test_service(admin.id, duration="1 hr 0 min"),
+            create_test_service(admin.id, title="Other Service"),
+        )
+
+    @staticmethod
+    def book(client, user, service_id, start):
+        login = client.post(
+            "/api/login", json={"email": user.email, "password": "TestPass123"}
+        )
+        token = login.get_json()["data"]["access_token"]
+        return client.post(
+            "/api/bookings",
+            json={"service_id": service_id, "start_time": start.isoformat()},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    def test_overlapping_booking_is_rejected(
+        self, client, session, client_user, services
+    ):
+        service, _ = services
+
+        assert self.book(client, client_user, service.id, at(9)).status_code == 201
+        response = self.book(client, client_user, service.id, at(9, 30))
+
+        assert response.status_code == 409
+        assert "already booked" in response.get_json()["message"]
+        assert Booking.query.count() == 1
+
+    def test_client_cannot_double_book(self, client, session, client_user, services):
+        service, other_service = services
+
+        self.book(client, client_user, service.id, at(9))
+        response = self.book(client, client_user, other_service.id, at(9, 30))
+
+        assert response.status_code == 409
+        assert "Client already has a booking" in response.get_json()["message"]
+
+    def test_cancelled_booking_frees_slot(self, client, session, client_user, services):
+        service, _ = services
+        self.book(client, client_user, service.id, at(9))
+        booking = Booking.query.one()
+        booking.status = BookingStatus.cancelled
+        session.commit()
+
+        assert self.book(client, client_user, service.id, at(9)).status_code == 201
+
+    def test_availability_endpoint(self, client, session, client_user, services):
+        service, _ = services
+        self.book(client, client_user, service.id, at(10))
+
+        response = client.get(
+            f"/api/services/{service.id}/availability",
+            query_string={"from": at(8).isoformat(), "to": at(13).isoformat()},
+        )
+
+        assert response.status_code == 200
+        data = response.get_json()["data"]
+        assert data["slot_minutes"] == 60
+        assert data["free"] == [
+            {"start": at(8).isoformat(), "end": at(10).isoformat()},
+            {"start": at(11).isoformat(), "end": at(13).isoformat()},
+        ]
+
+    def test_availability_invalid_range(self, client, session, services):
+        service, _ = services
+
+        response = client.get(
+            f"/api/services/{service.id}/availability",
+            query_string={"from": at(13).isoformat(), "to": at(8).isoformat()},
+        )
+
+        assert response.status_code == 400
+
+    def test_sync_booking_end_times(self, client, session, client_user, services):
+        service, _ = services
+        self.book(client, client_user, service.id, at(9))
+        service.duration = "2 hr 30 min"
+        session.commit()
+
+        assert service.duration_minutes == 150
+        assert sync_booking_end_times() == 1
+        assert sync_booking_end_times() == 0
+
+        booking = Booking.query.one()
+        session.refresh(booking)
+        assert booking.end_time.replace(tzinfo=timezone.utc) == at(11, 30)
+
+
+def test_parse_duration_minutes():
+    assert parse_duration_minutes("2 hr 30 min") == 150
+    assert parse_duration_minutes("45 min") == 45
+    assert parse_duration_minutes("invalid format") == 0
+    assert parse_duration_minutes("x hr") == 60
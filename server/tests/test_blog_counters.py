@@ -0,0 +1,92 @@
+import threading
+import pytest
+from models.blog import Blog
+from models.user import Role
+from utils.blog_counters import BlogCounterBuffer, blog_counter_buffer
+
+
+class TestBlogCounters:
+    """Test cases for buffered blog view and like counters"""
+
+    @pytest.fixture
+    def blog(self, session, create_test_user):
+        admin = create_test_user("admin@counters.com", Role.ADMIN)
+        blog = Blog(
+            title="Counted",
+            content="Counted content",
+            author_name=admin.full_name,
+            admin_id=admin.id,
+            image=b"image",
+            image_content_type="image/png",
+            category="News",
+            reading_duration="2 min",
+            views=10,
+            likes=1,
+        )
+        session.add(blog)
+        session.commit()
+        return blog
+
+    def test_reads_include_pending_until_flushed(self, client, session, blog):
+        for _ in range(3):
+            response = client.post(f"/api/blogs/{blog.id}/view")
+        assert response.status_code == 200
+        assert response.get_json()["data"]["views"] == 13
+        client.post(f"/api/blogs/{blog.id}/like")
+
+        session.expire_all()
+        assert (blog.views, blog.likes) == (10, 1)
+        data = client.get(f"/api/blogs/{blog.id}").get_json()["data"]
+        assert (data["views"], data["likes"]) == (13, 2)
+
+        assert blog_counter_buffer.flush() == 1
+        session.expire_all()
+        assert (blog.views, blog.likes) == (13, 2)
+        assert blog_counter_buffer.pending(blog.id) == {"views": 0, "likes": 0}
+        data = client.get("/api/blogs").get_json()["data"]
+        assert (data[0]["views"], data[0]["likes"]) == (13, 2)
+
+        assert client.post("/api/blogs/999/view").status_code == 404
+
+    def test_concurrent_increments_and_failed_flush(self, session, blog, monkeypatch):
+        buffer = BlogCounterBuffer(shards=4)
+        blog_id = blog.id
+
+        def view():
+            for _ in range(250):
+                buffer.add(blog_id, "views")
+
+        threads = [threading.Thread(target=view) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert buffer.pending(blog_id)["views"] == 2000
+
+        def fail(deltas):
+            raise RuntimeError("database down")
+
+        monkeypatch.setattr("utils.blog_counters.apply_counter_deltas", fail)
+        with pytest.raises(RuntimeError):
+            buffer.flush()
+        assert buffer.pending(blog_id)["views"] == 2000
+
+        monkeypatch.undo()
+        buffer.flush()
+        session.expire_all()
+        assert blog.views == 2010
+
+    def test_threads_use_different_shards(self):
+        buffer = BlogCounterBuffer(shards=4)
+        shards = []
+
+        def record():
+            buffer.add(1, "views")
+            shards.append(id(buffer._shard()))
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+            thread.join()
+        assert len(set(shards)) == 4
+        assert buffer.pending(1)["views"] == 4
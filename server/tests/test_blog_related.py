@@ -0,0 +1,131 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from models.blog import Blog, BlogStatus
+from models.blog_related import BlogRelated, BlogRelatedPending
+from models.user import Role, User
+import utils.blog_related as blog_related
+from utils.blog_related import (
+    RelatedIndex,
+    published_documents,
+    queue_related_refresh,
+    rebuild_related_blogs,
+    refresh_pending_related_blogs,
+)
+
+
+class TestBlogRelated:
+    """Test cases for precomputed related blogs"""
+
+    @pytest.fixture
+    def add_blog(self, session, create_test_user):
+        admin = create_test_user("admin@related.com", Role.ADMIN)
+
+        def add(title, content, status=BlogStatus.PUBLISHED):
+            blog = Blog(
+                title=title,
+                content=content,
+                author_name=admin.full_name,
+                admin_id=admin.id,
+                image=b"image",
+                image_content_type="image/png",
+                category="News",
+                reading_duration="2 min",
+                status=status,
+            )
+            session.add(blog)
+            session.commit()
+            return blog.id
+
+        return add
+
+    @pytest.fixture
+    def blogs(self, add_blog):
+        return {
+            "solar": add_blog(
+                "Solar panels for homes", "Rooftop solar panels cut power bills."
+            ),
+            "solar_farms": add_blog(
+                "Solar farms in Kenya", "Solar farms feed power into the grid."
+            ),
+            "compost": add_blog(
+                "Composting kitchen waste", "Compost turns kitchen waste into soil."
+            ),
+            "draft": add_blog(
+                "Solar panel draft", "Solar panels again.", status=BlogStatus.DRAFT
+            ),
+        }
+
+    def titles(self, client, blog_id, **params):
+        response = client.get(f"/api/blogs/{blog_id}/related", query_string=params)
+        assert response.status_code == 200
+        return [blog["title"] for blog in response.get_json()["data"]]
+
+    def test_rebuild_ranks_similar_published_posts(self, client, blogs):
+        assert rebuild_related_blogs() == 3
+        response = client.get(f"/api/blogs/{blogs['solar']}/related")
+        data = response.get_json()["data"]
+        assert [blog["title"] for blog in data] == ["Solar farms in Kenya"]
+        assert 0 < data[0]["similarity"] <= 1
+        assert "content" not in data[0]
+        assert self.titles(client, blogs["compost"]) == []
+        assert client.get("/api/blogs/999/related").status_code == 404
+
+    def test_saving_a_post_updates_affected_lists(
+        self, client, session, blogs, add_blog
+    ):
+        rebuild_related_blogs()
+        panels = add_blog("Cleaning solar panels", "Dusty solar panels lose power.")
+        queue_related_refresh(panels)
+        assert refresh_pending_related_blogs() == 1
+        assert self.titles(client, panels)[0] == "Solar panels for homes"
+        assert "Cleaning solar panels" in self.titles(client, blogs["solar"])
+        assert self.titles(client, blogs["solar"], limit=1) == ["Cleaning solar panels"]
+
+        blog = session.get(Blog, panels)
+        blog.status = BlogStatus.DRAFT
+        session.commit()
+        queue_related_refresh(panels)
+        refresh_pending_related_blogs()
+        assert "Cleaning solar panels" not in self.titles(client, blogs["solar"])
+        assert not BlogRelated.query.filter_by(blog_id=panels).count()
+
+    def test_routes_only_queue_the_refresh(self, app, client, blogs):
+        rebuild_related_blogs()
+        with app.app_context():
+            admin = User.query.filter_by(email="admin@related.com").first()
+            token = create_access_token(identity=str(admin.id))
+        response = client.delete(
+            f"/api/blogs/{blogs['solar_farms']}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        assert [row.blog_id for row in BlogRelatedPending.query] == [
+            blogs["solar_farms"]
+        ]
+
+        assert refresh_pending_related_blogs() == 1
+        assert not BlogRelatedPending.query.count()
+        assert self.titles(client, blogs["solar"]) == []
+        assert refresh_pending_related_blogs() == 0
+
+    def test_stale_index_is_reloaded_from_the_database(
+        self, client, blogs, add_blog, monkeypatch
+    ):
+        rebuild_related_blogs()
+        # This worker's index, from before another worker saved a post
+        stale = RelatedIndex()
+        stale.build(published_documents())
+        stale_version = blog_related._index_version
+
+        panels = add_blog("Cleaning solar panels", "Dusty solar panels lose power.")
+        queue_related_refresh(panels)
+        refresh_pending_related_blogs()
+
+        monkeypatch.setattr(blog_related, "_index", stale)
+        monkeypatch.setattr(blog_related, "_index_version", stale_version)
+        roofs = add_blog("Solar panels on roofs", "Solar panels on tin roofs.")
+        queue_related_refresh(roofs)
+        refresh_pending_related_blogs()
+        assert blog_related._index is not stale
+        assert "Cleaning solar panels" in self.titles(client, roofs)
+        assert "Solar panels on roofs" in self.titles(client, panels)
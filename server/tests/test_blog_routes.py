@@ -120,6 +120,30 @@ def test_get_all_blogs_empty(client, session):
     assert len(data["data"]) == 0
 
 
+def test_list_omits_content_unless_full(client, sample_blog):
+    """Lists carry the stored preview; ?full=1 adds the content."""
+    data = client.get("/api/blogs").get_json()
+    assert "content" not in data["data"][0]
+    assert data["data"][0]["preview"] == sample_blog.content
+
+    data = client.get("/api/blogs?full=1").get_json()
+    assert data["data"][0]["content"] == sample_blog.content
+
+
+def test_preview_is_plain_text_of_editor_content(session, sample_blog):
+    """The preview is computed on write from the editor's JSON document."""
+    words = " ".join(["forest"] * 30)
+    sample_blog.content = json.dumps(
+        [
+            {"type": "heading", "children": [{"text": "Trees", "bold": True}]},
+            {"type": "paragraph", "children": [{"text": words}]},
+        ]
+    )
+    session.commit()
+
+    assert sample_blog.preview == f"Trees {words}"[:100] + "..."
+
+
 # --- Test BlogResource ---
 
 
@@ -0,0 +1,83 @@
+import pytest
+from io import BytesIO
+from models.user import Role
+
+
+class TestBlogSearch:
+    """Test cases for GET /blogs/search and its full-text index"""
+
+    @pytest.fixture
+    def admin(self, client, session, create_test_user):
+        user = create_test_user("admin@search.com", Role.ADMIN)
+        login = client.post(
+            "/api/login", json={"email": user.email, "password": "TestPass123"}
+        )
+        token = login.get_json()["data"]["access_token"]
+        return {"Authorization": f"Bearer {token}"}
+
+    def create(self, client, headers, title, content, **fields):
+        data = {
+            "title": title,
+            "content": content,
+            "image": (BytesIO(b"image"), "image.png", "image/png"),
+            **fields,
+        }
+        response = client.post(
+            "/api/blogs",
+            headers=headers,
+            data=data,
+            content_type="multipart/form-data",
+        )
+        assert response.status_code == 201
+        return response.get_json()["data"]["id"]
+
+    def search(self, client, q, **params):
+        response = client.get("/api/blogs/search", query_string={"q": q, **params})
+        assert response.status_code == 200
+        return response.get_json()
+
+    def test_ranked_results_with_snippets(self, client, admin):
+        in_content = self.create(
+            client, admin, "Water saving", "Harvest rain and add solar pumps."
+        )
+        in_title = self.create(
+            client, admin, "Solar at home", "Panels on the roof cut bills."
+        )
+        self.create(client, admin, "Composting", "Kitchen waste into soil.")
+        self.create(client, admin, "Solar draft", "Not ready yet.", status="draft")
+
+        body = self.search(client, "solar")
+
+        assert [hit["id"] for hit in body["data"]] == [in_title, in_content]
+        assert "<mark>solar</mark>" in body["data"][1]["snippet"]
+        assert "content" not in body["data"][0]
+
+        first = self.search(client, "solar", limit=1)
+        assert [hit["id"] for hit in first["data"]] == [in_title]
+        second = self.search(
+            client, "solar", limit=1, cursor=first["pagination"]["next_cursor"]
+        )
+        assert [hit["id"] for hit in second["data"]] == [in_content]
+        assert second["pagination"]["has_more"] is False
+
+    def test_index_follows_update_and_delete(self, client, admin):
+        blog_id = self.create(client, admin, "Bees", "Pollinators in cities.")
+        assert len(self.search(client, "pollinators")["data"]) == 1
+
+        response = client.put(
+            f"/api/blogs/{blog_id}",
+            headers=admin,
+            data={"title": "Bees", "content": "Urban beekeeping guide."},
+            content_type="multipart/form-data",
+        )
+        assert response.status_code == 200
+        assert self.search(client, "pollinators")["data"] == []
+        assert len(self.search(client, "beekeeping")["data"]) == 1
+
+        response = client.delete(f"/api/blogs/{blog_id}", headers=admin)
+        assert response.status_code == 200
+        assert self.search(client, "beekeeping")["data"] == []
+
+    def test_query_required(self, client, session):
+        response = client.get("/api/blogs/search", query_string={"q": " ? "})
+        assert response.status_code == 400
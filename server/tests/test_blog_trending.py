@@ -0,0 +1,123 @@
+import pytest
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from models.blog import Blog, BlogStatus
+from models.user import Role
+from utils.blog_counters import blog_counter_buffer
+from utils.blog_trending import (
+    TrendingRanking,
+    decayed_score,
+    trending_key,
+    trending_ranking,
+)
+
+
+class TestBlogTrending:
+    """Test cases for the precomputed trending ranking"""
+
+    @pytest.fixture
+    def blogs(self, session, create_test_user):
+        admin = create_test_user("admin@trending.com", Role.ADMIN)
+        now = datetime.now(timezone.utc)
+
+        def blog(title, hours_ago, views, status=BlogStatus.PUBLISHED):
+            record = Blog(
+                title=title,
+                content=f"{title} content",
+                author_name=admin.full_name,
+                admin_id=admin.id,
+                image=b"image",
+                image_content_type="image/png",
+                category="News",
+                reading_duration="2 min",
+                date_created=now - timedelta(hours=hours_ago),
+                views=views,
+                likes=0,
+                status=status,
+            )
+            session.add(record)
+            session.commit()
+            return record.id
+
+        return {
+            "week_old": blog("Week old", 144, 1000),  # 1000 / 8 = 125
+            "fresh": blog("Fresh", 1, 100),  # ~99
+            "two_days": blog("Two days", 48, 300),  # 300 / 2 = 150
+            "expired": blog("Expired", 240, 100000),
+            "draft": blog("Draft", 1, 5000, status=BlogStatus.DRAFT),
+        }
+
+    def titles(self, client, **params):
+        response = client.get("/api/blogs/trending", query_string=params)
+        assert response.status_code == 200
+        return [blog["title"] for blog in response.get_json()["data"]]
+
+    def test_decayed_ranking(self, client, blogs):
+        assert self.titles(client) == ["Two days", "Week old", "Fresh"]
+        assert self.titles(client, limit=1) == ["Two days"]
+
+    def test_counter_flush_reranks_without_rebuild(self, client, blogs, monkeypatch):
+        assert self.titles(client)[-1] == "Fresh"
+        monkeypatch.setattr(
+            trending_ranking,
+            "rebuild",
+            lambda now=None: pytest.fail("ranking was rebuilt"),
+        )
+
+        for _ in range(30):
+            blog_counter_buffer.add(blogs["fresh"], "likes")
+        blog_counter_buffer.flush()
+
+        assert self.titles(client) == ["Fresh", "Two days", "Week old"]
+
+    def test_key_orders_like_decayed_score(self):
+        now = datetime.now(timezone.utc)
+        posts = [
+            (1, now),
+            (3, now - timedelta(hours=60)),
+            (0, now),
+            (40, now - timedelta(hours=144)),
+        ]
+        by_key = sorted(posts, key=lambda post: trending_key(*post), reverse=True)
+        by_score = sorted(
+            posts, key=lambda post: decayed_score(*post, now), reverse=True
+        )
+        assert by_key == by_score
+
+    def test_concurrent_stale_requests_rebuild_once(self, monkeypatch):
+        ranking = TrendingRanking()
+        rebuilds = []
+
+        def slow_rebuild(now=None):
+            rebuilds.append(1)
+            time.sleep(0.05)
+            ranking._built_at = time.monotonic()
+
+        monkeypatch.setattr(ranking, "rebuild", slow_rebuild)
+        threads = [threading.Thread(target=ranking.ensure_fresh) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(rebuilds) == 1
+
+    def test_reported_scores_are_in_order_after_small_increments(self):
+        ranking = TrendingRanking()
+        created_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        ranking._posts = {1: [100, 100, created_at], 2: [95, 95, created_at]}
+        ranking._top = sorted(
+            (
+                (trending_key(e, c), blog_id)
+                for blog_id, (e, _, c) in ranking._posts.items()
+            ),
+            reverse=True,
+        )
+
+        # Below TRENDING_MIN_CHANGE, so post 2 keeps its key
+        ranking.apply_counts({2: [9, 0]})
+        now = datetime.now(timezone.utc)
+        ranked = ranking.top(2, now)
+        assert [blog_id for blog_id, _ in ranked] == [2, 1]
+        assert ranked[0][1] > ranked[1][1]
+        assert ranking.top(1, now) == ranked[:1]
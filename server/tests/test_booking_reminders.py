@@ -0,0 +1,112 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from models.booking import Booking, BookingStatus
+from models.user import Role
+from utils.booking_reminders import BookingReminderScheduler
+
+
+class TestBookingReminders:
+    """Test cases for the batched booking reminder scheduler"""
+
+    @pytest.fixture
+    def sent(self, monkeypatch):
+        sent = []
+
+        def fake_send(reminders):
+            sent.extend(reminders)
+            return len(reminders)
+
+        monkeypatch.setattr(
+            "utils.booking_reminders.send_booking_reminder_emails", fake_send
+        )
+        return sent
+
+    @pytest.fixture
+    def make_booking(self, session, create_test_user, create_test_service):
+        client = create_test_user("client@remind.com", Role.CLIENT)
+        admin = create_test_user(
+            "admin@remind.com", Role.ADMIN, phone_number="+254712345679"
+        )
+        service = create_test_service(admin.id, title="Energy Audit")
+
+        def _make_booking(start_time, status=BookingStatus.confirmed):
+            booking = Booking(
+                booking_date=start_time.date(),
+                start_time=start_time,
+                end_time=start_time + timedelta(hours=1),
+                status=status,
+                client_id=client.id,
+                service_id=service.id,
+            )
+            session.add(booking)
+            session.commit()
+            return booking
+
+        return _make_booking
+
+    def test_sends_due_reminders_once(self, session, make_booking, sent):
+        now = datetime.now(timezone.utc)
+        make_booking(now + timedelta(hours=2))
+        make_booking(now + timedelta(hours=5))
+        make_booking(now + timedelta(hours=30))
+        make_booking(now + timedelta(hours=3), status=BookingStatus.cancelled)
+
+        scheduler = BookingReminderScheduler(lead_hours=24, batch_size=1)
+
+        assert scheduler.run_pending(now) == 2
+        assert [r[0] for r in sent] == ["client@remind.com"] * 2
+        assert [r[2] for r in sent] == ["Energy Audit"] * 2
+        assert scheduler.run_pending(now) == 0
+
+        # A restarted worker skips bookings already reminded
+        assert BookingReminderScheduler(lead_hours=24).run_pending(now) == 0
+        assert Booking.query.filter(Booking.reminder_sent_at.isnot(None)).count() == 2
+
+    def test_short_notice_and_moved_bookings_are_reminded(
+        self, session, make_booking, sent
+    ):
+        now = datetime.now(timezone.utc)
+        make_booking(now + timedelta(hours=20))
+        assert BookingReminderScheduler(lead_hours=24).run_pending(now) == 1
+
+        # Starts before the booking already reminded
+        short_notice = make_booking(now + timedelta(hours=2))
+        assert BookingReminderScheduler(lead_hours=24).run_pending(now) == 1
+
+        short_notice.start_time = now + timedelta(hours=1)
+        short_notice.end_time = now + timedelta(hours=2)
+        session.commit()
+        assert short_notice.reminder_sent_at is None
+        assert BookingReminderScheduler(lead_hours=24).run_pending(now) == 1
+        assert len(sent) == 3
+
+    def test_reschedule_and_cancel_update_heap(self, session, make_booking, sent):
+        now = datetime.now(timezone.utc)
+        moved = make_booking(now + timedelta(hours=2))
+        cancelled = make_booking(now + timedelta(hours=3))
+
+        scheduler = BookingReminderScheduler(lead_hours=1, refill_seconds=3600)
+        assert scheduler.refill(now) == 2
+
+        scheduler.apply(
+            {
+                moved.id: (moved.service_id, now + timedelta(hours=40), None, True),
+                cancelled.id: (cancelled.service_id, cancelled.start_time, None, False),
+            }
+        )
+
+        assert scheduler.pop_due(now + timedelta(hours=2)) == []
+
+    def test_new_booking_is_pushed(self, session, make_booking, sent):
+        now = datetime.now(timezone.utc)
+        scheduler = BookingReminderScheduler(lead_hours=1, refill_seconds=3600)
+        scheduler.refill(now)
+
+        booking = make_booking(now + timedelta(hours=2))
+        scheduler.apply(
+            {booking.id: (booking.service_id, booking.start_time, None, True)}
+        )
+
+        assert scheduler.pop_due(now) == []
+        assert scheduler.seconds_until_next(now) == pytest.approx(3600, abs=5)
+        assert scheduler.pop_due(now + timedelta(hours=1)) == [booking.id]
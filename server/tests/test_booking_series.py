@@ -0,0 +1,216 @@
+import pytest
+from datetime import datetime, timezone
+from models.booking import Booking
+from models.invoice import Invoice
+from models.user import Role
+from utils.recurrence import iter_occurrences, last_occurrence, parse_rrule
+
+
+def at(month, day, hour=9, year=2030):
+    return datetime(year, month, day, hour, tzinfo=timezone.utc)
+
+
+class TestRecurrenceRules:
+    """Test cases for RRULE parsing and lazy expansion"""
+
+    def test_parse_rrule(self):
+        rule = parse_rrule("RRULE:FREQ=monthly;COUNT=12")
+
+        assert rule == {"freq": "MONTHLY", "interval": 1, "count": 12, "until": None}
+
+        with pytest.raises(ValueError):
+            parse_rrule("FREQ=YEARLY")
+        with pytest.raises(ValueError):
+            parse_rrule("FREQ=DAILY;COUNT=2;UNTIL=20300101")
+        with pytest.raises(ValueError):
+            parse_rrule("FREQ=WEEKLY;BYDAY=MO")
+
+    def test_monthly_clamps_to_month_end(self):
+        rule = parse_rrule("FREQ=MONTHLY;COUNT=4")
+        starts = list(iter_occurrences(rule, at(1, 31), at(1, 1), at(12, 1)))
+
+        assert starts == [at(1, 31), at(2, 28), at(3, 31), at(4, 30)]
+        assert last_occurrence(rule, at(1, 31)) == at(4, 30)
+
+    def test_window_skips_earlier_occurrences(self):
+        rule = parse_rrule("FREQ=WEEKLY;INTERVAL=2")
+        occurrences = iter_occurrences(rule, at(1, 1), at(3, 1), at(3, 31))
+
+        assert list(occurrences) == [at(3, 12), at(3, 26)]
+        assert last_occurrence(rule, at(1, 1)) is None
+
+    def test_until_is_inclusive(self):
+        rule = parse_rrule("FREQ=DAILY;UNTIL=20300103")
+
+        assert list(iter_occurrences(rule, at(1, 1), at(1, 1), at(2, 1))) == [
+            at(1, 1),
+            at(1, 2),
+            at(1, 3),
+        ]
+        assert last_occurrence(rule, at(1, 1)) == at(1, 3)
+
+
+class TestBookingSeriesRoutes:
+    """Test cases for recurring booking series endpoints"""
+
+    @pytest.fixture
+    def setup(self, client, session, create_test_user, create_test_service):
+        user = create_test_user("client@series.com", Role.CLIENT)
+        admin = create_test_user(
+            "admin@series.com", Role.ADMIN, phone_number="+254712345679"
+        )
+        service = create_test_service(admin.id, title="Monthly Audit")
+
+        login = client.post(
+            "/api/login", json={"email": user.email, "password": "TestPass123"}
+        )
+        token = login.get_json()["data"]["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = client.post(
+            "/api/booking-series",
+            json={
+                "service_id": service.id,
+                "start_time": at(1, 15).isoformat(),
+                "rrule": "FREQ=MONTHLY;COUNT=12",
+            },
+            headers=headers,
+        )
+        assert response.status_code == 201
+        return headers, service, response.get_json()["data"]
+
+    def test_create_series_does_not_book(self, client, setup):
+        _, _, series = setup
+
+        assert series["rrule"] == "FREQ=MONTHLY;INTERVAL=1;COUNT=12"
+        assert series["last_start_time"].startswith("2030-12-15T09:00:00")
+        assert Booking.query.count() == 0
+        assert Invoice.query.count() == 0
+
+    def test_list_occurrences_in_window(self, client, setup):
+        headers, _, series = setup
+
+        response = client.get(
+            f"/api/booking-series/{series['id']}/occurrences",
+            query_string={"from": at(3, 1).isoformat(), "to": at(6, 1).isoformat()},
+            headers=headers,
+        )
+
+        assert response.status_code == 200
+        data = response.get_json()["data"]
+        assert [o["start_time"] for o in data] == [
+            at(3, 15).isoformat(),
+            at(4, 15).isoformat(),
+            at(5, 15).isoformat(),
+        ]
+        assert {o["status"] for o in data} == {"tentative"}
+
+    def test_confirm_occurrence_creates_booking_and_invoice(self, client, setup):
+        headers, _, series = setup
+        url = f"/api/booking-series/{series['id']}/occurrences/confirm"
+
+        response = client.post(
+            url, json={"occurrence_start": at(2, 15).isoformat()}, headers=headers
+        )
+
+        assert response.status_code == 201
+        assert response.get_json()["data"]["series_id"] == series["id"]
+        assert Booking.query.count() == 1
+        assert Invoice.query.count() == 1
+
+        again = client.post(
+            url, json={"occurrence_start": at(2, 15).isoformat()}, headers=headers
+        )
+        assert again.status_code == 409
+
+        missing = client.post(
+            url, json={"occurrence_start": at(2, 16).isoformat()}, headers=headers
+        )
+        assert missing.status_code == 404
+
+    def test_move_and_cancel_occurrences(self, client, setup):
+        headers, _, series = setup
+        url = f"/api/booking-series/{series['id']}/occurrences"
+
+        moved = client.patch(
+            url,
+            json={
+                "occurrence_start": at(3, 15).isoformat(),
+                "start_time": at(3, 16, 14).isoformat(),
+            },
+            headers=headers,
+        )
+        cancelled = client.patch(
+            url,
+            json={"occurrence_start": at(4, 15).isoformat(), "status": "cancelled"},
+            headers=headers,
+        )
+        assert moved.status_code == 200
+        assert cancelled.status_code == 200
+
+        response = client.get(
+            url,
+            query_string={"from": at(3, 1).isoformat(), "to": at(6, 1).isoformat()},
+            headers=headers,
+        )
+        data = response.get_json()["data"]
+        assert [o["start_time"] for o in data] == [
+            at(3, 16, 14).isoformat(),
+            at(5, 15).isoformat(),
+        ]
+        assert data[0]["occurrence_start"] == at(3, 15).isoformat()
+
+    def test_tentative_occurrence_holds_slot(self, client, setup):
+        headers, service, _ = setup
+
+        response = client.post(
+            "/api/bookings",
+            json={"service_id": service.id, "start_time": at(5, 15).isoformat()},
+            headers=headers,
+        )
+        assert response.status_code == 409
+        assert "recurring" in response.get_json()["message"]
+
+        availability = client.get(
+            f"/api/services/{service.id}/availability",
+            query_string={
+                "from": at(5, 15, 8).isoformat(),
+                "to": at(5, 15, 12).isoformat(),
+            },
+        )
+        assert availability.get_json()["data"]["free"] == [
+            {"start": at(5, 15, 8).isoformat(), "end": at(5, 15, 9).isoformat()},
+            {"start": at(5, 15, 10).isoformat(), "end": at(5, 15, 12).isoformat()},
+        ]
+
+    def test_create_series_after_plain_booking(self, client, setup):
+        headers, service, _ = setup
+
+        booking = client.post(
+            "/api/bookings",
+            json={"service_id": service.id, "start_time": at(1, 20).isoformat()},
+            headers=headers,
+        )
+        assert booking.status_code == 201
+
+        response = client.post(
+            "/api/booking-series",
+            json={
+                "service_id": service.id,
+                "start_time": at(1, 16).isoformat(),
+                "rrule": "FREQ=MONTHLY;COUNT=3",
+            },
+            headers=headers,
+        )
+        assert response.status_code == 201
+
+        clash = client.post(
+            "/api/booking-series",
+            json={
+                "service_id": service.id,
+                "start_time": at(1, 20).isoformat(),
+                "rrule": "FREQ=WEEKLY;COUNT=3",
+            },
+            headers=headers,
+        )
+        assert clash.status_code == 409
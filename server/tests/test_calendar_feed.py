@@ -0,0 +1,85 @@
+import pytest
+from urllib.parse import urlparse
+from datetime import datetime, timedelta, timezone
+from models.booking import Booking, BookingStatus
+from models.user import Role
+from utils.ical import escape_text, fold_line
+
+
+def test_escape_and_fold():
+    assert escape_text("Audit; site, visit\nday 2") == r"Audit\; site\, visit\nday 2"
+
+    folded = fold_line("SUMMARY:" + "é" * 60)
+    lines = folded.split("\r\n ")
+    assert all(len(line.encode("utf-8")) <= 75 for line in lines)
+    assert "".join(lines) == "SUMMARY:" + "é" * 60 + "\r\n"
+
+
+class TestCalendarFeed:
+    """Test cases for tokenized .ics booking feeds"""
+
+    @pytest.fixture
+    def feed(self, client, session, create_test_user, create_test_service):
+        user = create_test_user("client@ics.com", Role.CLIENT)
+        other = create_test_user(
+            "other@ics.com", Role.CLIENT, phone_number="+254712345679"
+        )
+        admin = create_test_user(
+            "admin@ics.com", Role.ADMIN, phone_number="+254712345670"
+        )
+        service = create_test_service(admin.id, title="Energy Audit, Phase 1")
+
+        start = datetime.now(timezone.utc) + timedelta(days=3)
+        for owner, offset in ((user, 0), (user, 1), (other, 2)):
+            session.add(
+                Booking(
+                    booking_date=start.date(),
+                    start_time=start + timedelta(days=offset),
+                    end_time=start + timedelta(days=offset, hours=1),
+                    status=BookingStatus.confirmed,
+                    client_id=owner.id,
+                    service_id=service.id,
+                )
+            )
+        session.commit()
+
+        login = client.post(
+            "/api/login", json={"email": user.email, "password": "TestPass123"}
+        )
+        token = login.get_json()["data"]["access_token"]
+        response = client.post(
+            "/api/calendar/token", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 201
+        feed_url = response.get_json()["data"]["feed_url"]
+        return urlparse(feed_url).path
+
+    def test_feed_contains_own_bookings(self, client, feed):
+        response = client.get(feed)
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/calendar"
+        assert response.is_streamed
+        body = response.get_data(as_text=True)
+        assert body.startswith("BEGIN:VCALENDAR\r\n")
+        assert body.count("BEGIN:VEVENT") == 2
+        assert "SUMMARY:Energy Audit\\, Phase 1" in body
+        assert "STATUS:CONFIRMED" in body
+
+    def test_etag_returns_304_until_bookings_change(self, client, session, feed):
+        etag = client.get(feed).headers["ETag"]
+
+        cached = client.get(feed, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.get_data() == b""
+
+        booking = Booking.query.order_by(Booking.id).first()
+        booking.status = BookingStatus.cancelled
+        session.commit()
+
+        changed = client.get(feed, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert "STATUS:CANCELLED" in changed.get_data(as_text=True)
+
+    def test_unknown_token(self, client, session):
+        assert client.get("/api/calendar/not-a-token.ics").status_code == 404
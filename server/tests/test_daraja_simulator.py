@@ -0,0 +1,149 @@
+import base64
+import pytest
+from datetime import date, timedelta
+from benchmarks.daraja_simulator import (
+    AUTH_PATH,
+    RESULT_CANCELLED,
+    STK_PUSH_PATH,
+    STK_QUERY_PATH,
+    DarajaSimulator,
+)
+from benchmarks.mpesa_load import percentile
+from models.invoice import Invoice, InvoiceStatus
+from models.payment import MpesaTransaction
+from models.user import Role
+from utils.mpesa_inbox import process_mpesa_inbox
+
+
+def basic_auth_header():
+    credentials = base64.b64encode(b"key:secret").decode()
+    return {"Authorization": f"Basic {credentials}"}
+
+
+def stk_push_body(amount=100):
+    return {
+        "Amount": amount,
+        "PhoneNumber": "254712345678",
+        "CallBackURL": "http://localhost/api/mpesa/callback",
+    }
+
+
+class TestDarajaSimulator:
+    """Test cases for the local Daraja simulator"""
+
+    def test_oauth_requires_basic_auth(self):
+        sim_client = DarajaSimulator().app.test_client()
+
+        assert sim_client.get(AUTH_PATH).status_code == 400
+
+        response = sim_client.get(AUTH_PATH, headers=basic_auth_header())
+        assert response.status_code == 200
+        assert response.get_json()["access_token"]
+
+    def test_stk_push_and_query(self):
+        """Queries report processing until the callback is delivered"""
+        sent = []
+        simulator = DarajaSimulator(
+            drop_rate=1.0, sender=lambda url, payload: sent.append(payload) or 200
+        )
+        sim_client = simulator.app.test_client()
+
+        push = sim_client.post(STK_PUSH_PATH, json=stk_push_body()).get_json()
+        assert push["ResponseCode"] == "0"
+        checkout_request_id = push["CheckoutRequestID"]
+
+        query = {"CheckoutRequestID": checkout_request_id}
+        assert sim_client.post(STK_QUERY_PATH, json=query).get_json()["ResponseCode"]
+
+        simulator.deliver_callback(checkout_request_id)
+        result = sim_client.post(STK_QUERY_PATH, json=query).get_json()
+        assert result["ResultCode"] == "0"
+
+        stk_callback = sent[0]["Body"]["stkCallback"]
+        assert stk_callback["CheckoutRequestID"] == checkout_request_id
+        assert stk_callback["CallbackMetadata"]["Item"][0]["Value"] == 100
+        assert simulator.stats["callbacks_acked"] == 1
+
+    def test_failure_and_reject_rates(self):
+        rejecting = DarajaSimulator(reject_rate=1.0)
+        assert rejecting.handle_stk_push(stk_push_body())["ResponseCode"] == "1"
+        assert rejecting.stats["rejected"] == 1
+
+        failing = DarajaSimulator(failure_rate=1.0, drop_rate=1.0)
+        push = failing.handle_stk_push(stk_push_body())
+        callback = failing.build_callback(push["CheckoutRequestID"])
+        stk_callback = callback["Body"]["stkCallback"]
+        assert stk_callback["ResultCode"] == RESULT_CANCELLED
+        assert "CallbackMetadata" not in stk_callback
+
+    def test_payment_round_trip(
+        self,
+        client,
+        session,
+        monkeypatch,
+        create_test_user,
+        create_test_service,
+    ):
+        """An STK push through the simulator ends with a paid invoice"""
+        simulator = DarajaSimulator(
+            drop_rate=1.0,
+            sender=lambda url, payload: client.post(
+                "/api/mpesa/callback", json=payload
+            ).status_code,
+        )
+        server = simulator.serve()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        for name, value in simulator.environment(
+            base_url, "http://localhost/api/mpesa/callback"
+        ).items():
+            monkeypatch.setenv(name, value)
+
+        admin = create_test_user("admin@daraja.com", Role.ADMIN)
+        service = create_test_service(admin.id)
+        invoice = Invoice(
+            amount=100,
+            client_id=admin.id,
+            service_id=service.id,
+            due_date=date.today() + timedelta(days=30),
+            status=InvoiceStatus.pending,
+        )
+        session.add(invoice)
+        session.commit()
+
+        login = client.post(
+            "/api/login", json={"email": admin.email, "password": "TestPass123"}
+        )
+        token = login.get_json()["data"]["access_token"]
+
+        try:
+            response = client.post(
+                "/api/mpesa/stk-push",
+                json={
+                    "amount": 100,
+                    "phone_number": "254712345678",
+                    "invoice_id": invoice.id,
+                },
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            assert response.status_code == 200
+            checkout_request_id = response.get_json()["checkout_request_id"]
+
+            assert simulator.deliver_callback(checkout_request_id) == 200
+        finally:
+            server.shutdown()
+
+        assert process_mpesa_inbox() == 1
+        transaction = MpesaTransaction.query.filter_by(
+            checkout_request_id=checkout_request_id
+        ).first()
+        assert transaction.status == "completed"
+        assert Invoice.query.get(invoice.id).status == InvoiceStatus.paid
+
+
+def test_percentile_nearest_rank():
+    values = [0.1 * n for n in range(1, 101)]
+
+    assert percentile([], 50) is None
+    assert percentile(values, 50) == pytest.approx(5.0)
+    assert percentile(values, 99) == pytest.approx(9.9)
+    assert percentile(values, 100) == pytest.approx(10.0)
@@ -0,0 +1,147 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from models.idempotency import IdempotencyKey
+from models.payment import MpesaTransaction
+from models.ticket import Ticket
+from models.user import Role
+from utils import idempotency
+from utils.idempotency import sweep_idempotency_keys
+
+
+def login_headers(client, user, key=None):
+    response = client.post(
+        "/api/login", json={"email": user.email, "password": "TestPass123"}
+    )
+    headers = {"Authorization": f"Bearer {response.get_json()['data']['access_token']}"}
+    if key:
+        headers["Idempotency-Key"] = key
+    return headers
+
+
+STK_RESULT = {
+    "success": True,
+    "MerchantRequestID": "merchant-1",
+    "CheckoutRequestID": "ws_CO_idem_1",
+    "ResponseCode": "0",
+    "ResponseDescription": "Success. Request accepted for processing",
+    "CustomerMessage": "Success. Request accepted for processing",
+}
+
+
+class TestIdempotencyKey:
+    """Test cases for Idempotency-Key handling on POST endpoints"""
+
+    @pytest.fixture
+    def client_user(self, session, create_test_user):
+        create_test_user("admin@idem.com", Role.ADMIN, phone_number="+254712345679")
+        return create_test_user("client@idem.com", Role.CLIENT)
+
+    def test_stk_push_retry_is_replayed(self, client, session, client_user):
+        """A retried STK push fires once and returns the original response"""
+        headers = login_headers(client, client_user, key="stk-retry-1")
+        body = {"amount": 100, "phone_number": "254712345678"}
+
+        with patch(
+            "routes.mpesa.mpesa_utility.initiate_stk_push", return_value=STK_RESULT
+        ) as stk_push:
+            first = client.post("/api/mpesa/stk-push", json=body, headers=headers)
+            second = client.post("/api/mpesa/stk-push", json=body, headers=headers)
+
+        assert first.status_code == second.status_code == 200
+        assert second.get_json() == first.get_json()
+        assert second.headers["Idempotent-Replayed"] == "true"
+        assert stk_push.call_count == 1
+        assert MpesaTransaction.query.count() == 1
+
+    def test_ticket_retry_creates_one_ticket(self, client, session, client_user):
+        headers = login_headers(client, client_user, key="ticket-retry-1")
+        body = {"subject": "Login issue", "description": "Cannot sign in"}
+
+        first = client.post("/api/tickets", json=body, headers=headers)
+        second = client.post("/api/tickets", json=body, headers=headers)
+
+        assert first.status_code == second.status_code == 201
+        assert second.get_json() == first.get_json()
+        assert Ticket.query.count() == 1
+
+    def test_requests_without_key_are_not_deduplicated(
+        self, client, session, client_user
+    ):
+        headers = login_headers(client, client_user)
+        body = {"subject": "Login issue", "description": "Cannot sign in"}
+
+        client.post("/api/tickets", json=body, headers=headers)
+        client.post("/api/tickets", json=body, headers=headers)
+
+        assert Ticket.query.count() == 2
+        assert IdempotencyKey.query.count() == 0
+
+    def test_key_reused_with_different_body(self, client, session, client_user):
+        headers = login_headers(client, client_user, key="ticket-reuse-1")
+
+        client.post(
+            "/api/tickets",
+            json={"subject": "First", "description": "First ticket"},
+            headers=headers,
+        )
+        response = client.post(
+            "/api/tickets",
+            json={"subject": "Second", "description": "Second ticket"},
+            headers=headers,
+        )
+
+        assert response.status_code == 422
+        assert Ticket.query.count() == 1
+
+    def test_in_progress_duplicate_gets_conflict(
+        self, client, session, client_user, monkeypatch
+    ):
+        """A duplicate gives up with 409 if the original never finishes"""
+        monkeypatch.setattr(idempotency, "IDEMPOTENCY_WAIT_SECONDS", 0)
+        headers = login_headers(client, client_user, key="ticket-busy-1")
+        body = {"subject": "Login issue", "description": "Cannot sign in"}
+
+        with client.application.test_request_context(
+            "/api/tickets", method="POST", json=body
+        ):
+            request_hash = idempotency.request_fingerprint()
+        session.add(
+            IdempotencyKey(
+                key="ticket-busy-1",
+                scope=f"{client_user.id}:POST /api/tickets",
+                request_hash=request_hash,
+                expires_at=datetime.now(timezone.utc) + timedelta(minutes=1),
+            )
+        )
+        session.commit()
+
+        response = client.post("/api/tickets", json=body, headers=headers)
+
+        assert response.status_code == 409
+        assert Ticket.query.count() == 0
+
+    def test_sweep_removes_expired_keys(self, session):
+        now = datetime.now(timezone.utc)
+        session.add_all(
+            [
+                IdempotencyKey(
+                    key="old",
+                    scope="1:POST /api/tickets",
+                    request_hash="x" * 64,
+                    status="completed",
+                    expires_at=now - timedelta(hours=1),
+                ),
+                IdempotencyKey(
+                    key="fresh",
+                    scope="1:POST /api/tickets",
+                    request_hash="x" * 64,
+                    status="completed",
+                    expires_at=now + timedelta(hours=1),
+                ),
+            ]
+        )
+        session.commit()
+
+        assert sweep_idempotency_keys() == 1
+        assert [k.key for k in IdempotencyKey.query.all()] == ["fresh"]
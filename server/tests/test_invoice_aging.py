@@ -0,0 +1,72 @@
+import pytest
+from datetime import date, timedelta
+from models.invoice import Invoice, InvoiceStatus
+from models.master import SystemConfig
+from models.user import Role
+from utils.invoice_aging import invoice_aging_summary, mark_overdue_invoices
+
+
+class TestInvoiceAging:
+    """Test cases for the overdue transition and aging summary"""
+
+    @pytest.fixture
+    def setup(self, session, create_test_user, create_test_service):
+        owner = create_test_user("client@aging.com", Role.CLIENT)
+        admin = create_test_user(
+            "admin@aging.com", Role.ADMIN, phone_number="+254712345679"
+        )
+        service = create_test_service(admin.id)
+        session.add(SystemConfig(company_name="EcoVibe", late_fee_percentage=2.5))
+        session.commit()
+
+        def invoice(days_past_due, amount=1000, status=InvoiceStatus.pending):
+            due = date.today() - timedelta(days=days_past_due)
+            record = Invoice(
+                created_at=due - timedelta(days=30),
+                due_date=due,
+                amount=amount,
+                client_id=owner.id,
+                service_id=service.id,
+                status=status,
+            )
+            session.add(record)
+            session.commit()
+            return record
+
+        return owner, invoice
+
+    def test_mark_overdue_invoices(self, session, setup):
+        _, invoice = setup
+        late = invoice(5, amount=999)
+        not_due = invoice(-3)
+        paid = invoice(10, status=InvoiceStatus.paid)
+
+        assert mark_overdue_invoices() == 1
+        session.expire_all()
+
+        assert late.status == InvoiceStatus.overdue
+        assert late.late_fee == 25  # 2.5% of 999, rounded up
+        assert not_due.status == InvoiceStatus.pending
+        assert paid.status == InvoiceStatus.paid
+        assert paid.late_fee == 0
+        assert mark_overdue_invoices() == 0
+
+    def test_aging_buckets(self, session, setup):
+        owner, invoice = setup
+        invoice(1)
+        invoice(30)
+        invoice(31)
+        invoice(75)
+        invoice(120)
+        invoice(-1)
+        mark_overdue_invoices()
+
+        summary = invoice_aging_summary()
+
+        assert summary == [
+            {"bucket": "0-30", "count": 2, "amount": 2050},
+            {"bucket": "31-60", "count": 1, "amount": 1025},
+            {"bucket": "61-90", "count": 1, "amount": 1025},
+            {"bucket": "90+", "count": 1, "amount": 1025},
+        ]
+        assert invoice_aging_summary(client_id=owner.id + 100)[0]["count"] == 0
@@ -0,0 +1,103 @@
+import pytest
+from sqlalchemy import text
+from models.cache_version import CacheVersion
+from models.master import (
+    Bank,
+    MasterDataManager,
+    PaybillConfig,
+    SystemConfig,
+    master_data_cache,
+)
+
+
+class TestMasterDataCache:
+    """Test cases for the versioned master data cache"""
+
+    @pytest.fixture
+    def bank(self, session):
+        record = Bank(
+            name="Equity",
+            code="68",
+            account_name="EcoVibe Ltd",
+            account_number="0123456789",
+        )
+        session.add(record)
+        session.commit()
+        return record
+
+    def test_snapshots_are_cached_and_read_only(self, session):
+        # The first call creates the default row
+        assert MasterDataManager.get_system_config().company_name == "Your Company"
+        config = MasterDataManager.get_system_config()
+        assert MasterDataManager.get_system_config() is config
+        with pytest.raises(AttributeError):
+            config.company_name = "Changed"
+
+    def test_local_writes_bump_version_and_invalidate(self, session, bank):
+        version = session.get(CacheVersion, "master_data").value
+        assert [b.name for b in MasterDataManager.get_active_banks()] == ["Equity"]
+
+        bank.name = "Equity Bank"
+        session.commit()
+        assert session.get(CacheVersion, "master_data").value == version + 1
+        assert [b.name for b in MasterDataManager.get_active_banks()] == ["Equity Bank"]
+
+    def test_other_workers_writes_seen_within_staleness_bound(
+        self, session, bank, monkeypatch
+    ):
+        assert MasterDataManager.get_active_banks()[0].name == "Equity"
+        # Another worker renames the bank; this worker has no commit event
+        session.execute(text("UPDATE banks SET name = 'KCB'"))
+        session.execute(text("UPDATE cache_versions SET value = value + 1"))
+        session.expire_all()  # as a new request would
+        assert MasterDataManager.get_active_banks()[0].name == "Equity"
+
+        monkeypatch.setattr(master_data_cache, "staleness_seconds", 0)
+        assert MasterDataManager.get_active_banks()[0].name == "KCB"
+
+    def test_read_endpoints_serve_etags(self, client, session, bank):
+        response = client.get("/api/master/banks")
+        assert response.status_code == 200
+        assert response.get_json()["data"][0]["name"] == "Equity"
+        etag = response.headers["ETag"]
+
+        response = client.get("/api/master/banks", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        bank.display_order = 2
+        session.commit()
+        response = client.get("/api/master/banks", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+        theme = client.get("/api/master/theme").get_json()["data"]
+        assert theme["company_name"] == "ECOVIBE"
+        assert session.query(SystemConfig).count() == 0
+
+    def test_paybill_endpoint_hides_credentials(self, client, session):
+        session.add(
+            PaybillConfig(
+                paybill_number="174379",
+                business_name="EcoVibe",
+                provider="mpesa",
+                provider_type="paybill",
+                consumer_key="key-123",
+                consumer_secret="secret-456",
+                passkey="passkey-789",
+            )
+        )
+        session.commit()
+
+        response = client.get("/api/master/paybills")
+        assert response.status_code == 200
+        paybill = response.get_json()["data"][0]
+        assert paybill == {
+            "paybill_number": "174379",
+            "business_name": "EcoVibe",
+            "provider": "mpesa",
+            "provider_type": "paybill",
+            "min_amount": 1.0,
+            "max_amount": 150000.0,
+        }
+        for secret in ("key-123", "secret-456", "passkey-789"):
+            assert secret not in response.get_data(as_text=True)
@@ -1,8 +1,11 @@
 import json
 import pytest
+from datetime import date, datetime, timedelta, timezone
 from unittest.mock import patch, MagicMock
-from models.payment import MpesaTransaction
-from models.user import User
+from models.invoice import Invoice, InvoiceStatus
+from models.payment import MpesaTransaction, MpesaCallbackInbox, Payment
+from models.user import User, Role
+from utils.mpesa_inbox import process_mpesa_inbox
 
 
 def create_active_user(session, email="test@test.com", password="Testpassword123"):
@@ -163,3 +166,221 @@ class TestMpesaRoutes:
         )
 
         assert response.status_code == 404
+
+
+def stk_callback_payload(checkout_request_id, result_code=0):
+    """Build a Daraja STK callback body"""
+    stk_callback = {
+        "MerchantRequestID": "merchant-1",
+        "CheckoutRequestID": checkout_request_id,
+        "ResultCode": result_code,
+        "ResultDesc": "The service request is processed successfully.",
+    }
+    if result_code == 0:
+        stk_callback["CallbackMetadata"] = {
+            "Item": [
+                {"Name": "Amount", "Value": 100},
+                {"Name": "MpesaReceiptNumber", "Value": "NLJ7RT61SV"},
+                {"Name": "TransactionDate", "Value": 20191219102115},
+            ]
+        }
+    return {"Body": {"stkCallback": stk_callback}}
+
+
+class TestMpesaCallbackInbox:
+    """Test cases for the queued MPESA callback pipeline"""
+
+    @pytest.fixture
+    def pending_transaction(self, session, create_test_user, create_test_service):
+        admin = create_test_user("admin@inbox.com", Role.ADMIN)
+        service = create_test_service(admin.id)
+        invoice = Invoice(
+            amount=100,
+            client_id=admin.id,
+            service_id=service.id,
+            due_date=date.today() + timedelta(days=30),
+            status=InvoiceStatus.pending,
+        )
+        session.add(invoice)
+        session.commit()
+
+        transaction = MpesaTransaction(
+            amount=100,
+            phone_number="254712345678",
+            paid_by="254712345678",
+            checkout_request_id="ws_CO_inbox_1",
+            invoice_id=invoice.id,
+            status="pending",
+        )
+        session.add(transaction)
+        session.commit()
+        return transaction
+
+    def test_callback_is_queued_not_applied(self, client, session, pending_transaction):
+        """The webhook acknowledges without touching the transaction"""
+        response = client.post(
+            "/api/mpesa/callback", json=stk_callback_payload("ws_CO_inbox_1")
+        )
+
+        assert response.status_code == 200
+        assert response.get_json()["ResultCode"] == 0
+        assert MpesaCallbackInbox.query.count() == 1
+
+        session.refresh(pending_transaction)
+        assert pending_transaction.status == "pending"
+        assert pending_transaction.callback_received is False
+
+    def test_callback_missing_checkout_request_id(self, client, session):
+        """Callbacks without a CheckoutRequestID are rejected"""
+        payload = stk_callback_payload(None)
+
+        response = client.post("/api/mpesa/callback", json=payload)
+
+        assert response.status_code == 400
+        assert response.get_json()["ResultCode"] == 1
+
+    def test_process_inbox_applies_callback(self, client, session, pending_transaction):
+        """Processing marks the transaction completed and the invoice paid"""
+        client.post("/api/mpesa/callback", json=stk_callback_payload("ws_CO_inbox_1"))
+
+        assert process_mpesa_inbox() == 1
+
+        transaction = MpesaTransaction.query.get(pending_transaction.id)
+        assert transaction.status == "completed"
+        assert transaction.callback_received is True
+        assert transaction.transaction_code == "NLJ7RT61SV"
+        invoice = Invoice.query.get(transaction.invoice_id)
+        assert invoice.status == InvoiceStatus.paid
+        assert Payment.query.filter_by(mpesa_transaction_id=transaction.id).count() == 1
+        assert MpesaCallbackInbox.query.filter_by(processed_at=None).count() == 0
+
+    def test_duplicate_callbacks_are_idempotent(
+        self, client, session, pending_transaction
+    ):
+        """Redelivered callbacks never create a second payment"""
+        payload = stk_callback_payload("ws_CO_inbox_1")
+        client.post("/api/mpesa/callback", json=payload)
+        client.post("/api/mpesa/callback", json=payload)
+        process_mpesa_inbox()
+
+        client.post("/api/mpesa/callback", json=payload)
+        process_mpesa_inbox()
+
+        payments = Payment.query.filter_by(
+            mpesa_transaction_id=pending_transaction.id
+        ).count()
+        assert payments == 1
+        errors = [row.processing_error for row in MpesaCallbackInbox.query.all()]
+        assert errors[0] is None
+        assert errors[1].startswith("Duplicate")
+        assert errors[2] == "Callback already applied"
+
+    def test_process_inbox_unknown_transaction_is_retried(
+        self, client, session, pending_transaction, monkeypatch
+    ):
+        """Callbacks that beat their transaction are retried with backoff"""
+        monkeypatch.setattr("utils.mpesa_inbox.INBOX_MAX_ATTEMPTS", 2)
+        pending_transaction.checkout_request_id = "ws_CO_later"
+        session.commit()
+        client.post("/api/mpesa/callback", json=stk_callback_payload("ws_CO_early"))
+
+        assert process_mpesa_inbox() == 1
+        row = MpesaCallbackInbox.query.first()
+        assert row.processed_at is None
+        assert (row.attempts, row.processing_error) == (1, "Transaction not found")
+        assert process_mpesa_inbox() == 0  # backing off
+
+        # The STK push row commits; the next attempt applies the callback
+        pending_transaction.checkout_request_id = "ws_CO_early"
+        row.next_attempt_at = None
+        session.commit()
+        assert process_mpesa_inbox() == 1
+        assert row.processed_at is not None and row.processing_error is None
+        assert pending_transaction.status == "completed"
+
+    def test_process_inbox_gives_up_after_max_attempts(
+        self, client, session, monkeypatch
+    ):
+        """Callbacks for transactions that never appear are marked dead"""
+        monkeypatch.setattr("utils.mpesa_inbox.INBOX_MAX_ATTEMPTS", 2)
+        client.post("/api/mpesa/callback", json=stk_callback_payload("ws_CO_missing"))
+
+        process_mpesa_inbox()
+        row = MpesaCallbackInbox.query.first()
+        row.next_attempt_at = None
+        session.commit()
+        process_mpesa_inbox()
+        assert row.processed_at is not None
+        assert row.processing_error == "Transaction not found after 2 attempts"
+
+
+class TestMpesaTransactionPagination:
+    """Test cases for keyset pagination of MPESA transactions"""
+
+    @pytest.fixture
+    def transactions(self, session):
+        base = datetime(2025, 9, 30, 9, 0, tzinfo=timezone.utc)
+        rows = [
+            MpesaTransaction(
+                amount=100 + n,
+                phone_number="254712345678",
+                paid_by="254712345678",
+                checkout_request_id=f"ws_CO_page_{n}",
+                status="completed" if n % 2 else "pending",
+                # Two rows share a timestamp so the id tie-breaker is exercised
+                created_at=base + timedelta(minutes=min(n, 3)),
+                raw_callback_data={"Body": {"n": n}},
+            )
+            for n in range(5)
+        ]
+        session.add_all(rows)
+        session.commit()
+        return rows
+
+    def test_pages_follow_cursor(self, client, session, auth_headers, transactions):
+        """Walking next_cursor visits every row once, newest first"""
+        seen = []
+        cursor = None
+        while True:
+            params = {"per_page": 2}
+            if cursor:
+                params["cursor"] = cursor
+            data = client.get(
+                "/api/mpesa/transactions", query_string=params, headers=auth_headers
+            ).get_json()
+            seen.extend(t["id"] for t in data["transactions"])
+            if cursor is None:
+                assert data["total"] == 5
+            else:
+                assert "total" not in data
+            cursor = data["next_cursor"]
+            if not data["has_more"]:
+                break
+
+        expected = sorted(
+            transactions, key=lambda t: (t.created_at, t.id), reverse=True
+        )
+        assert seen == [t.id for t in expected]
+
+    def test_status_filter_and_raw_data(
+        self, client, session, auth_headers, transactions
+    ):
+        data = client.get(
+            "/api/mpesa/transactions?status=completed", headers=auth_headers
+        ).get_json()
+        assert data["total"] == 2
+        assert {t["status"] for t in data["transactions"]} == {"completed"}
+        assert "raw_callback_data" not in data["transactions"][0]
+
+        data = client.get(
+            "/api/mpesa/transactions?include_raw=1", headers=auth_headers
+        ).get_json()
+        assert data["transactions"][0]["raw_callback_data"] == {"Body": {"n": 4}}
+
+    def test_invalid_cursor(self, client, session, auth_headers):
+        response = client.get(
+            "/api/mpesa/transactions?cursor=not-a-cursor", headers=auth_headers
+        )
+
+        assert response.status_code == 400
+        assert response.get_json()["success"] is False
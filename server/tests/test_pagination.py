@@ -0,0 +1,107 @@
+from datetime import date, timedelta
+from models.invoice import Invoice, InvoiceStatus
+from models.newsletter_subscriber import NewsletterSubscriber
+from models.user import Role
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+
+class TestKeysetPagination:
+    """Test cases for the shared cursor pagination of list endpoints"""
+
+    def walk(self, client, url, **kwargs):
+        pages, cursor = [], None
+        while True:
+            query = f"{url}&cursor={cursor}" if cursor else url
+            body = client.get(query, **kwargs).get_json()
+            pages.append(body)
+            cursor = body["pagination"]["next_cursor"]
+            if not cursor:
+                return pages
+
+    def test_walk_forward_and_back(self, client, session):
+        for index in range(5):
+            session.add(NewsletterSubscriber(email=f"reader{index}@example.com"))
+        session.commit()
+
+        pages = self.walk(client, "/api/newsletter-subscribers?limit=2")
+
+        assert [len(page["data"]) for page in pages] == [2, 2, 1]
+        emails = [row["email"] for page in pages for row in page["data"]]
+        assert emails == [f"reader{index}@example.com" for index in range(5)]
+        assert pages[0]["pagination"]["prev_cursor"] is None
+        assert pages[-1]["pagination"]["has_more"] is False
+
+        back = client.get(
+            "/api/newsletter-subscribers?limit=2&cursor="
+            + pages[-1]["pagination"]["prev_cursor"]
+        ).get_json()
+        assert back["data"] == pages[1]["data"]
+        assert back["pagination"]["next_cursor"] is not None
+
+    def test_date_keys_with_ties(
+        self, client, session, create_test_user, create_test_service
+    ):
+        owner = create_test_user("client@pages.com", Role.CLIENT)
+        admin = create_test_user(
+            "admin@pages.com", Role.ADMIN, phone_number="+254712345679"
+        )
+        service = create_test_service(admin.id)
+        for days_ago in (3, 1, 1, 2, 1):
+            session.add(
+                Invoice(
+                    created_at=date.today() - timedelta(days=days_ago),
+                    due_date=date.today() + timedelta(days=30),
+                    amount=100,
+                    client_id=owner.id,
+                    service_id=service.id,
+                    status=InvoiceStatus.pending,
+                )
+            )
+        session.commit()
+        expected = [
+            invoice.id
+            for invoice in Invoice.query.order_by(
+                Invoice.created_at.desc(), Invoice.id.desc()
+            )
+        ]
+
+        login = client.post(
+            "/api/login", json={"email": admin.email, "password": "TestPass123"}
+        )
+        token = login.get_json()["data"]["access_token"]
+        pages = self.walk(
+            client,
+            "/api/invoices?limit=2&include_total=1",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        ids = [row["id"] for page in pages for row in page["data"]["invoices"]]
+        assert ids == expected
+        assert pages[0]["pagination"]["total"] == 5
+        assert pages[0]["pagination"]["total_is_estimate"] is False
+
+    def test_bad_cursor_and_limit_cap(self, client, session):
+        session.add(NewsletterSubscriber(email="reader@example.com"))
+        session.commit()
+
+        response = client.get("/api/newsletter-subscribers?cursor=not-a-cursor")
+        assert response.status_code == 400
+
+        body = client.get(
+            f"/api/newsletter-subscribers?limit={MAX_PAGE_SIZE * 10}"
+        ).get_json()
+        assert body["pagination"]["limit"] == MAX_PAGE_SIZE
+
+    def test_unpaged_request_returns_every_row(self, client, session):
+        """Clients that never pass a cursor or limit see the newest rows too"""
+        count = DEFAULT_PAGE_SIZE + 1
+        for index in range(count):
+            session.add(NewsletterSubscriber(email=f"reader{index}@example.com"))
+        session.commit()
+
+        body = client.get("/api/newsletter-subscribers?include_total=1").get_json()
+        assert len(body["data"]) == count
+        assert body["data"][-1]["email"] == f"reader{count - 1}@example.com"
+        assert body["pagination"]["limit"] is None
+        assert body["pagination"]["has_more"] is False
+        assert body["pagination"]["total"] == count
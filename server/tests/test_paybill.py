@@ -0,0 +1,188 @@
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from models.invoice import Invoice, InvoiceStatus
+from models.payment import (
+    MpesaTransaction,
+    Payment,
+    PaybillTransaction,
+    PaymentMethod,
+    PaymentStatus,
+)
+from models.user import Role
+from utils.paybill import (
+    C2B_INVALID_ACCOUNT,
+    ingest_paybill_confirmations,
+    parse_account_number,
+)
+
+
+def c2b_payload(trans_id, account, amount="100.00"):
+    """Build a Daraja C2B validation/confirmation body"""
+    return {
+        "TransactionType": "Pay Bill",
+        "TransID": trans_id,
+        "TransTime": "20251031093015",
+        "TransAmount": amount,
+        "BusinessShortCode": "600638",
+        "BillRefNumber": account,
+        "MSISDN": "254712345678",
+        "FirstName": "Jane",
+    }
+
+
+@pytest.fixture
+def invoice(session, create_test_user, create_test_service):
+    admin = create_test_user("admin@paybill.com", Role.ADMIN)
+    service = create_test_service(admin.id)
+    invoice = Invoice(
+        amount=100,
+        client_id=admin.id,
+        service_id=service.id,
+        due_date=date.today() + timedelta(days=30),
+        status=InvoiceStatus.pending,
+    )
+    session.add(invoice)
+    session.commit()
+    return invoice
+
+
+def test_parse_account_number():
+    assert parse_account_number("42") == 42
+    assert parse_account_number("INV-42") == 42
+    assert parse_account_number("Invoice42") == 42
+    assert parse_account_number("inv #42") == 42
+    assert parse_account_number("ACME") is None
+    assert parse_account_number(None) is None
+
+
+class TestC2BValidation:
+    """Test cases for the paybill validation webhook"""
+
+    def test_accepts_open_invoice(self, client, session, invoice):
+        response = client.post(
+            "/api/mpesa/c2b/validation",
+            json=c2b_payload("RKTQDM7W6S", f"INV{invoice.id}"),
+        )
+
+        assert response.status_code == 200
+        assert response.get_json()["ResultCode"] == "0"
+
+    def test_rejects_unknown_account(self, client, session, invoice):
+        response = client.post(
+            "/api/mpesa/c2b/validation", json=c2b_payload("RKTQDM7W6S", "ACME")
+        )
+
+        assert response.get_json()["ResultCode"] == C2B_INVALID_ACCOUNT
+
+
+class TestC2BConfirmation:
+    """Test cases for paybill confirmation ingestion"""
+
+    def test_confirmation_pays_invoice(self, client, session, invoice):
+        response = client.post(
+            "/api/mpesa/c2b/confirmation",
+            json=c2b_payload("RKTQDM7W6S", f"INV{invoice.id}"),
+        )
+
+        assert response.status_code == 200
+        assert response.get_json()["ResultCode"] == 0
+
+        transaction = PaybillTransaction.query.one()
+        assert transaction.transaction_code == "RKTQDM7W6S"
+        assert transaction.status == PaymentStatus.VERIFIED
+        assert transaction.confirmation_received is True
+        payment = Payment.query.filter_by(paybill_transaction_id=transaction.id).one()
+        assert payment.invoice_id == invoice.id
+        assert Invoice.query.get(invoice.id).status == InvoiceStatus.paid
+
+    def test_redelivered_confirmation_is_ignored(self, client, session, invoice):
+        payload = c2b_payload("RKTQDM7W6S", f"INV{invoice.id}")
+        client.post("/api/mpesa/c2b/confirmation", json=payload)
+        response = client.post("/api/mpesa/c2b/confirmation", json=payload)
+
+        assert response.status_code == 200
+        assert PaybillTransaction.query.count() == 1
+        assert Payment.query.count() == 1
+
+    def test_invalid_confirmation(self, client, session):
+        response = client.post(
+            "/api/mpesa/c2b/confirmation", json=c2b_payload("", "INV1")
+        )
+
+        assert response.status_code == 400
+
+    def test_batch_ingestion(self, session, invoice):
+        """A batch dedupes receipts and settles invoices on partial payments"""
+        results = ingest_paybill_confirmations(
+            [
+                c2b_payload("RKTQDM7W61", f"INV{invoice.id}", amount="60"),
+                c2b_payload("RKTQDM7W61", f"INV{invoice.id}", amount="60"),
+                c2b_payload("RKTQDM7W62", "UNKNOWN-REF", amount="25"),
+                c2b_payload("RKTQDM7W63", f"{invoice.id}", amount="0"),
+            ]
+        )
+        assert results == ["created", "duplicate", "created", "invalid"]
+        assert Invoice.query.get(invoice.id).status == InvoiceStatus.pending
+
+        unmatched = PaybillTransaction.query.filter_by(
+            transaction_code="RKTQDM7W62"
+        ).one()
+        assert unmatched.status == PaymentStatus.PENDING
+        assert unmatched.amount == Decimal("25")
+
+        results = ingest_paybill_confirmations(
+            [c2b_payload("RKTQDM7W64", f"INV{invoice.id}", amount="40")]
+        )
+        assert results == ["created"]
+        assert Invoice.query.get(invoice.id).status == InvoiceStatus.paid
+
+    def test_settles_against_payments_of_every_kind(self, session, invoice):
+        """Completed STK payments count toward settlement, pending ones do not"""
+        for checkout, status in (
+            ("ws_CO_done", "completed"),
+            ("ws_CO_wait", "pending"),
+        ):
+            transaction = MpesaTransaction(
+                amount=50,
+                phone_number="254712345678",
+                checkout_request_id=checkout,
+                invoice_id=invoice.id,
+                status=status,
+            )
+            session.add(transaction)
+            session.flush()
+            session.add(
+                Payment(
+                    invoice_id=invoice.id,
+                    payment_method=PaymentMethod.MPESA,
+                    mpesa_transaction_id=transaction.id,
+                )
+            )
+        session.commit()
+
+        ingest_paybill_confirmations(
+            [c2b_payload("RKTQDM7W71", f"INV{invoice.id}", amount="40")]
+        )
+        assert Invoice.query.get(invoice.id).status == InvoiceStatus.pending
+
+        ingest_paybill_confirmations(
+            [c2b_payload("RKTQDM7W72", f"INV{invoice.id}", amount="10")]
+        )
+        assert Invoice.query.get(invoice.id).status == InvoiceStatus.paid
+
+    def test_late_fee_must_be_paid_to_settle(self, session, invoice):
+        """An overdue invoice is only settled once its late fee is paid too"""
+        invoice.status = InvoiceStatus.overdue
+        invoice.late_fee = 5
+        session.commit()
+
+        ingest_paybill_confirmations(
+            [c2b_payload("RKTQDM7W81", f"INV{invoice.id}", amount="100")]
+        )
+        assert Invoice.query.get(invoice.id).status == InvoiceStatus.overdue
+
+        ingest_paybill_confirmations(
+            [c2b_payload("RKTQDM7W82", f"INV{invoice.id}", amount="5")]
+        )
+        assert Invoice.query.get(invoice.id).status == InvoiceStatus.paid
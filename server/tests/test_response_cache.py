@@ -0,0 +1,79 @@
+import pytest
+from models.blog import Blog
+from models.user import Role
+from utils.blog_counters import blog_counter_buffer
+from utils.response_cache import LRUBackend, response_cache
+
+
+@pytest.fixture
+def admin(session, create_test_user):
+    return create_test_user("admin@cache.com", Role.ADMIN)
+
+
+@pytest.fixture
+def blog(session, admin):
+    record = Blog(
+        title="Cached",
+        content="Cached content",
+        author_name=admin.full_name,
+        admin_id=admin.id,
+        image=b"image",
+        image_content_type="image/png",
+        category="News",
+        reading_duration="2 min",
+    )
+    session.add(record)
+    session.commit()
+    return record
+
+
+def get(client, url, **params):
+    response = client.get(url, query_string=params)
+    assert response.status_code == 200
+    return response.headers["X-Cache"], response.get_json()["data"]
+
+
+def test_blog_reads_are_cached_until_a_commit(client, session, blog):
+    assert get(client, "/api/blogs", limit=5, full=1)[0] == "MISS"
+    assert get(client, "/api/blogs", full=1, limit=5)[0] == "HIT"
+    assert get(client, f"/api/blogs/{blog.id}")[0] == "MISS"
+    assert get(client, f"/api/blogs/{blog.id}")[0] == "HIT"
+
+    blog.title = "Renamed"
+    session.commit()
+    state, data = get(client, f"/api/blogs/{blog.id}")
+    assert (state, data["title"]) == ("MISS", "Renamed")
+
+    client.post(f"/api/blogs/{blog.id}/view")
+    assert get(client, f"/api/blogs/{blog.id}")[1]["views"] == 0  # cached
+    blog_counter_buffer.flush()
+    assert get(client, f"/api/blogs/{blog.id}")[1]["views"] == 1
+
+    stats = response_cache.stats()["blogs.blogresource"]
+    assert (stats["hits"], stats["misses"]) == (2, 3)
+    assert stats["hit_ratio"] == 0.4
+
+
+def test_service_reads_follow_service_writes(
+    client, session, admin, create_test_service
+):
+    service = create_test_service(admin.id)
+
+    assert get(client, "/api/services")[0] == "MISS"
+    assert get(client, "/api/services")[0] == "HIT"
+    service.price = 250.0
+    session.commit()
+    state, data = get(client, "/api/services")
+    assert (state, data[0]["price"]) == ("MISS", 250.0)
+    assert client.get("/api/services/999").headers["X-Cache"] == "MISS"
+
+
+def test_lru_backend_evicts_least_recently_used():
+    backend = LRUBackend(max_entries=2)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")
+    backend.set("c", 3)
+    assert (backend.get("a"), backend.get("b"), backend.get("c")) == (1, None, 3)
+    backend.bump("blogs")
+    assert (backend.version("blogs"), backend.version("services")) == (1, 0)
@@ -610,3 +610,124 @@ class TestBookingResource:
         # Verify soft delete
         deleted_booking = Booking.query.get(booking.id)
         assert deleted_booking.is_deleted is True
+
+
+class TestBookingBulkResource:
+    """Test BookingBulkResource endpoint"""
+
+    @pytest.fixture
+    def setup(self, client, session, create_test_user, create_test_service):
+        admin = create_test_user("admin@bulk.com", Role.ADMIN)
+        clients = [
+            create_test_user(
+                f"client{i}@bulk.com", Role.CLIENT, phone_number=f"+25471100{i:04d}"
+            )
+            for i in range(5)
+        ]
+        services = [
+            create_test_service(admin.id, title=f"Service {i}", duration="1 hr")
+            for i in range(3)
+        ]
+        login = client.post(
+            "/api/login", json={"email": admin.email, "password": "TestPass123"}
+        )
+        token = login.get_json()["data"]["access_token"]
+        return {"Authorization": f"Bearer {token}"}, clients, services
+
+    def test_bulk_create(self, client, session, setup):
+        headers, clients, services = setup
+        base = datetime(2030, 1, 1, 8, tzinfo=timezone.utc)
+        items = [
+            {
+                "client_id": clients[i % 5].id,
+                "service_id": services[i % 3].id,
+                "start_time": (base + timedelta(hours=i)).isoformat(),
+            }
+            for i in range(300)
+        ]
+
+        response = client.post(
+            "/api/bookings/bulk", json={"bookings": items}, headers=headers
+        )
+
+        assert response.status_code == 201
+        results = response.get_json()["data"]
+        assert [r["status"] for r in results] == ["created"] * 300
+        assert Booking.query.count() == 300
+        assert Invoice.query.count() == 300
+
+    def test_bulk_reports_per_item_errors(self, client, session, setup):
+        headers, clients, services = setup
+        start = datetime(2030, 1, 1, 8, tzinfo=timezone.utc).isoformat()
+        items = [
+            {
+                "client_id": clients[0].id,
+                "service_id": services[0].id,
+                "start_time": start,
+            },
+            # Same slot on the same service as the first item
+            {
+                "client_id": clients[1].id,
+                "service_id": services[0].id,
+                "start_time": start,
+            },
+            # Same client at the same time on another service
+            {
+                "client_id": clients[0].id,
+                "service_id": services[1].id,
+                "start_time": start,
+            },
+            {"client_id": 999999, "service_id": services[2].id, "start_time": start},
+            {
+                "client_id": clients[2].id,
+                "service_id": services[2].id,
+                "start_time": "x",
+            },
+            {
+                "client_id": clients[3].id,
+                "service_id": services[2].id,
+                "start_time": start,
+            },
+        ]
+
+        response = client.post(
+            "/api/bookings/bulk", json={"bookings": items}, headers=headers
+        )
+
+        assert response.status_code == 207
+        results = response.get_json()["data"]
+        assert [r["status"] for r in results] == [
+            "created",
+            "error",
+            "error",
+            "error",
+            "error",
+            "created",
+        ]
+        assert "already booked" in results[1]["message"]
+        assert "Client already has a booking" in results[2]["message"]
+        assert results[3]["message"] == "Client not found"
+        assert Booking.query.count() == 2
+
+        atomic = client.post(
+            "/api/bookings/bulk",
+            json={"bookings": items[:2], "atomic": True},
+            headers=headers,
+        )
+        assert atomic.status_code == 400
+        assert Booking.query.count() == 2
+
+    def test_bulk_requires_admin(self, client, session, setup):
+        _, clients, _ = setup
+        login = client.post(
+            "/api/login", json={"email": clients[0].email, "password": "TestPass123"}
+        )
+        token = login.get_json()["data"]["access_token"]
+
+        response = client.post(
+            "/api/bookings/bulk",
+            json={"bookings": [{}]},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 403
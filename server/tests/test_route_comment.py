@@ -0,0 +1,104 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from models.blog import Blog, BlogStatus
+from models.comment import Comment
+from models.user import Role
+from utils.blog_comments import recount_blog_comments
+
+
+@pytest.fixture
+def users(session, create_test_user):
+    return {
+        "client": create_test_user("client@comments.com", Role.CLIENT),
+        "other": create_test_user(
+            "other@comments.com", Role.CLIENT, phone_number="+254712345679"
+        ),
+        "admin": create_test_user(
+            "admin@comments.com", Role.ADMIN, phone_number="+254712345680"
+        ),
+    }
+
+
+@pytest.fixture
+def blog(session, users):
+    record = Blog(
+        title="Composting basics",
+        content="Start with kitchen scraps.",
+        author_name="Admin",
+        admin_id=users["admin"].id,
+        image=b"image",
+        image_content_type="image/png",
+        category="Waste",
+        reading_duration="3 min",
+    )
+    session.add(record)
+    session.commit()
+    return record.id
+
+
+def auth(app, user):
+    with app.app_context():
+        token = create_access_token(identity=str(user.id))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def comment(client, app, user, blog_id, text):
+    return client.post(
+        f"/api/blogs/{blog_id}/comments",
+        json={"description": text},
+        headers=auth(app, user),
+    )
+
+
+def comment_count(client, blog_id):
+    return client.get(f"/api/blogs/{blog_id}").get_json()["data"]["comment_count"]
+
+
+def test_create_list_and_delete_keep_count(app, client, users, blog):
+    for number in range(5):
+        response = comment(client, app, users["client"], blog, f"Comment {number}")
+        assert response.status_code == 201
+    assert response.get_json()["data"]["author_name"] == "Test User"
+    assert comment_count(client, blog) == 5
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        body = client.get(f"/api/blogs/{blog}/comments", query_string=params)
+        body = body.get_json()
+        seen += [item["description"] for item in body["data"]]
+        cursor = body["pagination"]["next_cursor"]
+        if not cursor:
+            break
+    assert seen == [f"Comment {number}" for number in range(5)]
+
+    first = Comment.query.filter_by(blog_id=blog).order_by(Comment.id).first().id
+    forbidden = client.delete(
+        f"/api/comments/{first}", headers=auth(app, users["other"])
+    )
+    assert forbidden.status_code == 403
+    deleted = client.delete(f"/api/comments/{first}", headers=auth(app, users["admin"]))
+    assert deleted.status_code == 200
+    assert comment_count(client, blog) == 4
+
+
+def test_rejects_empty_comments_and_unpublished_blogs(
+    app, client, session, users, blog
+):
+    assert comment(client, app, users["client"], blog, "  ").status_code == 400
+    assert comment(client, app, users["client"], 999, "Hi").status_code == 404
+
+    session.get(Blog, blog).status = BlogStatus.DRAFT
+    session.commit()
+    assert comment(client, app, users["client"], blog, "Hi").status_code == 404
+    assert client.get(f"/api/blogs/{blog}/comments").status_code == 404
+
+
+def test_recount_repairs_drift(session, users, blog):
+    session.add(Comment(description="Hi", client_id=users["client"].id, blog_id=blog))
+    session.commit()
+    Blog.query.filter_by(id=blog).update({"comment_count": 7})
+    session.commit()
+    recount_blog_comments()
+    assert session.get(Blog, blog).comment_count == 1
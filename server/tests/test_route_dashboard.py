@@ -0,0 +1,81 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from models.user import Role
+
+
+class TestDashboardResource:
+    """Test cases for the cached dashboard snapshots"""
+
+    @pytest.fixture
+    def setup(self, client, session, create_test_user, create_test_service):
+        user = create_test_user("client@dashboard.com", Role.CLIENT)
+        admin = create_test_user(
+            "admin@dashboard.com", Role.ADMIN, phone_number="+254712345679"
+        )
+        service = create_test_service(admin.id, title="Energy Audit")
+
+        headers = {}
+        for account in (user, admin):
+            login = client.post(
+                "/api/login", json={"email": account.email, "password": "TestPass123"}
+            )
+            token = login.get_json()["data"]["access_token"]
+            headers[account.role] = {"Authorization": f"Bearer {token}"}
+        return headers, service
+
+    def book(self, client, headers, service, days):
+        start = datetime.now(timezone.utc) + timedelta(days=days)
+        response = client.post(
+            "/api/bookings",
+            json={"service_id": service.id, "start_time": start.isoformat()},
+            headers=headers,
+        )
+        assert response.status_code == 201
+
+    def test_admin_dashboard(self, client, setup):
+        headers, service = setup
+        self.book(client, headers[Role.CLIENT], service, days=3)
+
+        response = client.get("/api/dashboard", headers=headers[Role.ADMIN])
+
+        assert response.status_code == 200
+        data = response.get_json()["data"]
+        assert data["stats"] == {
+            "totalBookings": 1,
+            "registeredUsers": 1,
+            "blogPosts": 0,
+            "paymentRecords": 0,
+            "totalServices": 1,
+        }
+        assert data["recentBookings"][0]["service_title"] == "Energy Audit"
+
+    def test_snapshots_invalidated_by_commits(self, client, setup):
+        headers, service = setup
+
+        admin = client.get("/api/dashboard", headers=headers[Role.ADMIN])
+        own = client.get("/api/dashboard", headers=headers[Role.CLIENT])
+        assert admin.get_json()["data"]["stats"]["totalBookings"] == 0
+        assert own.get_json()["data"]["stats"]["totalBookings"] == 0
+
+        self.book(client, headers[Role.CLIENT], service, days=3)
+
+        admin = client.get("/api/dashboard", headers=headers[Role.ADMIN])
+        own = client.get("/api/dashboard", headers=headers[Role.CLIENT])
+        assert admin.get_json()["data"]["stats"]["totalBookings"] == 1
+        assert own.get_json()["data"]["stats"]["totalBookings"] == 1
+        assert own.get_json()["data"]["upcomingAppointments"][0]["service_name"] == (
+            "Energy Audit"
+        )
+
+    def test_snapshot_served_from_cache(self, client, setup, monkeypatch):
+        headers, _ = setup
+        client.get("/api/dashboard", headers=headers[Role.ADMIN])
+
+        def rebuild():
+            raise AssertionError("snapshot should have been cached")
+
+        monkeypatch.setattr("routes.dashboard.admin_snapshot", rebuild)
+        response = client.get("/api/dashboard", headers=headers[Role.ADMIN])
+
+        assert response.status_code == 200
+        assert response.get_json()["data"]["stats"]["totalServices"] == 1
@@ -0,0 +1,99 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from datetime import date, timedelta
+from models.invoice import Invoice, InvoiceStatus
+from models.user import Role
+
+
+class TestExportRoutes:
+    """Test cases for the streaming CSV/NDJSON exports"""
+
+    @pytest.fixture
+    def setup(self, client, session, create_test_user, create_test_service):
+        owner = create_test_user("client@export.com", Role.CLIENT)
+        other = create_test_user(
+            "other@export.com", Role.CLIENT, phone_number="+254712345670"
+        )
+        admin = create_test_user(
+            "admin@export.com", Role.ADMIN, phone_number="+254712345679"
+        )
+        service = create_test_service(admin.id)
+        for user, amount in ((owner, 1200), (other, 800)):
+            session.add(
+                Invoice(
+                    amount=amount,
+                    client_id=user.id,
+                    service_id=service.id,
+                    due_date=date.today() + timedelta(days=30),
+                    status=InvoiceStatus.pending,
+                )
+            )
+        session.commit()
+
+        headers = {}
+        for user in (owner, admin):
+            login = client.post(
+                "/api/login", json={"email": user.email, "password": "TestPass123"}
+            )
+            token = login.get_json()["data"]["access_token"]
+            headers[user.role] = {"Authorization": f"Bearer {token}"}
+        return headers, owner
+
+    def test_users_csv(self, client, setup):
+        headers, _ = setup
+
+        response = client.get("/api/exports/users", headers=headers[Role.ADMIN])
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/csv"
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        assert sorted(row["email"] for row in rows) == [
+            "client@export.com",
+            "other@export.com",
+        ]
+        assert {row["role"] for row in rows} == {"client"}
+
+    def test_empty_export_has_header(self, client, setup):
+        headers, _ = setup
+
+        response = client.get("/api/exports/payments", headers=headers[Role.ADMIN])
+
+        assert response.status_code == 200
+        assert response.get_data(as_text=True).splitlines() == [
+            "id,invoice_id,client_id,payment_method,amount,currency,created_at"
+        ]
+
+    def test_client_sees_own_invoices_as_gzipped_ndjson(self, client, setup):
+        headers, owner = setup
+
+        response = client.get(
+            "/api/exports/invoices",
+            query_string={"format": "ndjson", "gzip": "1"},
+            headers=headers[Role.CLIENT],
+        )
+
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        lines = gzip.decompress(response.get_data()).decode().splitlines()
+        invoices = [json.loads(line) for line in lines]
+        assert [(i["client_id"], i["amount"], i["status"]) for i in invoices] == [
+            (owner.id, 1200, "pending")
+        ]
+
+    def test_export_errors(self, client, setup):
+        headers, _ = setup
+
+        users = client.get("/api/exports/users", headers=headers[Role.CLIENT])
+        unknown = client.get("/api/exports/tickets", headers=headers[Role.ADMIN])
+        bad_format = client.get(
+            "/api/exports/bookings",
+            query_string={"format": "xml"},
+            headers=headers[Role.ADMIN],
+        )
+
+        assert users.status_code == 403
+        assert unknown.status_code == 404
+        assert bad_format.status_code == 400
@@ -0,0 +1,173 @@
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from models.invoice import Invoice, InvoiceStatus
+from models.payment import CashTransaction, MpesaTransaction, Payment, PaymentMethod
+from models.revenue_rollup import DailyRevenueRollup
+from models.user import Role
+from utils.revenue_rollup import refresh_revenue_rollup
+
+
+class TestReportRoutes:
+    """Test cases for the revenue and collections reports"""
+
+    @pytest.fixture
+    def setup(self, client, session, create_test_user, create_test_service):
+        owner = create_test_user("client@reports.com", Role.CLIENT)
+        admin = create_test_user(
+            "admin@reports.com", Role.ADMIN, phone_number="+254712345679"
+        )
+        service = create_test_service(admin.id, title="Solar Audit")
+        invoice = Invoice(
+            amount=5000,
+            client_id=owner.id,
+            service_id=service.id,
+            due_date=date.today() + timedelta(days=30),
+            status=InvoiceStatus.pending,
+        )
+        session.add(invoice)
+        session.commit()
+
+        headers = {}
+        for user in (owner, admin):
+            login = client.post(
+                "/api/login", json={"email": user.email, "password": "TestPass123"}
+            )
+            token = login.get_json()["data"]["access_token"]
+            headers[user.role] = {"Authorization": f"Bearer {token}"}
+        return headers, service, invoice
+
+    def pay(
+        self,
+        session,
+        invoice,
+        amount,
+        day,
+        method=PaymentMethod.CASH,
+        mpesa_status="completed",
+    ):
+        paid_at = datetime(day.year, day.month, day.day, 10, tzinfo=timezone.utc)
+        if method == PaymentMethod.CASH:
+            transaction = CashTransaction(amount=amount, received_by="Front desk")
+            field = "cash_transaction_id"
+        else:
+            transaction = MpesaTransaction(
+                amount=amount, phone_number="254712345678", status=mpesa_status
+            )
+            field = "mpesa_transaction_id"
+        session.add(transaction)
+        session.flush()
+        session.add(
+            Payment(
+                invoice_id=invoice.id,
+                payment_method=method,
+                created_at=paid_at,
+                **{field: transaction.id},
+            )
+        )
+        session.commit()
+
+    def test_revenue_by_method_and_service(self, client, session, setup):
+        headers, service, invoice = setup
+        today = date.today()
+        self.pay(session, invoice, 1000, today - timedelta(days=2))
+        self.pay(session, invoice, 1500, today, method=PaymentMethod.MPESA)
+        # STK pushes that were not completed are not revenue
+        for status in ("pending", "failed"):
+            self.pay(
+                session, invoice, 900, today, PaymentMethod.MPESA, mpesa_status=status
+            )
+        refresh_revenue_rollup(full=True)
+
+        by_method = client.get(
+            "/api/reports/revenue",
+            query_string={"group_by": "payment_method"},
+            headers=headers[Role.ADMIN],
+        )
+        by_service = client.get(
+            "/api/reports/revenue",
+            query_string={"group_by": "service"},
+            headers=headers[Role.ADMIN],
+        )
+
+        assert by_method.status_code == 200
+        assert by_method.get_json()["data"]["rows"] == [
+            {
+                "payment_method": "cash",
+                "currency": "KES",
+                "payment_count": 1,
+                "amount": 1000.0,
+            },
+            {
+                "payment_method": "mpesa",
+                "currency": "KES",
+                "payment_count": 1,
+                "amount": 1500.0,
+            },
+        ]
+        assert by_service.get_json()["data"]["rows"] == [
+            {
+                "service_id": service.id,
+                "service_title": "Solar Audit",
+                "currency": "KES",
+                "payment_count": 2,
+                "amount": 2500.0,
+            }
+        ]
+
+    def test_refresh_recomputes_only_new_days(self, client, session, setup):
+        headers, _, invoice = setup
+        today = date.today()
+        self.pay(session, invoice, 1000, today - timedelta(days=5))
+        self.pay(session, invoice, 400, today - timedelta(days=3))
+        refresh_revenue_rollup(full=True)
+
+        # Days before the refresh window are not read again
+        session.query(DailyRevenueRollup).filter(
+            DailyRevenueRollup.day == today - timedelta(days=5)
+        ).update({"amount": 1})
+        session.commit()
+        self.pay(session, invoice, 700, today)
+        self.pay(session, invoice, 300, today, method=PaymentMethod.MPESA)
+
+        assert refresh_revenue_rollup(window_days=1) == today - timedelta(days=4)
+        response = client.get("/api/reports/collections", headers=headers[Role.ADMIN])
+
+        assert response.status_code == 200
+        days = response.get_json()["data"]["days"]
+        assert [(d["day"], d["total"]) for d in days] == [
+            ((today - timedelta(days=5)).isoformat(), 1.0),
+            ((today - timedelta(days=3)).isoformat(), 400.0),
+            (today.isoformat(), 1000.0),
+        ]
+        assert days[-1]["payment_count"] == 2
+        assert days[-1]["by_method"] == {"cash": 700.0, "mpesa": 300.0}
+
+    def test_refresh_counts_late_payments_for_recent_days(self, client, session, setup):
+        headers, _, invoice = setup
+        today = datetime.now(timezone.utc).date()
+        self.pay(session, invoice, 1000, today)
+        refresh_revenue_rollup(full=True)
+
+        # Recorded after yesterday was already behind the latest rolled-up day
+        self.pay(session, invoice, 250, today - timedelta(days=1))
+        refresh_revenue_rollup()
+
+        response = client.get("/api/reports/collections", headers=headers[Role.ADMIN])
+        days = response.get_json()["data"]["days"]
+        assert [(d["day"], d["total"]) for d in days] == [
+            ((today - timedelta(days=1)).isoformat(), 250.0),
+            (today.isoformat(), 1000.0),
+        ]
+
+    def test_reports_require_admin(self, client, setup):
+        headers, _, _ = setup
+
+        response = client.get("/api/reports/revenue", headers=headers[Role.CLIENT])
+        invalid = client.get(
+            "/api/reports/revenue",
+            query_string={"group_by": "client"},
+            headers=headers[Role.ADMIN],
+        )
+
+        assert response.status_code == 403
+        assert invalid.status_code == 400
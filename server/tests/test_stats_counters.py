@@ -0,0 +1,119 @@
+import pytest
+from collections import Counter
+from models.stats_counter import StatsCounter
+from models.ticket import Ticket, TicketStatus
+from models.user import Role
+from utils.stats_counters import GLOBAL, read_counters, recompute_stats
+
+
+def all_counters():
+    totals = Counter()
+    for c in StatsCounter.query:
+        totals[(c.name, c.scope_id)] += c.value
+    return {key: value for key, value in totals.items() if value}
+
+
+class TestStatsCounters:
+    """Test cases for the incrementally maintained stats counters"""
+
+    @pytest.fixture
+    def users(self, session, create_test_user):
+        client = create_test_user("client@stats.com", Role.CLIENT)
+        admin = create_test_user(
+            "admin@stats.com", Role.ADMIN, phone_number="+254712345679"
+        )
+        return client, admin
+
+    def test_ticket_counters_follow_status_changes(self, session, users):
+        client, _ = users
+        tickets = [
+            Ticket(client_id=client.id, subject=f"Ticket {i}", status=TicketStatus.OPEN)
+            for i in range(3)
+        ]
+        session.add_all(tickets)
+        session.commit()
+
+        tickets[0].status = TicketStatus.CLOSED
+        session.commit()
+        session.delete(tickets[1])
+        session.commit()
+
+        assert read_counters(
+            [
+                ("tickets.open", GLOBAL),
+                ("tickets.closed", GLOBAL),
+                ("tickets.open.client", client.id),
+                ("tickets.closed.client", client.id),
+                ("users.client", GLOBAL),
+            ]
+        ) == [1, 1, 1, 1, 1]
+
+    def test_global_counters_are_spread_over_slots(self, session, users):
+        client, _ = users
+        for i in range(20):
+            session.add(Ticket(client_id=client.id, subject=f"Ticket {i}"))
+            session.commit()
+
+        slots = {
+            c.slot
+            for c in StatsCounter.query.filter_by(name="tickets.open", scope_id=GLOBAL)
+        }
+        assert len(slots) > 1
+        per_client = StatsCounter.query.filter_by(
+            name="tickets.open.client", scope_id=client.id
+        ).all()
+        assert [c.slot for c in per_client] == [0]
+        assert read_counters([("tickets.open", GLOBAL)]) == [20]
+
+    def test_rolled_back_changes_are_not_counted(self, session, users):
+        client, _ = users
+        session.add(Ticket(client_id=client.id, subject="Draft"))
+        session.flush()
+        session.rollback()
+
+        assert read_counters([("tickets.open", GLOBAL)]) == [0]
+
+    def test_recompute_matches_incremental_counts(self, session, users):
+        client, _ = users
+        session.add_all(
+            [
+                Ticket(client_id=client.id, subject="A", status=TicketStatus.OPEN),
+                Ticket(client_id=client.id, subject="B", status=TicketStatus.CLOSED),
+            ]
+        )
+        session.commit()
+        incremental = all_counters()
+
+        StatsCounter.query.delete()
+        session.commit()
+        recompute_stats()
+
+        assert all_counters() == incremental
+
+    def test_ticket_stats_endpoint(self, client, session, users):
+        owner, admin = users
+        session.add_all(
+            [
+                Ticket(client_id=owner.id, subject="A", status=TicketStatus.OPEN),
+                Ticket(
+                    client_id=owner.id, subject="B", status=TicketStatus.IN_PROGRESS
+                ),
+            ]
+        )
+        session.commit()
+
+        login = client.post(
+            "/api/login", json={"email": admin.email, "password": "TestPass123"}
+        )
+        token = login.get_json()["data"]["access_token"]
+        response = client.get(
+            "/api/tickets/stats", headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 200
+        assert response.get_json()["data"] == {
+            "total": 2,
+            "open": 1,
+            "in_progress": 1,
+            "closed": 0,
+        }
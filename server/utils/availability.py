@@ -0,0 +1,407 @@
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from sqlalchemy import DateTime, event, or_, select, update
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+from models import db
+from models.booking import Booking, BookingStatus
+from models.service import Service
+from utils.booking_series import find_series_conflict, tentative_occurrences
+from utils.recurrence import as_utc
+
+# Rebuild a cached schedule after this long to pick up writes from other workers
+AVAILABILITY_TTL_SECONDS = float(os.getenv("FLASK_AVAILABILITY_TTL_SECONDS", "60"))
+
+# Name of the PostgreSQL exclusion constraint guarding against overlaps
+OVERLAP_CONSTRAINT = "ex_bookings_service_time"
+
+
+def is_active(booking):
+    return not booking.is_deleted and booking.status != BookingStatus.cancelled
+
+
+def active_bookings():
+    """Bookings that occupy their time slot."""
+    return Booking.query.filter(
+        Booking.is_deleted.is_(False), Booking.status != BookingStatus.cancelled
+    )
+
+
+class add_minutes(FunctionElement):
+    """SQL expression for ``timestamp + minutes``."""
+
+    type = DateTime(timezone=True)
+    name = "add_minutes"
+    inherit_cache = True
+
+
+@compiles(add_minutes)
+def _add_minutes(element, compiler, **kw):
+    start, minutes = element.clauses
+    return "({} + {} * INTERVAL '1 minute')".format(
+        compiler.process(start, **kw), compiler.process(minutes, **kw)
+    )
+
+
+@compiles(add_minutes, "sqlite")
+def _add_minutes_sqlite(element, compiler, **kw):
+    # Same text format SQLAlchemy stores, so results compare as strings
+    start, minutes = element.clauses
+    return "strftime('%Y-%m-%d %H:%M:%S.000000', {}, '+' || {} || ' minutes')".format(
+        compiler.process(start, **kw), compiler.process(minutes, **kw)
+    )
+
+
+class ServiceSchedule:
+    """
+    Active bookings of one service as parallel arrays sorted by start time.
+
+    ``max_ends[i]`` is the latest end among the first i + 1 intervals, so
+    overlap checks are a single bisect even if legacy rows overlap.
+    """
+
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.ends = []
+        self.ids = []
+        self.max_ends = []
+        self._start_of = {}
+        for booking_id, start, end in sorted(intervals, key=lambda i: i[1]):
+            self.starts.append(start)
+            self.ends.append(end)
+            self.ids.append(booking_id)
+            self._start_of[booking_id] = start
+        self._refresh_max_ends(0)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _refresh_max_ends(self, position):
+        del self.max_ends[position:]
+        latest = self.max_ends[-1] if self.max_ends else None
+        for end in self.ends[position:]:
+            latest = end if latest is None or end > latest else latest
+            self.max_ends.append(latest)
+
+    def add(self, booking_id, start, end):
+        if booking_id in self._start_of:
+            self.remove(booking_id)
+        position = bisect_right(self.starts, start)
+        self.starts.insert(position, start)
+        self.ends.insert(position, end)
+        self.ids.insert(position, booking_id)
+        self._start_of[booking_id] = start
+        self._refresh_max_ends(position)
+
+    def remove(self, booking_id):
+        start = self._start_of.pop(booking_id, None)
+        if start is None:
+            return
+        position = bisect_left(self.starts, start)
+        while self.ids[position] != booking_id:
+            position += 1
+        for array in (self.starts, self.ends, self.ids):
+            del array[position]
+        self._refresh_max_ends(position)
+
+    def find_conflict(self, start, end, ignore_id=None):
+        """Id of a booking overlapping [start, end), or None."""
+        position = bisect_left(self.starts, end)
+        for i in range(position - 1, -1, -1):
+            if self.max_ends[i] <= start:
+                break
+            if self.ends[i] > start and self.ids[i] != ignore_id:
+                return self.ids[i]
+        return None
+
+    def free_windows(self, window_start, window_end, min_length):
+        """Gaps of at least ``min_length`` between bookings in the window."""
+        windows = []
+        cursor = window_start
+        for i in range(bisect_right(self.max_ends, window_start), len(self.ids)):
+            if self.starts[i] >= window_end:
+                break
+            if self.starts[i] - cursor >= min_length:
+                windows.append((cursor, self.starts[i]))
+            cursor = max(cursor, self.ends[i])
+        if window_end - cursor >= min_length:
+            windows.append((cursor, window_end))
+        return windows
+
+
+class AvailabilityIndex:
+    """
+    Per-service interval index over active bookings.
+
+    Schedules are loaded on first use with one indexed query and kept in
+    step with committed booking writes through session events. They expire
+    after ``ttl_seconds`` so writes made by other workers are picked up; the
+    database check in ``find_booking_conflict`` covers that window.
+    """
+
+    def __init__(self, ttl_seconds=AVAILABILITY_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._schedules = {}  # service_id -> (ServiceSchedule, loaded_at)
+        self._service_of = {}  # booking_id -> service_id
+        self._lock = threading.RLock()
+
+    def schedule_for(self, service_id):
+        with self._lock:
+            cached = self._schedules.get(service_id)
+            if cached and time.monotonic() - cached[1] < self.ttl_seconds:
+                return cached[0]
+
+        rows = (
+            active_bookings()
+            .filter(Booking.service_id == service_id)
+            .with_entities(Booking.id, Booking.start_time, Booking.end_time)
+            .all()
+        )
+        schedule = ServiceSchedule(
+            (booking_id, as_utc(start), as_utc(end)) for booking_id, start, end in rows
+        )
+        with self._lock:
+            self._schedules[service_id] = (schedule, time.monotonic())
+            for booking_id in schedule.ids:
+                self._service_of[booking_id] = service_id
+        return schedule
+
+    def find_conflict(self, service_id, start, end, ignore_id=None):
+        schedule = self.schedule_for(service_id)
+        with self._lock:
+            return schedule.find_conflict(as_utc(start), as_utc(end), ignore_id)
+
+    def free_windows(self, service_id, window_start, window_end, min_length):
+        schedule = self.schedule_for(service_id)
+        with self._lock:
+            return schedule.free_windows(
+                as_utc(window_start), as_utc(window_end), min_length
+            )
+
+    def apply(self, changes):
+        """Apply committed booking changes {id: (service_id, start, end, active)}."""
+        with self._lock:
+            for booking_id, (service_id, start, end, active) in changes.items():
+                previous = self._service_of.pop(booking_id, None)
+                if previous in self._schedules:
+                    self._schedules[previous][0].remove(booking_id)
+                if active and service_id in self._schedules:
+                    self._schedules[service_id][0].add(
+                        booking_id, as_utc(start), as_utc(end)
+                    )
+                    self._service_of[booking_id] = service_id
+
+    def invalidate(self, service_id=None):
+        with self._lock:
+            if service_id is None:
+                self._schedules.clear()
+                self._service_of.clear()
+            else:
+                self._schedules.pop(service_id, None)
+
+
+# Global instance
+availability_index = AvailabilityIndex()
+
+# Called with the booking changes of every commit, after the index is updated
+booking_change_listeners = []
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_booking_changes(session, flush_context):
+    changes = session.info.setdefault("booking_changes", {})
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Booking) and obj.id is not None:
+            changes[obj.id] = (
+                obj.service_id,
+                obj.start_time,
+                obj.end_time,
+                is_active(obj),
+            )
+    for obj in session.deleted:
+        if isinstance(obj, Booking):
+            changes[obj.id] = (obj.service_id, None, None, False)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_booking_changes(session):
+    changes = session.info.pop("booking_changes", None)
+    if changes:
+        availability_index.apply(changes)
+        for listener in booking_change_listeners:
+            listener(changes)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_booking_changes(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop("booking_changes", None)
+
+
+def find_booking_conflict(
+    service_id, client_id, start, end, ignore_id=None, ignore_series_id=None
+):
+    """
+    Return an error message if [start, end) clashes with another booking.
+
+    The service check uses the in-memory index; the client check and, off
+    PostgreSQL, a service re-check run as indexed range queries. On
+    PostgreSQL the ``ex_bookings_service_time`` exclusion constraint closes
+    the race between workers instead. Unconfirmed occurrences of recurring
+    series, other than ``ignore_series_id``, also hold their slots.
+    """
+    if availability_index.find_conflict(service_id, start, end, ignore_id):
+        return "This time slot is already booked for the selected service"
+
+    overlapping = active_bookings().filter(
+        Booking.start_time < end, Booking.end_time > start
+    )
+    if ignore_id is not None:
+        overlapping = overlapping.filter(Booking.id != ignore_id)
+
+    if db.session.query(
+        overlapping.filter(Booking.client_id == client_id).exists()
+    ).scalar():
+        return "Client already has a booking at this time"
+
+    if (
+        db.engine.dialect.name != "postgresql"
+        and db.session.query(
+            overlapping.filter(Booking.service_id == service_id).exists()
+        ).scalar()
+    ):
+        availability_index.invalidate(service_id)
+        return "This time slot is already booked for the selected service"
+
+    if find_series_conflict(service_id, client_id, start, end, ignore_series_id):
+        return "This time slot is reserved by a recurring booking"
+
+    return None
+
+
+class BatchConflictChecker:
+    """
+    Overlap checks for a batch of new bookings without per-item queries.
+
+    Active bookings and unconfirmed series occurrences of the batch's
+    services and clients inside [window_start, window_end) are loaded once
+    into per-service and per-client schedules; accepted items are added as
+    the batch is checked so items also conflict with each other.
+    """
+
+    def __init__(self, window_start, window_end, service_ids, client_ids):
+        self.by_service = {}
+        self.by_client = {}
+        rows = (
+            active_bookings()
+            .filter(
+                or_(
+                    Booking.service_id.in_(list(service_ids)),
+                    Booking.client_id.in_(list(client_ids)),
+                ),
+                Booking.start_time < window_end,
+                Booking.end_time > window_start,
+            )
+            .with_entities(
+                Booking.id,
+                Booking.service_id,
+                Booking.client_id,
+                Booking.start_time,
+                Booking.end_time,
+            )
+        )
+        for booking_id, service_id, client_id, start, end in rows:
+            self.add(booking_id, service_id, client_id, as_utc(start), as_utc(end))
+
+        self.series_keys = set()
+        for series, occurrence in tentative_occurrences(
+            window_start, window_end, service_ids, client_ids
+        ):
+            key = ("series", series.id, occurrence.occurrence_start)
+            self.series_keys.add(key)
+            self.add(
+                key,
+                series.service_id,
+                series.client_id,
+                occurrence.start_time,
+                occurrence.end_time,
+            )
+
+    def add(self, key, service_id, client_id, start, end):
+        self.by_service.setdefault(service_id, ServiceSchedule()).add(key, start, end)
+        self.by_client.setdefault(client_id, ServiceSchedule()).add(key, start, end)
+
+    def _conflict(self, schedules, owner_id, start, end):
+        schedule = schedules.get(owner_id)
+        return schedule.find_conflict(start, end) if schedule else None
+
+    def check(self, service_id, client_id, start, end):
+        """Error message if [start, end) clashes, like find_booking_conflict."""
+        key = self._conflict(self.by_service, service_id, start, end)
+        if key is not None and key not in self.series_keys:
+            return "This time slot is already booked for the selected service"
+
+        client_key = self._conflict(self.by_client, client_id, start, end)
+        if client_key is not None and client_key not in self.series_keys:
+            return "Client already has a booking at this time"
+
+        if key is not None or client_key is not None:
+            return "This time slot is reserved by a recurring booking"
+        return None
+
+
+def subtract_intervals(windows, busy, min_length):
+    """Cut sorted ``busy`` intervals out of sorted free ``windows``."""
+    result = []
+    for window_start, window_end in windows:
+        cursor = window_start
+        for busy_start, busy_end in busy:
+            if busy_end <= cursor or busy_start >= window_end:
+                continue
+            if busy_start - cursor >= min_length:
+                result.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+        if window_end - cursor >= min_length:
+            result.append((cursor, window_end))
+    return result
+
+
+def sync_booking_end_times(service_id=None):
+    """
+    Recompute ``end_time`` of upcoming active bookings from their service's
+    ``duration_minutes`` in a single UPDATE. Returns the number of bookings
+    changed.
+    """
+    duration = (
+        select(Service.duration_minutes)
+        .where(Service.id == Booking.service_id)
+        .scalar_subquery()
+    )
+    end_time = add_minutes(Booking.start_time, duration)
+    statement = (
+        update(Booking)
+        .where(
+            Booking.is_deleted.is_(False),
+            Booking.status != BookingStatus.cancelled,
+            Booking.start_time > datetime.now(timezone.utc),
+            Booking.end_time != end_time,
+        )
+        .values(end_time=end_time)
+        .execution_options(synchronize_session=False)
+    )
+    if service_id is not None:
+        statement = statement.where(Booking.service_id == service_id)
+
+    updated = db.session.execute(statement).rowcount
+    db.session.commit()
+    availability_index.invalidate(service_id)
+    return updated
+
+
+def is_overlap_violation(error):
+    """Whether an IntegrityError came from the booking exclusion constraint."""
+    return OVERLAP_CONSTRAINT in str(getattr(error, "orig", error))
@@ -0,0 +1,48 @@
+from sqlalchemy import event, func, inspect, select, update
+from models import db
+from models.blog import Blog
+from models.comment import Comment
+
+# Longest comment accepted, in characters
+MAX_COMMENT_LENGTH = 2000
+
+
+def _bump(connection, blog_id, delta):
+    connection.execute(
+        update(Blog.__table__)
+        .where(Blog.__table__.c.id == blog_id)
+        .values(comment_count=Blog.__table__.c.comment_count + delta)
+    )
+
+
+# Blog.comment_count moves in the flush that writes the comment, so it
+# commits or rolls back with it. As with the stats counters, bulk
+# Query.insert()/delete() on comments must be followed by a recount.
+@event.listens_for(Comment, "after_insert")
+def _comment_added(mapper, connection, target):
+    _bump(connection, target.blog_id, 1)
+
+
+@event.listens_for(Comment, "after_update")
+def _comment_moved(mapper, connection, target):
+    previous = inspect(target).attrs.blog_id.history.deleted
+    if previous and previous[0] != target.blog_id:
+        _bump(connection, previous[0], -1)
+        _bump(connection, target.blog_id, 1)
+
+
+@event.listens_for(Comment, "after_delete")
+def _comment_deleted(mapper, connection, target):
+    _bump(connection, target.blog_id, -1)
+
+
+def recount_blog_comments():
+    """Reset every Blog.comment_count from the comments table."""
+    count = (
+        select(func.count(Comment.id))
+        .where(Comment.blog_id == Blog.id)
+        .scalar_subquery()
+    )
+    updated = db.session.execute(update(Blog).values(comment_count=count)).rowcount
+    db.session.commit()
+    return updated
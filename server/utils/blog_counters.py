@@ -0,0 +1,188 @@
+import atexit
+import itertools
+import os
+import threading
+import time
+from flask import current_app
+from sqlalchemy import text
+from models import db
+
+# Pending increments are written at least this often; a crash loses at most
+# one interval of views and likes
+BLOG_COUNTER_FLUSH_SECONDS = float(os.getenv("FLASK_BLOG_COUNTER_FLUSH_SECONDS", "5"))
+BLOG_COUNTER_SHARDS = int(os.getenv("FLASK_BLOG_COUNTER_SHARDS", "16"))
+BLOG_COUNTER_WORKER_ENABLED = os.getenv(
+    "FLASK_BLOG_COUNTER_WORKER", "true"
+).lower() in ("1", "true")
+
+COUNTERS = ("views", "likes")
+
+# Blogs updated per statement when flushing
+FLUSH_BATCH_SIZE = 500
+
+# Called with {blog_id: [views, likes]} after each successful flush
+counter_flush_listeners = []
+
+
+def apply_counter_deltas(deltas):
+    """
+    Add {blog_id: [views, likes]} to the blogs rows, FLUSH_BATCH_SIZE blogs
+    per UPDATE ... FROM a VALUES list, and commit. Blogs deleted since the
+    increment was recorded are skipped.
+    """
+    items = sorted(deltas.items())  # fixed lock order across workers
+    for start in range(0, len(items), FLUSH_BATCH_SIZE):
+        end = start + FLUSH_BATCH_SIZE
+        batch = items[start:end]
+        params = {}
+        rows = []
+        for index, (blog_id, (views, likes)) in enumerate(batch):
+            rows.append(f"(:id_{index}, :views_{index}, :likes_{index})")
+            params.update(
+                {
+                    f"id_{index}": blog_id,
+                    f"views_{index}": views,
+                    f"likes_{index}": likes,
+                }
+            )
+        db.session.execute(
+            text(
+                f"WITH deltas (id, views, likes) AS (VALUES {', '.join(rows)}) "
+                "UPDATE blogs SET "
+                "views = COALESCE(blogs.views, 0) + deltas.views, "
+                "likes = COALESCE(blogs.likes, 0) + deltas.likes "
+                "FROM deltas WHERE blogs.id = deltas.id"
+            ),
+            params,
+        )
+    db.session.commit()
+
+
+class BlogCounterBuffer:
+    """
+    Write-behind buffer for blog view and like increments.
+
+    Increments land in one of ``shards`` dicts picked by thread, each with
+    its own lock, so concurrent requests for the same popular post do not
+    queue on one lock, let alone on its row in the database. A background
+    thread drains the shards every ``flush_seconds`` and applies the
+    summed deltas in batched UPDATEs. If a flush fails the deltas go back
+    into the buffer for the next one, so increments are applied at least
+    once; a crash loses at most the last interval.
+    """
+
+    def __init__(
+        self, shards=BLOG_COUNTER_SHARDS, flush_seconds=BLOG_COUNTER_FLUSH_SECONDS
+    ):
+        self.flush_seconds = flush_seconds
+        self._shards = [({}, threading.Lock()) for _ in range(max(shards, 1))]
+        # Threads take shards round robin; thread idents are aligned
+        # addresses and would all map to the same one
+        self._next_shard = itertools.count()
+        self._local = threading.local()
+        self._flush_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._app = None
+
+    def _shard(self):
+        index = getattr(self._local, "shard", None)
+        if index is None:
+            index = self._local.shard = next(self._next_shard) % len(self._shards)
+        return self._shards[index]
+
+    def add(self, blog_id, counter, amount=1):
+        """Record ``amount`` more ``counter`` ("views" or "likes") for a blog."""
+        position = COUNTERS.index(counter)
+        deltas, lock = self._shard()
+        with lock:
+            pending = deltas.setdefault(blog_id, [0, 0])
+            pending[position] += amount
+
+    def pending(self, blog_id):
+        """{"views": n, "likes": n} not yet written for a blog."""
+        totals = [0, 0]
+        for deltas, lock in self._shards:
+            with lock:
+                for position, amount in enumerate(deltas.get(blog_id, ())):
+                    totals[position] += amount
+        return dict(zip(COUNTERS, totals))
+
+    def overlay(self, blog_dict):
+        """Add pending increments to the counters of a serialized blog."""
+        for counter, amount in self.pending(blog_dict["id"]).items():
+            blog_dict[counter] = (blog_dict.get(counter) or 0) + amount
+        return blog_dict
+
+    def drain(self):
+        """Remove and return every pending increment, summed per blog."""
+        merged = {}
+        for deltas, lock in self._shards:
+            with lock:
+                drained = list(deltas.items())
+                deltas.clear()
+            for blog_id, (views, likes) in drained:
+                pending = merged.setdefault(blog_id, [0, 0])
+                pending[0] += views
+                pending[1] += likes
+        return merged
+
+    def flush(self):
+        """Write pending increments to the database; return the blogs updated."""
+        with self._flush_lock:
+            deltas = self.drain()
+            if not deltas:
+                return 0
+            try:
+                apply_counter_deltas(deltas)
+            except Exception:
+                db.session.rollback()
+                for blog_id, amounts in deltas.items():
+                    for counter, amount in zip(COUNTERS, amounts):
+                        if amount:
+                            self.add(blog_id, counter, amount)
+                raise
+            for listener in counter_flush_listeners:
+                listener(deltas)
+            return len(deltas)
+
+    def start(self, app):
+        """Start the flusher thread for ``app`` if it is not already running."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            if self._thread is None:
+                atexit.register(self._flush_at_exit)
+            self._app = app
+            self._thread = threading.Thread(
+                target=self._run, name="blog-counters", daemon=True
+            )
+            self._thread.start()
+
+    def ensure_started(self):
+        """Start the thread for the current app unless disabled or testing."""
+        app = current_app._get_current_object()
+        if BLOG_COUNTER_WORKER_ENABLED and not app.testing:
+            self.start(app)
+
+    def _flush_at_exit(self):
+        with self._app.app_context():
+            try:
+                self.flush()
+            finally:
+                db.session.remove()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            with self._app.app_context():
+                try:
+                    self.flush()
+                except Exception:
+                    current_app.logger.exception("Error flushing blog counters")
+                finally:
+                    db.session.remove()
+
+
+# Global instance
+blog_counter_buffer = BlogCounterBuffer()
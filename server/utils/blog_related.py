@@ -0,0 +1,420 @@
+import heapq
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from operator import itemgetter
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import db
+from models.blog import Blog, BlogStatus
+from models.blog_related import BlogRelated, BlogRelatedPending
+from models.cache_version import CacheVersion
+from utils.blog_text import plain_text
+from utils.master_data import bump_version
+
+# Related posts stored per blog
+RELATED_SIZE = 10
+# Highest-weighted terms kept in each post's vector
+MAX_TERMS = 48
+# Terms in a larger share of posts than this say little about any of them
+# and are left out of the vectors (once the blog has a few hundred posts)
+MAX_DOCUMENT_SHARE = 0.2
+# Term counts are multiplied by these before weighting
+FIELD_WEIGHTS = {"title": 3, "excerpt": 2, "content": 1}
+# cache_versions row bumped by every write to blog_related
+RELATED_VERSION = "blog_related"
+RELATED_POLL_SECONDS = float(os.getenv("FLASK_RELATED_BLOGS_POLL_SECONDS", "60"))
+RELATED_WORKER_ENABLED = os.getenv("FLASK_RELATED_BLOGS_WORKER", "true").lower() in (
+    "1",
+    "true",
+)
+
+_WORD = re.compile(r"[a-z][a-z0-9]{2,}")
+STOP_WORDS = frozenset(
+    """
+    about after again also and any are because been before being between both
+    but can could did does doing down during each few for from further had has
+    have having her here hers him his how into its just more most not now off
+    once only other our ours out over own same she should some such than that
+    the their theirs them then there these they this those through too under
+    until very was were what when where which while who whom why will with
+    would you your yours
+    """.split()
+)
+
+
+def document_terms(title, excerpt, content):
+    """Weighted term counts of one post."""
+    counts = Counter()
+    for field, text in (
+        ("title", title),
+        ("excerpt", excerpt),
+        ("content", plain_text(content)),
+    ):
+        weight = FIELD_WEIGHTS[field]
+        for word in _WORD.findall((text or "").lower()):
+            if word not in STOP_WORDS:
+                counts[word] += weight
+    return counts
+
+
+class RelatedIndex:
+    """
+    Sparse TF-IDF vectors of the published posts and an inverted index
+    from term to the posts that weight it.
+
+    Each vector holds the MAX_TERMS heaviest terms of a post, weighted
+    (1 + log tf) * idf and scaled to unit length, so a dot product is the
+    cosine similarity. Neighbours of a post are scored by walking the
+    postings of its terms only, never the whole corpus; terms common to
+    more than MAX_DOCUMENT_SHARE of the posts are dropped, which keeps
+    every posting list short.
+    """
+
+    def __init__(self, size=RELATED_SIZE):
+        self.size = size
+        self.counts = {}  # blog_id -> Counter of weighted term counts
+        self.document_frequency = Counter()
+        self.vectors = {}  # blog_id -> {term: weight}
+        self.postings = defaultdict(dict)  # term -> {blog_id: weight}
+        self.related = {}  # blog_id -> [(blog_id, score)], most similar first
+
+    def _vector(self, counts):
+        total = len(self.counts) + 1
+        common = max(total * MAX_DOCUMENT_SHARE, 50)
+        weights = {
+            term: (1 + math.log(count))
+            * math.log(total / (1 + self.document_frequency[term]))
+            for term, count in counts.items()
+            if self.document_frequency[term] <= common
+        }
+        top = heapq.nlargest(MAX_TERMS, weights.items(), key=itemgetter(1))
+        norm = math.sqrt(sum(weight * weight for _, weight in top))
+        if not norm:
+            return {}
+        return {term: weight / norm for term, weight in top if weight > 0}
+
+    def _index(self, blog_id):
+        vector = self._vector(self.counts[blog_id])
+        self.vectors[blog_id] = vector
+        for term, weight in vector.items():
+            self.postings[term][blog_id] = weight
+
+    def _unindex(self, blog_id):
+        for term in self.vectors.pop(blog_id, {}):
+            self.postings[term].pop(blog_id, None)
+            if not self.postings[term]:
+                del self.postings[term]
+
+    def build(self, documents):
+        """Index {blog_id: term counts}, replacing anything indexed before."""
+        self.counts = dict(documents)
+        self.document_frequency = Counter()
+        for counts in self.counts.values():
+            self.document_frequency.update(counts.keys())
+        self.vectors = {}
+        self.postings = defaultdict(dict)
+        for blog_id in self.counts:
+            self._index(blog_id)
+        self.related = {blog_id: [] for blog_id in self.counts}
+
+    def rank_all(self):
+        """Compute every post's neighbours; return {blog_id: [(id, score)]}."""
+        self.related = {blog_id: self.neighbours(blog_id) for blog_id in self.counts}
+        return self.related
+
+    def similarities(self, blog_id):
+        """{other blog_id: cosine similarity} for posts sharing a term."""
+        scores = defaultdict(float)
+        for term, weight in self.vectors.get(blog_id, {}).items():
+            for other, other_weight in self.postings[term].items():
+                scores[other] += weight * other_weight
+        scores.pop(blog_id, None)
+        return scores
+
+    def neighbours(self, blog_id, scores=None):
+        """[(blog_id, score)] of the ``size`` most similar posts."""
+        if scores is None:
+            scores = self.similarities(blog_id)
+        return heapq.nlargest(self.size, scores.items(), key=itemgetter(1))
+
+    def upsert(self, blog_id, counts):
+        """
+        (Re)index one post and return {blog_id: [(id, score)]} for the
+        neighbour lists that changed: the post's own and those of posts
+        it enters, leaves or moves in.
+
+        Other posts keep their vectors; IDF drift from the edit is left to
+        the next full rebuild.
+        """
+        changed = self.remove(blog_id)
+        self.counts[blog_id] = counts
+        self.document_frequency.update(counts.keys())
+        self._index(blog_id)
+
+        scores = self.similarities(blog_id)
+        self.related[blog_id] = changed[blog_id] = self.neighbours(blog_id, scores)
+        for other, score in scores.items():
+            current = self.related.get(other, [])
+            entries = [entry for entry in current if entry[0] != blog_id]
+            entries.append((blog_id, score))
+            entries = heapq.nlargest(self.size, entries, key=itemgetter(1))
+            if entries != current:
+                self.related[other] = changed[other] = entries
+        return changed
+
+    def remove(self, blog_id):
+        """
+        Drop a post from the index; the lists that held it are recomputed
+        without it. Return {blog_id: [(id, score)]} for the lists that changed.
+        """
+        counts = self.counts.pop(blog_id, None)
+        if counts is not None:
+            self.document_frequency.subtract(counts.keys())
+        self._unindex(blog_id)
+
+        changed = {}
+        if self.related.pop(blog_id, None) is not None:
+            changed[blog_id] = []
+        for other, current in self.related.items():
+            if any(entry[0] == blog_id for entry in current):
+                changed[other] = self.neighbours(other)
+        self.related.update(changed)
+        self.related.pop(blog_id, None)
+        return changed
+
+
+def published_documents():
+    """{blog_id: term counts} of every published post."""
+    rows = db.session.query(Blog.id, Blog.title, Blog.excerpt, Blog.content).filter(
+        Blog.status == BlogStatus.PUBLISHED
+    )
+    return {
+        blog_id: document_terms(title, excerpt, content)
+        for blog_id, title, excerpt, content in rows
+    }
+
+
+def store_related(lists):
+    """Replace the stored neighbours of the blogs in {blog_id: [(id, score)]}."""
+    if lists:
+        db.session.query(BlogRelated).filter(BlogRelated.blog_id.in_(lists)).delete(
+            synchronize_session=False
+        )
+        rows = [
+            {"blog_id": blog_id, "related_id": related_id, "score": score}
+            for blog_id, entries in lists.items()
+            for related_id, score in entries
+        ]
+        if rows:
+            db.session.execute(BlogRelated.__table__.insert(), rows)
+
+
+def claim_version():
+    """
+    Bump the blog_related version and return the new value.
+
+    The upsert holds the row lock until commit, so writers of blog_related
+    in different workers take turns, and each sees every earlier write.
+    """
+    bump_version(db.session.connection(), RELATED_VERSION)
+    return db.session.execute(
+        select(CacheVersion.value).where(CacheVersion.name == RELATED_VERSION)
+    ).scalar_one()
+
+
+def queue_related_refresh(blog_id):
+    """
+    Mark a created, edited or deleted blog for a related-posts refresh and
+    wake the refresher. Cheap enough for a request thread: the refresh
+    itself runs in the background. Failures are logged, not raised: the
+    blog itself is already saved and the next rebuild catches up.
+    """
+    table = BlogRelatedPending.__table__
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    try:
+        connection = db.session.connection()
+        insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+        stmt = insert(table).values(blog_id=blog_id, queued_at=now)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.blog_id], set_={"queued_at": now}
+        )
+        connection.execute(stmt)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception("Error queueing related blogs refresh")
+        return
+    related_refresher.notify()
+
+
+_lock = threading.Lock()
+_index = None
+# blog_related version the in-memory index matches
+_index_version = None
+
+
+def _load_index():
+    index = RelatedIndex()
+    index.build(published_documents())
+    for row in BlogRelated.query.order_by(
+        BlogRelated.blog_id, BlogRelated.score.desc()
+    ):
+        if row.blog_id in index.related:
+            index.related[row.blog_id].append((row.related_id, row.score))
+    return index
+
+
+def rebuild_related_blogs():
+    """Recompute the related posts of every published blog; return the count."""
+    global _index, _index_version
+    with _lock:
+        try:
+            version = claim_version()
+            index = RelatedIndex()
+            index.build(published_documents())
+            lists = index.rank_all()
+            db.session.query(BlogRelated).delete(synchronize_session=False)
+            db.session.query(BlogRelatedPending).delete(synchronize_session=False)
+            store_related(lists)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        _index, _index_version = index, version
+        return len(lists)
+
+
+def _refresh(index, blog_id):
+    blog = (
+        db.session.query(Blog.title, Blog.excerpt, Blog.content, Blog.status)
+        .filter(Blog.id == blog_id)
+        .first()
+    )
+    if blog is None or blog.status != BlogStatus.PUBLISHED:
+        changed = index.remove(blog_id)
+        changed.setdefault(blog_id, [])
+        db.session.query(BlogRelated).filter(BlogRelated.related_id == blog_id).delete(
+            synchronize_session=False
+        )
+    else:
+        counts = document_terms(blog.title, blog.excerpt, blog.content)
+        changed = index.upsert(blog_id, counts)
+    store_related(changed)
+
+
+def refresh_pending_related_blogs():
+    """
+    Update the related posts of every queued blog; return how many.
+
+    blog_related is the source of truth: when another worker wrote it
+    since this worker's index was built, the index is reloaded from the
+    database before any list is rescored. Only the lists that change are
+    written.
+    """
+    global _index, _index_version
+    with _lock:
+        try:
+            version = claim_version()
+            pending = db.session.query(
+                BlogRelatedPending.blog_id, BlogRelatedPending.queued_at
+            ).all()
+            if not pending:
+                db.session.rollback()
+                return 0
+            if _index is None or _index_version != version - 1:
+                _index = _load_index()
+            for blog_id, _ in pending:
+                _refresh(_index, blog_id)
+            for blog_id, queued_at in pending:
+                # Blogs queued again meanwhile stay for the next round
+                db.session.query(BlogRelatedPending).filter_by(
+                    blog_id=blog_id, queued_at=queued_at
+                ).delete(synchronize_session=False)
+            db.session.commit()
+            _index_version = version
+            return len(pending)
+        except Exception:
+            db.session.rollback()
+            _index = None  # may be ahead of the database now
+            raise
+
+
+def reset_related_index():
+    """Forget the in-memory index; the next refresh reloads it."""
+    global _index, _index_version
+    with _lock:
+        _index = _index_version = None
+
+
+class RelatedBlogsRefresher:
+    """
+    Background thread that applies queued related-post refreshes.
+
+    ``queue_related_refresh`` calls ``notify()``, which starts the thread
+    on first use. It also polls on an interval so blogs queued before a
+    restart are picked up; ``flask refresh-related-blogs`` does the same
+    from cron when the thread is disabled.
+    """
+
+    def __init__(self, poll_seconds=RELATED_POLL_SECONDS):
+        self.poll_seconds = poll_seconds
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._app = None
+
+    def start(self, app):
+        """Start the refresher thread for ``app`` if it is not already running."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._app = app
+            self._thread = threading.Thread(
+                target=self._run, name="related-blogs", daemon=True
+            )
+            self._thread.start()
+
+    def notify(self):
+        """Wake the refresher, starting it for the current app if needed."""
+        app = current_app._get_current_object()
+        if RELATED_WORKER_ENABLED and not app.testing:
+            self.start(app)
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.poll_seconds)
+            self._wakeup.clear()
+            with self._app.app_context():
+                try:
+                    refresh_pending_related_blogs()
+                except Exception:
+                    current_app.logger.exception("Error refreshing related blogs")
+                finally:
+                    db.session.remove()
+
+
+# Global instance
+related_refresher = RelatedBlogsRefresher()
+
+
+def related_blogs(blog_id, limit, options=()):
+    """
+    [(Blog, similarity)] of up to ``limit`` related blogs, most similar
+    first. ``options`` are loader options for the Blog query.
+    """
+    return (
+        db.session.query(Blog, BlogRelated.score)
+        .join(BlogRelated, BlogRelated.related_id == Blog.id)
+        .filter(BlogRelated.blog_id == blog_id, Blog.status == BlogStatus.PUBLISHED)
+        .options(*options)
+        .order_by(BlogRelated.score.desc(), Blog.id)
+        .limit(limit)
+        .all()
+    )
@@ -0,0 +1,137 @@
+import re
+from sqlalchemy import DDL, Float, cast, event, func, literal_column, table, column
+from models import db
+from models.blog import SERVER_HOST, Blog, BlogStatus, api_endpoint
+
+# Text search configuration used for the PostgreSQL index and queries
+SEARCH_LANGUAGE = "english"
+
+SNIPPET_START, SNIPPET_END = "<mark>", "</mark>"
+
+# PostgreSQL keeps a weighted tsvector as a generated column on blogs,
+# so every INSERT/UPDATE refreshes it without application code.
+PG_INDEX_DDL = (
+    "ALTER TABLE blogs ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    f"setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce(excerpt, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce(content, '')), 'C')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_blogs_search_vector "
+    "ON blogs USING gin (search_vector)",
+)
+
+# SQLite keeps an FTS5 index over the blogs rows, synced by triggers
+SQLITE_INDEX_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS blog_search USING fts5("
+    "title, excerpt, content, content='blogs', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS blog_search_insert AFTER INSERT ON blogs BEGIN "
+    "INSERT INTO blog_search (rowid, title, excerpt, content) "
+    "VALUES (new.id, new.title, new.excerpt, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS blog_search_delete AFTER DELETE ON blogs BEGIN "
+    "INSERT INTO blog_search (blog_search, rowid, title, excerpt, content) "
+    "VALUES ('delete', old.id, old.title, old.excerpt, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS blog_search_update AFTER UPDATE ON blogs BEGIN "
+    "INSERT INTO blog_search (blog_search, rowid, title, excerpt, content) "
+    "VALUES ('delete', old.id, old.title, old.excerpt, old.content); "
+    "INSERT INTO blog_search (rowid, title, excerpt, content) "
+    "VALUES (new.id, new.title, new.excerpt, new.content); END",
+)
+
+for statement in PG_INDEX_DDL:
+    event.listen(
+        Blog.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
+for statement in SQLITE_INDEX_DDL:
+    event.listen(
+        Blog.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Blog.__table__,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS blog_search").execute_if(dialect="sqlite"),
+)
+
+fts = table("blog_search", column("rowid"))
+
+# Blog fields returned with each search hit; content is left out
+SUMMARY_COLUMNS = (
+    Blog.id,
+    Blog.title,
+    Blog.excerpt,
+    Blog.preview,
+    Blog.category,
+    Blog.author_name,
+    Blog.reading_duration,
+    Blog.type,
+    Blog.date_created,
+)
+
+
+def search_terms(q):
+    """Words of a free-text query, stripped of search syntax."""
+    return re.findall(r"\w+", q or "")
+
+
+def blog_search_query(q):
+    """
+    Column query of published blogs matching every word of ``q``, with a
+    ``rank`` column (higher is better) and a highlighted ``snippet`` of the
+    content. Returns (query, rank); query is None if ``q`` has no words.
+
+    PostgreSQL reads the GIN-indexed ``search_vector``; other databases
+    the ``blog_search`` FTS5 table. Title matches outrank excerpt matches,
+    which outrank content matches.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return None, None
+
+    if db.engine.dialect.name == "postgresql":
+        tsquery = func.websearch_to_tsquery(SEARCH_LANGUAGE, " ".join(terms))
+        search_vector = literal_column("blogs.search_vector")
+        rank = cast(func.ts_rank_cd(search_vector, tsquery), Float).label("rank")
+        snippet = func.ts_headline(
+            SEARCH_LANGUAGE,
+            Blog.content,
+            tsquery,
+            f"StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, "
+            "MaxWords=24, MinWords=12",
+        ).label("snippet")
+        query = db.session.query(*SUMMARY_COLUMNS, rank, snippet).filter(
+            search_vector.op("@@")(tsquery)
+        )
+    else:
+        match = " ".join(f'"{term}"' for term in terms)
+        rank = (-func.bm25(literal_column("blog_search"), 10.0, 4.0, 1.0)).label("rank")
+        snippet = func.snippet(
+            literal_column("blog_search"), 2, SNIPPET_START, SNIPPET_END, "...", 24
+        ).label("snippet")
+        query = (
+            db.session.query(*SUMMARY_COLUMNS, rank, snippet)
+            .select_from(fts)
+            .join(Blog, Blog.id == fts.c.rowid)
+            .filter(literal_column("blog_search").op("MATCH")(match))
+        )
+
+    return query.filter(Blog.status == BlogStatus.PUBLISHED), rank
+
+
+def search_hit(row):
+    """JSON form of one row of ``blog_search_query``."""
+    return {
+        "id": row.id,
+        "title": row.title,
+        "excerpt": row.excerpt,
+        "preview": row.preview,
+        "category": row.category,
+        "author_name": row.author_name,
+        "reading_duration": row.reading_duration,
+        "type": row.type.value if row.type else None,
+        "date_created": row.date_created.isoformat() if row.date_created else None,
+        "image": f"{SERVER_HOST}{api_endpoint}/blogs/image/{row.id}",
+        "rank": row.rank,
+        "snippet": row.snippet,
+    }
@@ -0,0 +1,49 @@
+import html
+import json
+import re
+
+# Characters of plain text kept in Blog.preview before the ellipsis
+PREVIEW_LENGTH = 100
+
+_TAG = re.compile(r"<[^>]+>")
+_MARKDOWN = re.compile(r"(^|\s)#{1,6}\s|[*_`~>]+|!?\[([^\]]*)\]\([^)]*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def _slate_text(nodes):
+    """Text of a Slate editor document, one block per line."""
+    blocks = []
+    for node in nodes:
+        if not isinstance(node, dict):
+            continue
+        if "text" in node:
+            blocks.append(str(node["text"]))
+        else:
+            blocks.append(_slate_text(node.get("children") or []))
+    return "\n".join(blocks)
+
+
+def plain_text(content):
+    """
+    Readable text of blog ``content``. The admin editor saves Slate JSON;
+    HTML tags and markdown markers are stripped from anything else.
+    """
+    content = content or ""
+    try:
+        nodes = json.loads(content)
+    except ValueError:
+        nodes = None
+    if isinstance(nodes, list):
+        text = _slate_text(nodes)
+    else:
+        text = html.unescape(_TAG.sub(" ", content))
+        text = _MARKDOWN.sub(lambda m: (m.group(1) or "") + (m.group(2) or ""), text)
+    return _SPACE.sub(" ", text).strip()
+
+
+def blog_preview(content):
+    """The first PREVIEW_LENGTH characters of the text, "..." if cut."""
+    text = plain_text(content)
+    if len(text) > PREVIEW_LENGTH:
+        return text[:PREVIEW_LENGTH] + "..."
+    return text
@@ -0,0 +1,160 @@
+import heapq
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func
+from models import db
+from models.blog import Blog, BlogStatus
+from utils.blog_counters import counter_flush_listeners
+from utils.recurrence import as_utc
+
+# Engagement halves in value every TRENDING_HALF_LIFE_HOURS
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("FLASK_TRENDING_HALF_LIFE_HOURS", "48"))
+# Only posts published within the window can trend
+TRENDING_WINDOW_DAYS = float(os.getenv("FLASK_TRENDING_WINDOW_DAYS", "7"))
+# How often the ranking is rebuilt from the database
+TRENDING_REFRESH_SECONDS = float(os.getenv("FLASK_TRENDING_REFRESH_SECONDS", "300"))
+# Longest list GET /blogs/trending serves
+TRENDING_SIZE = 20
+# Counter growth, as a fraction, that re-ranks a post between rebuilds
+TRENDING_MIN_CHANGE = 0.1
+
+VIEW_WEIGHT, LIKE_WEIGHT, COMMENT_WEIGHT = 1, 3, 5
+
+
+def trending_key(engagement, created_at):
+    """
+    Sort key equivalent to engagement * 2 ** (-age / half-life).
+
+    Taking log2 turns the decay into a term that depends on the creation
+    time only, so keys never need recomputing as time passes; a post's
+    key changes only when its engagement does. Posts without engagement
+    score 0 at any age and sort last.
+    """
+    if engagement <= 0:
+        return -math.inf
+    hours = as_utc(created_at).timestamp() / 3600
+    return math.log2(engagement) + hours / TRENDING_HALF_LIFE_HOURS
+
+
+def decayed_score(engagement, created_at, now):
+    """Engagement discounted by the post's age at ``now``."""
+    age_hours = (now - as_utc(created_at)).total_seconds() / 3600
+    return engagement * 2 ** (-max(age_hours, 0) / TRENDING_HALF_LIFE_HOURS)
+
+
+class TrendingRanking:
+    """
+    In-memory top-``size`` of recent published blogs by decayed engagement.
+
+    ``rebuild`` scores every post in the window with one query and keeps
+    the best ``size``. Between rebuilds, counter flushes re-rank the posts
+    whose engagement grew by TRENDING_MIN_CHANGE or more; since keys only
+    grow, the top list stays exact for the counts it has seen. Serving the
+    list is a copy of at most ``size`` entries.
+    """
+
+    def __init__(self, size=TRENDING_SIZE, refresh_seconds=TRENDING_REFRESH_SECONDS):
+        self.size = size
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._built_at = None
+        self._posts = {}  # blog_id -> [engagement, ranked engagement, created_at]
+        self._top = []  # [(key, blog_id)], best first
+
+    def rebuild(self, now=None):
+        """Rescore every post in the window; return how many were scored."""
+        now = now or datetime.now(timezone.utc)
+        rows = (
+            db.session.query(
+                Blog.id,
+                Blog.date_created,
+                (
+                    func.coalesce(Blog.views, 0) * VIEW_WEIGHT
+                    + func.coalesce(Blog.likes, 0) * LIKE_WEIGHT
+                    + Blog.comment_count * COMMENT_WEIGHT
+                ).label("engagement"),
+            )
+            .filter(
+                Blog.status == BlogStatus.PUBLISHED,
+                Blog.date_created >= now - timedelta(days=TRENDING_WINDOW_DAYS),
+            )
+            .all()
+        )
+        posts = {
+            blog_id: [engagement, engagement, created_at]
+            for blog_id, created_at, engagement in rows
+        }
+        top = heapq.nlargest(
+            self.size,
+            (
+                (trending_key(engagement, created_at), blog_id)
+                for blog_id, (engagement, _, created_at) in posts.items()
+            ),
+        )
+        with self._lock:
+            self._posts = posts
+            self._top = top
+            self._built_at = time.monotonic()
+        return len(posts)
+
+    def _stale(self):
+        built_at = self._built_at
+        return built_at is None or time.monotonic() - built_at >= self.refresh_seconds
+
+    def ensure_fresh(self):
+        """
+        Rebuild if the ranking is older than ``refresh_seconds``. Requests
+        arriving during a rebuild wait for it instead of starting their own.
+        """
+        if self._stale():
+            with self._rebuild_lock:
+                if self._stale():
+                    self.rebuild()
+
+    def apply_counts(self, deltas):
+        """Fold flushed {blog_id: [views, likes]} increments into the ranking."""
+        with self._lock:
+            for blog_id, (views, likes) in deltas.items():
+                post = self._posts.get(blog_id)
+                if post is None:
+                    continue
+                post[0] += views * VIEW_WEIGHT + likes * LIKE_WEIGHT
+                if post[0] < post[1] * (1 + TRENDING_MIN_CHANGE):
+                    continue
+                post[1] = post[0]
+                entries = [entry for entry in self._top if entry[1] != blog_id]
+                entries.append((trending_key(post[1], post[2]), blog_id))
+                entries.sort(reverse=True)
+                size = self.size
+                self._top = entries[:size]
+
+    def top(self, limit, now=None):
+        """[(blog_id, decayed score)] of the best ``limit`` posts in the window."""
+        now = now or datetime.now(timezone.utc)
+        since = now - timedelta(days=TRENDING_WINDOW_DAYS)
+        ranked = []
+        with self._lock:
+            for _, blog_id in self._top:
+                engagement, _, created_at = self._posts[blog_id]
+                if as_utc(created_at) < since:
+                    continue
+                ranked.append((blog_id, decayed_score(engagement, created_at, now)))
+        # Increments below TRENDING_MIN_CHANGE leave keys as they were, so
+        # order the few entries by the scores actually reported
+        ranked.sort(key=lambda entry: entry[1], reverse=True)
+        return ranked[:limit]
+
+    def clear(self):
+        with self._lock:
+            self._posts = {}
+            self._top = []
+            self._built_at = None
+
+
+# Global instance
+trending_ranking = TrendingRanking()
+counter_flush_listeners.append(trending_ranking.apply_counts)
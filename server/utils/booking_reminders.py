@@ -0,0 +1,231 @@
+import heapq
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy import update
+from sqlalchemy.orm import joinedload
+from models import db
+from models.booking import Booking
+from utils.availability import active_bookings, as_utc, booking_change_listeners
+from utils.mail_templates import send_booking_reminder_emails
+
+REMINDER_LEAD_HOURS = float(os.getenv("FLASK_BOOKING_REMINDER_LEAD_HOURS", "24"))
+REMINDER_BATCH_SIZE = int(os.getenv("FLASK_BOOKING_REMINDER_BATCH_SIZE", "100"))
+REMINDER_REFILL_SECONDS = float(
+    os.getenv("FLASK_BOOKING_REMINDER_REFILL_SECONDS", "300")
+)
+REMINDER_WORKER_ENABLED = os.getenv(
+    "FLASK_BOOKING_REMINDER_WORKER", "true"
+).lower() in ("1", "true")
+
+# Reminder emails show times in Kenyan local time
+EAT = timezone(timedelta(hours=3))
+
+
+def claim_reminders(booking_ids, now, lead):
+    """
+    Mark the given bookings reminded and return the ids this call claimed.
+
+    A conditional UPDATE ... WHERE reminder_sent_at IS NULL takes each
+    booking at most once, whichever worker gets there first. Bookings that
+    were cancelled, moved out of the reminder window or already reminded
+    for their current time are left alone.
+    """
+    stmt = (
+        update(Booking)
+        .where(
+            active_bookings().whereclause,
+            Booking.id.in_(booking_ids),
+            Booking.reminder_sent_at.is_(None),
+            Booking.start_time > now,
+            Booking.start_time <= now + lead,
+        )
+        .values(reminder_sent_at=now)
+        .returning(Booking.id)
+        .execution_options(synchronize_session=False)
+    )
+    return db.session.execute(stmt).scalars().all()
+
+
+def send_booking_reminders(booking_ids, now, lead):
+    """
+    Send reminders for the given due bookings and return how many were sent.
+
+    The claim is committed before the emails go out, so a crash or a second
+    worker never sends the same reminder twice.
+    """
+    claimed = claim_reminders(booking_ids, now, lead)
+    if not claimed:
+        db.session.commit()
+        return 0
+
+    bookings = (
+        Booking.query.options(joinedload(Booking.client), joinedload(Booking.service))
+        .filter(Booking.id.in_(claimed))
+        .order_by(Booking.start_time.asc(), Booking.id.asc())
+        .all()
+    )
+    reminders = [
+        (
+            booking.client.email,
+            booking.client.full_name,
+            booking.service.title,
+            as_utc(booking.start_time).astimezone(EAT),
+        )
+        for booking in bookings
+        if booking.client and booking.service
+    ]
+    db.session.commit()
+
+    return send_booking_reminder_emails(reminders)
+
+
+class BookingReminderScheduler:
+    """
+    Min-heap of upcoming reminder times.
+
+    The heap holds reminders due within the next two refill intervals and is
+    rebuilt every ``refill_seconds`` with one range query on
+    ``bookings(start_time, status)``. In between, committed booking writes
+    are pushed as they happen; entries for bookings that were moved or
+    cancelled are left in place and skipped when they reach the top.
+
+    Reminders go out ``lead_hours`` before a booking starts, or at once for
+    bookings made or moved closer to their start than that.
+    """
+
+    def __init__(
+        self,
+        lead_hours=REMINDER_LEAD_HOURS,
+        batch_size=REMINDER_BATCH_SIZE,
+        refill_seconds=REMINDER_REFILL_SECONDS,
+    ):
+        self.lead = timedelta(hours=lead_hours)
+        self.batch_size = batch_size
+        self.refill_seconds = refill_seconds
+        self._heap = []  # (remind_at, booking_id)
+        self._remind_at = {}  # booking_id -> remind_at of its live heap entry
+        self._loaded_until = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._app = None
+
+    def refill(self, now=None):
+        """Reload the heap from the database; return the number of entries."""
+        now = now or datetime.now(timezone.utc)
+        loaded_until = now + timedelta(seconds=2 * self.refill_seconds)
+        rows = (
+            active_bookings()
+            .filter(
+                Booking.reminder_sent_at.is_(None),
+                Booking.start_time > now,
+                Booking.start_time <= loaded_until + self.lead,
+            )
+            .with_entities(Booking.id, Booking.start_time)
+            .all()
+        )
+        heap = [(as_utc(start) - self.lead, booking_id) for booking_id, start in rows]
+        heapq.heapify(heap)
+
+        with self._lock:
+            self._heap = heap
+            self._remind_at = {booking_id: at for at, booking_id in heap}
+            self._loaded_until = loaded_until
+        return len(heap)
+
+    def apply(self, changes):
+        """Apply committed booking changes {id: (service_id, start, end, active)}."""
+        with self._lock:
+            if self._loaded_until is None:
+                return
+            for booking_id, (_, start, _, active) in changes.items():
+                self._remind_at.pop(booking_id, None)
+                if not active or start is None:
+                    continue
+                remind_at = as_utc(start) - self.lead
+                if remind_at <= self._loaded_until:
+                    self._remind_at[booking_id] = remind_at
+                    heapq.heappush(self._heap, (remind_at, booking_id))
+        self._wakeup.set()
+
+    def _peek(self):
+        """Earliest live entry, discarding stale ones. Call with the lock held."""
+        while self._heap:
+            remind_at, booking_id = self._heap[0]
+            if self._remind_at.get(booking_id) == remind_at:
+                return remind_at, booking_id
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now):
+        """Remove and return up to ``batch_size`` booking ids due by ``now``."""
+        due = []
+        with self._lock:
+            while len(due) < self.batch_size:
+                entry = self._peek()
+                if entry is None or entry[0] > now:
+                    break
+                heapq.heappop(self._heap)
+                del self._remind_at[entry[1]]
+                due.append(entry[1])
+        return due
+
+    def seconds_until_next(self, now=None):
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            entry = self._peek()
+        if entry is None:
+            return self.refill_seconds
+        return min(self.refill_seconds, max(0.0, (entry[0] - now).total_seconds()))
+
+    def run_pending(self, now=None):
+        """Send every reminder that is due, in batches; return the number sent."""
+        now = now or datetime.now(timezone.utc)
+        if self._loaded_until is None or now >= self._loaded_until - timedelta(
+            seconds=self.refill_seconds
+        ):
+            self.refill(now)
+
+        sent = 0
+        while True:
+            due = self.pop_due(now)
+            if not due:
+                return sent
+            sent += send_booking_reminders(due, now, self.lead)
+
+    def start(self, app):
+        """Start the scheduler thread for ``app`` if it is not already running."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._app = app
+            self._thread = threading.Thread(
+                target=self._run, name="booking-reminders", daemon=True
+            )
+            self._thread.start()
+
+    def ensure_started(self):
+        """Start the thread for the current app unless disabled or testing."""
+        app = current_app._get_current_object()
+        if REMINDER_WORKER_ENABLED and not app.testing:
+            self.start(app)
+
+    def _run(self):
+        while True:
+            with self._app.app_context():
+                try:
+                    self.run_pending()
+                except Exception:
+                    db.session.rollback()
+                    current_app.logger.exception("Error sending booking reminders")
+                finally:
+                    db.session.remove()
+            self._wakeup.wait(self.seconds_until_next())
+            self._wakeup.clear()
+
+
+# Global instance
+booking_reminder_scheduler = BookingReminderScheduler()
+booking_change_listeners.append(booking_reminder_scheduler.apply)
@@ -0,0 +1,214 @@
+import heapq
+from collections import namedtuple
+from datetime import timedelta
+from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
+from models.booking import Booking, BookingStatus
+from models.booking_series import BookingSeries
+from utils.recurrence import as_utc, iter_occurrences, last_occurrence, parse_rrule
+
+Occurrence = namedtuple(
+    "Occurrence",
+    "start_time end_time series_id occurrence_start booking_id status",
+)
+
+# Status of occurrences that have not been confirmed into a booking
+TENTATIVE = "tentative"
+
+
+def occurrence_to_dict(occurrence):
+    return {
+        "series_id": occurrence.series_id,
+        "occurrence_start": occurrence.occurrence_start.isoformat(),
+        "start_time": occurrence.start_time.isoformat(),
+        "end_time": occurrence.end_time.isoformat(),
+        "booking_id": occurrence.booking_id,
+        "status": occurrence.status,
+    }
+
+
+def refresh_series_bounds(series):
+    """Recompute ``last_start_time`` from the rule."""
+    last = last_occurrence(parse_rrule(series.rrule), as_utc(series.start_time))
+    series.last_start_time = last
+
+
+def active_series():
+    return BookingSeries.query.filter(BookingSeries.is_deleted.is_(False))
+
+
+def series_occurrences(series, window_start, window_end):
+    """
+    Yield the occurrences of ``series`` starting in [window_start, window_end)
+    in start order.
+
+    Rule occurrences are generated lazily; moved occurrences and confirmed
+    bookings, which are few, are merged in. Cancelled occurrences and
+    bookings are left out.
+    """
+    window_start = as_utc(window_start)
+    window_end = as_utc(window_end)
+    duration = timedelta(minutes=series.service.duration_minutes)
+
+    exceptions = {as_utc(e.occurrence_start): e for e in series.exceptions}
+    bookings = {}
+    # An unsaved series has no bookings; filtering on a None id would match
+    # every booking outside a series
+    if series.id is not None:
+        bookings = {
+            as_utc(booking.occurrence_start): booking
+            for booking in Booking.query.filter(
+                Booking.series_id == series.id, Booking.is_deleted.is_(False)
+            )
+        }
+
+    extras = []
+    for occurrence_start, booking in bookings.items():
+        start = as_utc(booking.start_time)
+        if booking.status != BookingStatus.cancelled and (
+            window_start <= start < window_end
+        ):
+            extras.append(
+                Occurrence(
+                    start,
+                    as_utc(booking.end_time),
+                    series.id,
+                    occurrence_start,
+                    booking.id,
+                    booking.status.value,
+                )
+            )
+    for occurrence_start, exception in exceptions.items():
+        if exception.is_cancelled or occurrence_start in bookings:
+            continue
+        start = as_utc(exception.start_time)
+        if window_start <= start < window_end:
+            extras.append(
+                Occurrence(
+                    start,
+                    start + duration,
+                    series.id,
+                    occurrence_start,
+                    None,
+                    TENTATIVE,
+                )
+            )
+    extras.sort()
+
+    def scheduled():
+        rule = parse_rrule(series.rrule)
+        for start in iter_occurrences(
+            rule, series.start_time, window_start, window_end
+        ):
+            if start not in exceptions and start not in bookings:
+                yield Occurrence(
+                    start, start + duration, series.id, start, None, TENTATIVE
+                )
+
+    return heapq.merge(scheduled(), extras)
+
+
+def find_occurrence(series, occurrence_start):
+    """The tentative occurrence that the rule places at ``occurrence_start``."""
+    occurrence_start = as_utc(occurrence_start)
+    exception = next(
+        (
+            e
+            for e in series.exceptions
+            if as_utc(e.occurrence_start) == occurrence_start
+        ),
+        None,
+    )
+    if exception is not None:
+        if exception.is_cancelled:
+            return None
+        start = as_utc(exception.start_time)
+        duration = timedelta(minutes=series.service.duration_minutes)
+        return Occurrence(
+            start, start + duration, series.id, occurrence_start, None, TENTATIVE
+        )
+
+    window_end = occurrence_start + timedelta(microseconds=1)
+    for occurrence in series_occurrences(series, occurrence_start, window_end):
+        if occurrence.occurrence_start == occurrence_start:
+            return occurrence
+    return None
+
+
+def find_series_conflict(service_id, client_id, start, end, ignore_series_id=None):
+    """
+    Id of a recurring series with a tentative occurrence overlapping
+    [start, end) for the same service or client, or None.
+
+    Only series whose first and last occurrences bracket the range are
+    expanded, and each only over the range itself.
+    """
+    start = as_utc(start)
+    end = as_utc(end)
+    candidates = (
+        active_series()
+        .options(joinedload(BookingSeries.service))
+        .filter(
+            or_(
+                BookingSeries.service_id == service_id,
+                BookingSeries.client_id == client_id,
+            ),
+            BookingSeries.start_time < end,
+        )
+    )
+    if ignore_series_id is not None:
+        candidates = candidates.filter(BookingSeries.id != ignore_series_id)
+
+    for series in candidates:
+        duration = timedelta(minutes=series.service.duration_minutes)
+        if (
+            series.last_start_time is not None
+            and as_utc(series.last_start_time) + duration <= start
+        ):
+            continue
+        for occurrence in series_occurrences(series, start - duration, end):
+            if occurrence.booking_id is None and occurrence.end_time > start:
+                return series.id
+    return None
+
+
+def tentative_occurrences(window_start, window_end, service_ids=(), client_ids=()):
+    """
+    Yield unconfirmed occurrences overlapping a window for any of the given
+    services or clients, loading the candidate series with one query.
+    """
+    window_start = as_utc(window_start)
+    window_end = as_utc(window_end)
+    series_list = (
+        active_series()
+        .options(joinedload(BookingSeries.service))
+        .filter(
+            or_(
+                BookingSeries.service_id.in_(list(service_ids)),
+                BookingSeries.client_id.in_(list(client_ids)),
+            ),
+            BookingSeries.start_time < window_end,
+        )
+    )
+    for series in series_list:
+        duration = timedelta(minutes=series.service.duration_minutes)
+        if (
+            series.last_start_time is not None
+            and as_utc(series.last_start_time) + duration <= window_start
+        ):
+            continue
+        for occurrence in series_occurrences(
+            series, window_start - duration, window_end
+        ):
+            if occurrence.booking_id is None and occurrence.end_time > window_start:
+                yield series, occurrence
+
+
+def tentative_intervals(service_id, window_start, window_end):
+    """(start, end) of unconfirmed occurrences of a service overlapping a window."""
+    return sorted(
+        (occurrence.start_time, occurrence.end_time)
+        for _, occurrence in tentative_occurrences(
+            window_start, window_end, service_ids=[service_id]
+        )
+    )
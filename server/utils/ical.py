@@ -0,0 +1,79 @@
+from datetime import timezone
+from utils.recurrence import as_utc
+
+PRODID = "-//EcoVibe Kenya//Bookings//EN"
+
+BOOKING_STATUS_MAP = {
+    "pending": "TENTATIVE",
+    "confirmed": "CONFIRMED",
+    "completed": "CONFIRMED",
+    "cancelled": "CANCELLED",
+}
+
+
+def escape_text(value):
+    """Escape a TEXT value (RFC 5545 section 3.3.11)."""
+    return (
+        str(value or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line):
+    """Fold a content line at 75 octets and terminate it with CRLF."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Never split a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_datetime(value):
+    return as_utc(value).astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def calendar_header(name):
+    yield fold_line("BEGIN:VCALENDAR")
+    yield fold_line("VERSION:2.0")
+    yield fold_line(f"PRODID:{PRODID}")
+    yield fold_line("CALSCALE:GREGORIAN")
+    yield fold_line("METHOD:PUBLISH")
+    yield fold_line(f"X-WR-CALNAME:{escape_text(name)}")
+
+
+def calendar_footer():
+    yield fold_line("END:VCALENDAR")
+
+
+def booking_event(
+    booking_id, start_time, end_time, status, changed_at, service_title, client_name
+):
+    """Lines of one VEVENT for a booking row."""
+    status = getattr(status, "value", status)
+    yield fold_line("BEGIN:VEVENT")
+    yield fold_line(f"UID:booking-{booking_id}@ecovibe.co.ke")
+    yield fold_line(f"DTSTAMP:{format_datetime(changed_at)}")
+    yield fold_line(f"DTSTART:{format_datetime(start_time)}")
+    yield fold_line(f"DTEND:{format_datetime(end_time)}")
+    yield fold_line(f"SUMMARY:{escape_text(service_title)}")
+    yield fold_line(
+        f"DESCRIPTION:{escape_text(f'Client: {client_name}')}"
+        if client_name
+        else "DESCRIPTION:"
+    )
+    yield fold_line(f"STATUS:{BOOKING_STATUS_MAP.get(status, 'CONFIRMED')}")
+    yield fold_line("END:VEVENT")
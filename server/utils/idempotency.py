@@ -0,0 +1,193 @@
+import hashlib
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from models import db
+from models.idempotency import IdempotencyKey
+from utils.responses import restful_response
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+# How long a completed response can be replayed
+IDEMPOTENCY_TTL_HOURS = float(os.getenv("FLASK_IDEMPOTENCY_TTL_HOURS", "24"))
+# Lease on an in-progress key; a crashed request frees its key after this
+IDEMPOTENCY_LOCK_SECONDS = float(os.getenv("FLASK_IDEMPOTENCY_LOCK_SECONDS", "60"))
+# How long a duplicate waits for the original request before giving up
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("FLASK_IDEMPOTENCY_WAIT_SECONDS", "10"))
+POLL_INTERVAL_SECONDS = 0.1
+
+
+def request_fingerprint():
+    """Hash of the method, path, query string and body of the request."""
+    digest = hashlib.sha256()
+    for part in (
+        request.method.encode(),
+        request.path.encode(),
+        request.query_string,
+        request.get_data(),
+    ):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def idempotency_scope():
+    """Keys are unique per caller and endpoint."""
+    try:
+        identity = get_jwt_identity()
+    except RuntimeError:
+        identity = None
+    return f"{identity or 'anonymous'}:{request.method} {request.path}"[:255]
+
+
+def _error(message, status_code):
+    return current_app.make_response(
+        restful_response("error", message=message, status_code=status_code)
+    )
+
+
+def _replay(record):
+    response = jsonify(record.response_body)
+    response.status_code = record.response_status
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+def claim_idempotency_key(key, scope, request_hash):
+    """
+    Claim ``key`` for the current request.
+
+    Returns (record id, None) when the caller should run the request, or
+    (None, response) with a replayed or error response. A duplicate of a
+    request that is still running polls until it completes, so concurrent
+    retries wait for the first attempt instead of executing again.
+    """
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        now = datetime.now(timezone.utc)
+        record = IdempotencyKey(
+            key=key,
+            scope=scope,
+            request_hash=request_hash,
+            status="in_progress",
+            expires_at=now + timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS),
+        )
+        try:
+            with db.session.begin_nested():
+                db.session.add(record)
+            db.session.commit()
+            return record.id, None
+        except IntegrityError:
+            pass
+
+        # Free keys whose replay window or in-progress lease has lapsed
+        expired = IdempotencyKey.query.filter(
+            IdempotencyKey.key == key,
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.expires_at < now,
+        ).delete(synchronize_session=False)
+        if expired:
+            db.session.commit()
+            continue
+
+        existing = (
+            IdempotencyKey.query.filter_by(key=key, scope=scope)
+            .populate_existing()
+            .first()
+        )
+        if existing is None:
+            continue
+        if existing.request_hash != request_hash:
+            return None, _error(
+                "Idempotency-Key was already used with a different request", 422
+            )
+        if existing.status == "completed":
+            return None, _replay(existing)
+        if time.monotonic() >= deadline:
+            return None, _error(
+                "A request with this Idempotency-Key is still in progress", 409
+            )
+
+        # End the read so the next poll sees the original request's commit
+        db.session.commit()
+        time.sleep(POLL_INTERVAL_SECONDS)
+
+
+def complete_idempotency_key(record_id, response):
+    """Store ``response`` for replay; server errors release the key instead."""
+    if response.status_code >= 500:
+        release_idempotency_key(record_id)
+        return
+
+    try:
+        record = db.session.get(IdempotencyKey, record_id)
+        if record:
+            record.status = "completed"
+            record.response_status = response.status_code
+            record.response_body = response.get_json(silent=True)
+            record.expires_at = datetime.now(timezone.utc) + timedelta(
+                hours=IDEMPOTENCY_TTL_HOURS
+            )
+            db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        current_app.logger.exception("Error storing idempotent response")
+
+
+def release_idempotency_key(record_id):
+    """Delete an in-progress key so the request can be retried."""
+    try:
+        IdempotencyKey.query.filter_by(id=record_id).delete()
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        current_app.logger.exception("Error releasing idempotency key")
+
+
+def sweep_idempotency_keys():
+    """Delete expired keys; return the number removed."""
+    removed = IdempotencyKey.query.filter(
+        IdempotencyKey.expires_at < datetime.now(timezone.utc)
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return removed
+
+
+def idempotent(view):
+    """
+    Make a POST handler safe to retry with an ``Idempotency-Key`` header.
+
+    The first request runs normally and its response is stored; retries
+    with the same key and body get the stored response back, and retries
+    with a different body are rejected with 422. Requests without the
+    header are unaffected. Apply below ``jwt_required`` so keys are scoped
+    to the caller.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view(*args, **kwargs)
+        if len(key) > 255:
+            return _error("Idempotency-Key must be at most 255 characters", 400)
+
+        record_id, response = claim_idempotency_key(
+            key, idempotency_scope(), request_fingerprint()
+        )
+        if response is not None:
+            return response
+
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+        except Exception:
+            release_idempotency_key(record_id)
+            raise
+
+        complete_idempotency_key(record_id, response)
+        return response
+
+    return wrapper
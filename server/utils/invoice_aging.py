@@ -0,0 +1,77 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy import case, func, update
+from models import db
+from models.invoice import Invoice, InvoiceStatus
+from models.master import MasterDataManager
+
+# (label, oldest days past due in the bucket); the last bucket is open ended
+AGING_BUCKETS = (("0-30", 30), ("31-60", 60), ("61-90", 90), ("90+", None))
+
+
+def late_fee_basis_points():
+    """SystemConfig.late_fee_percentage as an integer, e.g. 5.00% -> 500."""
+    percentage = MasterDataManager.get_system_config().late_fee_percentage
+    return int(Decimal(percentage or 0) * 100)
+
+
+def mark_overdue_invoices(today=None):
+    """
+    Move pending invoices past their due date to overdue and charge the
+    late fee, rounded up to a whole shilling, in one UPDATE on the
+    (status, due_date) index. Returns the number of invoices moved.
+    """
+    today = today or date.today()
+    basis_points = late_fee_basis_points()
+    result = db.session.execute(
+        update(Invoice)
+        .where(
+            Invoice.status == InvoiceStatus.pending,
+            Invoice.due_date < today,
+            Invoice.is_deleted.is_(False),
+        )
+        .values(
+            status=InvoiceStatus.overdue,
+            late_fee=(Invoice.amount * basis_points + 9999) // 10000,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def invoice_aging_summary(today=None, client_id=None):
+    """
+    Count and outstanding amount (including late fees) of unpaid invoices
+    past their due date, per aging bucket, from one grouped query.
+    """
+    today = today or date.today()
+    bucket = case(
+        *(
+            (Invoice.due_date >= today - timedelta(days=days), label)
+            for label, days in AGING_BUCKETS
+            if days is not None
+        ),
+        else_=AGING_BUCKETS[-1][0],
+    )
+    query = db.session.query(
+        bucket,
+        func.count(Invoice.id),
+        func.coalesce(func.sum(Invoice.amount + Invoice.late_fee), 0),
+    ).filter(
+        Invoice.status.in_([InvoiceStatus.pending, InvoiceStatus.overdue]),
+        Invoice.due_date < today,
+        Invoice.is_deleted.is_(False),
+    )
+    if client_id is not None:
+        query = query.filter(Invoice.client_id == client_id)
+
+    totals = {label: (count, amount) for label, count, amount in query.group_by(bucket)}
+    return [
+        {
+            "bucket": label,
+            "count": totals.get(label, (0, 0))[0],
+            "amount": int(totals.get(label, (0, 0))[1]),
+        }
+        for label, _ in AGING_BUCKETS
+    ]
@@ -131,3 +131,49 @@ def send_email(to_email: str, subject: str, body: str, is_html=False):
     except Exception as e:
         logger.error("Failed to send email: %s", e, exc_info=True)
         return False, str(e)
+
+
+def send_batch_email(messages):
+    """
+    Send up to 100 HTML emails in one Resend batch request.
+
+    ``messages`` is a list of (to_email, subject, html_body) tuples.
+    """
+    try:
+        if not FLASK_RESEND_API_KEY:
+            raise ValueError("RESEND_API_KEY not set")
+
+        headers = {
+            "Authorization": f"Bearer {FLASK_RESEND_API_KEY}",
+            "Content-Type": "application/json",
+        }
+
+        payload = [
+            {
+                "from": f"Ecovibe Kenya <{FLASK_SMTP_USER}>",
+                "to": [to_email],
+                "subject": subject,
+                "html": body,
+            }
+            for to_email, subject, body in messages
+        ]
+
+        response = requests.post(
+            "https://api.resend.com/emails/batch",
+            headers=headers,
+            json=payload,
+            timeout=30,
+        )
+
+        if response.status_code == 200:
+            logger.info(f"Batch of {len(messages)} email(s) successfully sent")
+            return True, "Emails sent successfully"
+        else:
+            logger.error(
+                f"Batch email failed: {response.status_code} - {response.text}"
+            )
+            return False, f"Resend API error: {response.text}"
+
+    except Exception as e:
+        logger.error("Failed to send batch email: %s", e, exc_info=True)
+        return False, str(e)
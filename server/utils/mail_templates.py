@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from .mail_config import send_email
+from .mail_config import send_batch_email, send_email
 
 
 def send_contact_email(to_email, email_type, data):
@@ -902,3 +902,87 @@ def format_timestamp(timestamp_str):
         return dt.strftime("%B %d, %Y at %I:%M %p")
     except (ValueError, TypeError):
         return "Recently"
+
+
+def booking_reminder_email(user_name, service_title, start_time):
+    """Build the (subject, html body) of a booking reminder"""
+    when = start_time.strftime("%A, %B %d, %Y at %I:%M %p")
+    subject = f"Reminder: {service_title} on {start_time.strftime('%B %d')}"
+
+    body = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{
+                font-family: Arial, sans-serif;
+                line-height: 1.6;
+                color: #333;
+            }}
+            .header {{
+                background-color: #37B137;
+                color: white;
+                padding: 20px;
+                text-align: center;
+            }}
+            .content {{
+                padding: 20px;
+            }}
+            .details {{
+                margin: 20px 0;
+                padding: 15px;
+                border-left: 4px solid #37B137;
+                background-color: #f9f9f9;
+            }}
+            .footer {{
+                text-align: center;
+                padding: 20px;
+                font-size: 12px;
+                color: #666;
+            }}
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h1>Upcoming Booking</h1>
+        </div>
+        <div class="content">
+            <p>Dear {user_name},</p>
+            <p>This is a reminder of your upcoming booking with EcoVibe:</p>
+
+            <div class="details">
+                <p><strong>Service:</strong> {service_title}</p>
+                <p><strong>When:</strong> {when} (EAT)</p>
+            </div>
+
+            <p>If you need to reschedule or cancel, please do so from your
+            dashboard or contact us as soon as possible.</p>
+        </div>
+        <div class="footer">
+            <p>This is an automated message. Please do not reply.</p>
+        </div>
+    </body>
+    </html>
+    """
+
+    return subject, body
+
+
+def send_booking_reminder_emails(reminders):
+    """
+    Send booking reminders in batches of up to 100.
+
+    ``reminders`` is a list of (to_email, user_name, service_title,
+    start_time) tuples, with start_time in local time.
+    """
+    messages = [
+        (to_email, *booking_reminder_email(user_name, service_title, start_time))
+        for to_email, user_name, service_title, start_time in reminders
+    ]
+    sent = 0
+    while messages:
+        batch, messages = messages[:100], messages[100:]
+        success, _ = send_batch_email(batch)
+        if success:
+            sent += len(batch)
+    return sent
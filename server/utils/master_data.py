@@ -0,0 +1,168 @@
+import os
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from types import MappingProxyType
+from sqlalchemy import event, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from models import db
+from models.cache_version import CacheVersion
+
+# Longest a worker serves master data after another worker changed it
+MASTER_DATA_STALENESS_SECONDS = float(
+    os.getenv("FLASK_MASTER_DATA_STALENESS_SECONDS", "30")
+)
+
+
+def _jsonable(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class MasterSnapshot:
+    """
+    Read-only copy of one master data row: the column values as attributes,
+    detached from any session so it can be shared between requests.
+    ``to_dict`` only ever returns the model's PUBLIC_FIELDS, so
+    credentials cannot leak into a response.
+    """
+
+    __slots__ = ("_values", "_public_fields")
+
+    def __init__(self, row):
+        values = {
+            column.key: getattr(row, column.key)
+            for column in inspect(row).mapper.column_attrs
+        }
+        object.__setattr__(self, "_values", MappingProxyType(values))
+        object.__setattr__(
+            self, "_public_fields", tuple(getattr(row, "PUBLIC_FIELDS", ()))
+        )
+
+    def __getattr__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Master data snapshots are read-only")
+
+    def to_dict(self):
+        """The model's PUBLIC_FIELDS as JSON-ready values."""
+        return {field: _jsonable(self._values[field]) for field in self._public_fields}
+
+    def __repr__(self):
+        return f"<MasterSnapshot id={self._values.get('id')}>"
+
+
+def snapshot(result):
+    """MasterSnapshot of a row, tuple of them for a list, None for None."""
+    if result is None:
+        return None
+    if isinstance(result, list):
+        return tuple(MasterSnapshot(row) for row in result)
+    return MasterSnapshot(result)
+
+
+def bump_version(connection, name):
+    """Add one to the ``name`` cache version in a single upsert."""
+    table = CacheVersion.__table__
+    insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(table).values(name=name, value=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.name], set_={"value": table.c.value + 1}
+    )
+    connection.execute(stmt)
+
+
+class VersionedCache:
+    """
+    Per-worker cache of snapshots of rarely changing rows.
+
+    A write to any of ``models`` bumps the ``name`` row of cache_versions
+    in the same flush and, once committed, empties this worker's cache at
+    once. Other workers read the version at most every
+    ``staleness_seconds`` and empty theirs when it moved, so all of them
+    serve the new data within that bound.
+    """
+
+    def __init__(self, name, models, staleness_seconds):
+        self.name = name
+        self.models = tuple(models)
+        self.staleness_seconds = staleness_seconds
+        self._entries = {}
+        self._version = None
+        self._checked_at = None
+        self._generation = 0  # moves on every local invalidation
+        self._lock = threading.Lock()
+        self._info_key = f"versioned_cache_{name}"
+        self._listen()
+
+    def _listen(self):
+        @event.listens_for(Session, "after_flush")
+        def bump(session, flush_context):
+            if session.info.get(self._info_key):
+                return
+            changed = list(session.new) + list(session.dirty) + list(session.deleted)
+            if any(isinstance(obj, self.models) for obj in changed):
+                bump_version(session.connection(), self.name)
+                session.info[self._info_key] = True
+
+        @event.listens_for(Session, "after_commit")
+        def apply(session):
+            if session.info.pop(self._info_key, None):
+                self.clear()
+
+        @event.listens_for(Session, "after_soft_rollback")
+        def discard(session, previous_transaction):
+            if not session.in_transaction():
+                session.info.pop(self._info_key, None)
+
+    def _read_version(self):
+        # A plain select, not the identity map, to see other workers' bumps
+        version = db.session.execute(
+            select(CacheVersion.value).where(CacheVersion.name == self.name)
+        ).scalar()
+        return version or 0
+
+    def version(self):
+        """The data version the cached snapshots belong to."""
+        with self._lock:
+            checked_at = self._checked_at
+        now = time.monotonic()
+        if checked_at is None or now - checked_at >= self.staleness_seconds:
+            version = self._read_version()
+            with self._lock:
+                if version != self._version:
+                    self._entries.clear()
+                    self._generation += 1
+                    self._version = version
+                self._checked_at = now
+        return self._version
+
+    def get(self, key, load):
+        """The snapshot cached under ``key``, loading it with ``load()``."""
+        self.version()
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+            generation = self._generation
+        value = snapshot(load())
+        with self._lock:
+            # Not cached if the data was invalidated while loading
+            if generation == self._generation:
+                self._entries[key] = value
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._checked_at = None
@@ -0,0 +1,278 @@
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy import or_
+from models import db
+from models.invoice import Invoice, InvoiceStatus
+from models.payment import (
+    MpesaCallbackInbox,
+    MpesaTransaction,
+    Payment,
+    PaymentMethod,
+)
+from utils.paybill import completed_payment_totals
+
+INBOX_BATCH_SIZE = int(os.getenv("FLASK_MPESA_INBOX_BATCH_SIZE", "100"))
+INBOX_POLL_SECONDS = float(os.getenv("FLASK_MPESA_INBOX_POLL_SECONDS", "5"))
+# A callback whose transaction is not found yet is retried this many times,
+# waiting INBOX_RETRY_SECONDS and doubling after each attempt, before it is
+# given up on
+INBOX_MAX_ATTEMPTS = int(os.getenv("FLASK_MPESA_INBOX_MAX_ATTEMPTS", "8"))
+INBOX_RETRY_SECONDS = float(os.getenv("FLASK_MPESA_INBOX_RETRY_SECONDS", "5"))
+INBOX_WORKER_ENABLED = os.getenv("FLASK_MPESA_INBOX_WORKER", "true").lower() in (
+    "1",
+    "true",
+)
+
+
+def enqueue_mpesa_callback(callback_data):
+    """
+    Append a raw STK callback to the inbox and commit.
+
+    Returns the inbox row, or None when the payload is not an STK callback.
+    Only the CheckoutRequestID is inspected here so that the webhook can be
+    acknowledged without touching transactions or invoices.
+    """
+    stk_callback = (callback_data.get("Body") or {}).get("stkCallback")
+    if not isinstance(stk_callback, dict):
+        return None
+
+    checkout_request_id = stk_callback.get("CheckoutRequestID")
+    if not checkout_request_id:
+        return None
+
+    entry = MpesaCallbackInbox(
+        checkout_request_id=str(checkout_request_id),
+        payload=callback_data,
+    )
+    db.session.add(entry)
+    db.session.commit()
+    return entry
+
+
+def parse_callback_metadata(stk_callback):
+    """Extract (receipt number, transaction date) from CallbackMetadata."""
+    transaction_code = None
+    transaction_date = None
+
+    for item in (stk_callback.get("CallbackMetadata") or {}).get("Item", []):
+        name = item.get("Name")
+        value = item.get("Value")
+
+        if name == "MpesaReceiptNumber":
+            transaction_code = value
+        elif name == "TransactionDate":
+            transaction_date = value
+
+    return transaction_code, transaction_date
+
+
+def apply_stk_callback(transaction, callback_data, paid_transaction_ids):
+    """
+    Apply a single STK callback to its transaction.
+
+    ``paid_transaction_ids`` holds transactions that already have a Payment
+    row, so a replayed callback never creates a second one. The invoice is
+    settled by ``settle_invoices`` once the whole batch is applied.
+    """
+    stk_callback = callback_data["Body"]["stkCallback"]
+    result_code = stk_callback.get("ResultCode")
+    transaction_code, transaction_date = parse_callback_metadata(stk_callback)
+
+    transaction.result_code = result_code
+    transaction.result_desc = stk_callback.get("ResultDesc")
+    transaction.mpesa_receipt_number = transaction_code
+    transaction.transaction_date = transaction_date
+    transaction.raw_callback_data = callback_data
+    transaction.callback_received = True
+    transaction.callback_received_at = datetime.now(timezone.utc)
+
+    if str(result_code) != "0":
+        transaction.status = "failed"
+        return
+
+    transaction.status = "completed"
+    if transaction_code:
+        transaction.transaction_code = transaction_code
+
+    if not transaction.invoice_id:
+        return
+
+    if transaction.id not in paid_transaction_ids:
+        db.session.add(
+            Payment(
+                invoice_id=transaction.invoice_id,
+                payment_method=PaymentMethod.MPESA,
+                mpesa_transaction_id=transaction.id,
+                created_at=datetime.now(timezone.utc),
+            )
+        )
+        paid_transaction_ids.add(transaction.id)
+
+
+def settle_invoices(invoices):
+    """Mark paid the invoices whose completed payments cover the amount due."""
+    paid_totals = completed_payment_totals(invoices)
+    for invoice in invoices.values():
+        if paid_totals.get(invoice.id, 0) >= invoice.amount_due:
+            invoice.status = InvoiceStatus.paid
+
+
+def defer_unmatched(row, now):
+    """
+    Schedule another attempt for a callback whose transaction is not found,
+    which happens when Daraja calls back before the STK push row commits.
+    Returns False once the row has used up INBOX_MAX_ATTEMPTS.
+    """
+    row.attempts = (row.attempts or 0) + 1
+    if row.attempts >= INBOX_MAX_ATTEMPTS:
+        row.processing_error = f"Transaction not found after {row.attempts} attempts"
+        return False
+    row.processing_error = "Transaction not found"
+    delay = INBOX_RETRY_SECONDS * 2 ** (row.attempts - 1)
+    row.next_attempt_at = now + timedelta(seconds=delay)
+    return True
+
+
+def process_mpesa_inbox(batch_size=INBOX_BATCH_SIZE):
+    """
+    Process one batch of unprocessed inbox rows and commit.
+
+    Rows are claimed with ``FOR UPDATE SKIP LOCKED`` so several workers can
+    drain the inbox concurrently. Callbacks are deduplicated by
+    CheckoutRequestID both within the batch and against transactions that
+    already received a callback. Callbacks for unknown transactions stay
+    unprocessed and are retried with backoff. Returns the number of rows
+    consumed or deferred.
+    """
+    now = datetime.now(timezone.utc)
+    rows = (
+        MpesaCallbackInbox.query.filter(
+            MpesaCallbackInbox.processed_at.is_(None),
+            or_(
+                MpesaCallbackInbox.next_attempt_at.is_(None),
+                MpesaCallbackInbox.next_attempt_at <= now,
+            ),
+        )
+        .order_by(MpesaCallbackInbox.id.asc())
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not rows:
+        return 0
+
+    checkout_ids = {row.checkout_request_id for row in rows}
+    transactions = {
+        t.checkout_request_id: t
+        for t in MpesaTransaction.query.filter(
+            MpesaTransaction.checkout_request_id.in_(checkout_ids)
+        )
+    }
+    transaction_ids = [t.id for t in transactions.values()]
+    paid_transaction_ids = {
+        tid
+        for (tid,) in db.session.query(Payment.mpesa_transaction_id).filter(
+            Payment.mpesa_transaction_id.in_(transaction_ids)
+        )
+    }
+    invoice_ids = {t.invoice_id for t in transactions.values() if t.invoice_id}
+    invoices = {
+        inv.id: inv for inv in Invoice.query.filter(Invoice.id.in_(invoice_ids))
+    }
+
+    first_seen = {}
+    for row in rows:
+        if row.checkout_request_id in first_seen:
+            row.processing_error = (
+                f"Duplicate of inbox row {first_seen[row.checkout_request_id]}"
+            )
+        else:
+            first_seen[row.checkout_request_id] = row.id
+            transaction = transactions.get(row.checkout_request_id)
+            row.processing_error = None  # from an earlier attempt
+
+            if not transaction:
+                if defer_unmatched(row, now):
+                    continue
+            elif transaction.callback_received:
+                row.processing_error = "Callback already applied"
+            else:
+                try:
+                    with db.session.begin_nested():
+                        apply_stk_callback(
+                            transaction, row.payload, paid_transaction_ids
+                        )
+                except (ValueError, KeyError, TypeError) as e:
+                    row.processing_error = f"Invalid callback: {e}"
+
+        row.processed_at = now
+
+    settle_invoices(invoices)
+    db.session.commit()
+    return len(rows)
+
+
+def drain_mpesa_inbox(batch_size=INBOX_BATCH_SIZE):
+    """Process batches until the inbox is empty; return rows consumed."""
+    total = 0
+    while True:
+        processed = process_mpesa_inbox(batch_size)
+        total += processed
+        if processed < batch_size:
+            return total
+
+
+class MpesaInboxWorker:
+    """
+    Background thread that drains the callback inbox.
+
+    The callback route calls ``notify()`` after each insert, which starts the
+    thread on first use. The worker also polls on an interval so rows left
+    behind by a restart are picked up; ``flask process-mpesa-inbox`` drains
+    the inbox from cron when the thread is disabled.
+    """
+
+    def __init__(self, poll_seconds=INBOX_POLL_SECONDS, batch_size=INBOX_BATCH_SIZE):
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._app = None
+
+    def start(self, app):
+        """Start the worker thread for ``app`` if it is not already running."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._app = app
+            self._thread = threading.Thread(
+                target=self._run, name="mpesa-inbox-worker", daemon=True
+            )
+            self._thread.start()
+
+    def notify(self):
+        """Wake the worker, starting it for the current app if needed."""
+        app = current_app._get_current_object()
+        if INBOX_WORKER_ENABLED and not app.testing:
+            self.start(app)
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.poll_seconds)
+            self._wakeup.clear()
+            with self._app.app_context():
+                try:
+                    drain_mpesa_inbox(self.batch_size)
+                except Exception:
+                    db.session.rollback()
+                    current_app.logger.exception("Error processing MPESA inbox")
+                finally:
+                    db.session.remove()
+
+
+# Global instance
+mpesa_inbox_worker = MpesaInboxWorker()
@@ -0,0 +1,190 @@
+import base64
+import json
+import os
+from datetime import date, datetime
+from sqlalchemy import func, text, tuple_
+from models import db
+
+# Page size of list endpoints when the caller passes a cursor but no ``limit``
+DEFAULT_PAGE_SIZE = int(os.getenv("FLASK_DEFAULT_PAGE_SIZE", "100"))
+# Largest ``limit`` a caller may ask for
+MAX_PAGE_SIZE = int(os.getenv("FLASK_MAX_PAGE_SIZE", "500"))
+
+
+def _dump_value(value):
+    if isinstance(value, datetime):
+        return ["datetime", value.isoformat()]
+    if isinstance(value, date):
+        return ["date", value.isoformat()]
+    return ["value", value]
+
+
+def _load_value(tagged):
+    kind, value = tagged
+    if kind == "datetime":
+        return datetime.fromisoformat(value)
+    if kind == "date":
+        return date.fromisoformat(value)
+    if kind == "value":
+        return value
+    raise ValueError("Invalid cursor")
+
+
+def encode_cursor(sort_value, row_id, direction="next"):
+    """
+    Encode a (sort_value, id) position as an opaque URL-safe token.
+    ``direction`` is "next" to continue after it or "prev" to go back.
+    """
+    raw = json.dumps([_dump_value(sort_value), row_id, direction]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a token from ``encode_cursor`` into (sort_value, id, direction);
+    raise ValueError if malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        decoded = json.loads(base64.urlsafe_b64decode(padded))
+        if len(decoded) == 2:
+            # Tokens issued before cursors carried a type and direction
+            created_at, row_id = decoded
+            return datetime.fromisoformat(created_at), int(row_id), "next"
+        tagged, row_id, direction = decoded
+        if direction not in ("next", "prev"):
+            raise ValueError("Invalid cursor")
+        return _load_value(tagged), int(row_id), direction
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_paginate(
+    query, sort_column, id_column, cursor=None, limit=DEFAULT_PAGE_SIZE, descending=True
+):
+    """
+    Fetch one page of ``query`` ordered on (sort_column, id).
+
+    Seeks past ``cursor`` instead of using OFFSET, so every page costs the
+    same index range scan. Pass ``id_column`` as ``sort_column`` to order on
+    the primary key alone. Returns (items, next_cursor, prev_cursor); a
+    cursor is None when there is nothing further in that direction.
+    """
+    by_id = sort_column is id_column
+    key = id_column if by_id else tuple_(sort_column, id_column)
+
+    direction = "next"
+    if cursor:
+        sort_value, row_id, direction = decode_cursor(cursor)
+        position = row_id if by_id else tuple_(sort_value, row_id)
+        if descending == (direction == "next"):
+            query = query.filter(key < position)
+        else:
+            query = query.filter(key > position)
+
+    # Walk backwards for "prev" and flip the rows back afterwards
+    backwards = direction == "prev"
+    columns = [id_column] if by_id else [sort_column, id_column]
+    if descending != backwards:
+        order = [column.desc() for column in columns]
+    else:
+        order = [column.asc() for column in columns]
+
+    rows = query.order_by(*order).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    if backwards:
+        items.reverse()
+    if not items:
+        return items, None, None
+
+    def position_of(item, cursor_direction):
+        row_id = getattr(item, id_column.key)
+        sort_value = row_id if by_id else getattr(item, sort_column.key)
+        return encode_cursor(sort_value, row_id, cursor_direction)
+
+    has_next = has_more if not backwards else True
+    has_prev = has_more if backwards else bool(cursor)
+    next_cursor = position_of(items[-1], "next") if has_next else None
+    prev_cursor = position_of(items[0], "prev") if has_prev else None
+    return items, next_cursor, prev_cursor
+
+
+def page_args(args, default_limit=DEFAULT_PAGE_SIZE):
+    """
+    (cursor, limit, include_total) from request arguments. ``per_page`` is
+    accepted as an alias of ``limit``; the limit is capped at MAX_PAGE_SIZE.
+    """
+    limit = args.get("limit", type=int) or args.get("per_page", type=int)
+    limit = min(max(limit or default_limit, 1), MAX_PAGE_SIZE)
+    return args.get("cursor") or None, limit, args.get("include_total") == "1"
+
+
+def paginate(query, sort_column, id_column, args, descending=True):
+    """
+    One keyset page of ``query`` for a list endpoint, driven by the
+    ``cursor``, ``limit`` and ``include_total`` request arguments.
+
+    Returns (items, pagination) where pagination is the envelope shared by
+    list responses: limit, next_cursor, prev_cursor, has_more and, when
+    asked for, total and total_is_estimate. Raises ValueError for a bad
+    cursor.
+
+    Callers that pass neither ``cursor`` nor ``limit`` (or ``per_page``)
+    predate pagination and still get every row, in the same order, with a
+    null ``limit`` in the envelope.
+    """
+    cursor, limit, include_total = page_args(args)
+    if not any(name in args for name in ("cursor", "limit", "per_page")):
+        columns = [id_column] if sort_column is id_column else [sort_column, id_column]
+        order = [column.desc() if descending else column.asc() for column in columns]
+        items = query.order_by(*order).all()
+        pagination = {
+            "limit": None,
+            "next_cursor": None,
+            "prev_cursor": None,
+            "has_more": False,
+        }
+        if include_total:
+            pagination["total"], pagination["total_is_estimate"] = len(items), False
+        return items, pagination
+
+    items, next_cursor, prev_cursor = keyset_paginate(
+        query,
+        sort_column,
+        id_column,
+        cursor=cursor,
+        limit=limit,
+        descending=descending,
+    )
+    pagination = {
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "has_more": next_cursor is not None,
+    }
+    if include_total:
+        pagination["total"], pagination["total_is_estimate"] = approximate_count(
+            query, id_column.class_, filtered=query.whereclause is not None
+        )
+    return items, pagination
+
+
+def approximate_count(query, model, filtered=False):
+    """
+    Row count for ``query``, returned as (total, is_estimate).
+
+    Unfiltered counts on PostgreSQL come from the planner statistics in
+    ``pg_class`` instead of a full table scan. Filtered queries, other
+    databases and tables that have never been analysed fall back to COUNT.
+    """
+    if not filtered and db.engine.dialect.name == "postgresql":
+        estimate = db.session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"),
+            {"table": model.__tablename__},
+        ).scalar()
+        if estimate is not None and estimate >= 0:
+            return int(estimate), True
+
+    total = query.order_by(None).with_entities(func.count(model.id)).scalar()
+    return total, False
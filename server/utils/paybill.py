@@ -0,0 +1,291 @@
+import os
+import re
+import threading
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from models import db
+from models.invoice import Invoice, InvoiceStatus
+from models.payment import (
+    PaybillTransaction,
+    Payment,
+    PaymentMethod,
+    PaymentStatus,
+)
+from utils.revenue_rollup import PAYMENT_AMOUNT, completed_payments
+
+PAYBILL_BATCH_SIZE = int(os.getenv("FLASK_PAYBILL_BATCH_SIZE", "200"))
+PAYBILL_BATCH_WAIT_MS = float(os.getenv("FLASK_PAYBILL_BATCH_WAIT_MS", "20"))
+PAYBILL_BATCHING_ENABLED = os.getenv("FLASK_PAYBILL_BATCHING", "true").lower() in (
+    "1",
+    "true",
+)
+
+# Daraja C2B validation result codes
+C2B_ACCEPTED = "0"
+C2B_INVALID_ACCOUNT = "C2B00012"
+C2B_INVALID_AMOUNT = "C2B00013"
+
+# Daraja sends TransTime in Kenyan local time
+EAT = timezone(timedelta(hours=3))
+
+# "123", "INV123", "INV-123", "Invoice123", "Invoice #123"
+ACCOUNT_NUMBER_PATTERN = re.compile(r"^\s*(?:inv(?:oice)?[\s#:-]*)?(\d+)\s*$", re.I)
+
+
+def parse_account_number(account_number):
+    """Return the invoice id a BillRefNumber refers to, or None."""
+    match = ACCOUNT_NUMBER_PATTERN.match(str(account_number or ""))
+    return int(match.group(1)) if match else None
+
+
+def parse_amount(value):
+    """Return TransAmount as a positive Decimal, or None."""
+    try:
+        amount = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+    return amount if amount > 0 else None
+
+
+def parse_trans_time(value):
+    """Parse a Daraja ``YYYYMMDDHHMMSS`` timestamp."""
+    try:
+        return datetime.strptime(str(value), "%Y%m%d%H%M%S").replace(tzinfo=EAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_msisdn(value):
+    """Daraja masks or hashes MSISDN for some shortcodes; keep only real ones."""
+    value = str(value or "")
+    return value if re.match(r"^254\d{9}$", value) else None
+
+
+def completed_payment_totals(invoice_ids):
+    """
+    {invoice_id: amount paid} over the completed payments of the given
+    invoices, whichever kind of transaction each payment is linked to.
+    STK pushes not yet confirmed and unverified transfers do not count.
+    """
+    query = completed_payments(
+        db.session.query(Payment.invoice_id, func.sum(PAYMENT_AMOUNT)).filter(
+            Payment.invoice_id.in_(invoice_ids)
+        )
+    )
+    return {
+        invoice_id: Decimal(total or 0)
+        for invoice_id, total in query.group_by(Payment.invoice_id)
+    }
+
+
+def validate_c2b_payment(payload):
+    """
+    Decide whether to accept a C2B payment before it completes.
+
+    Returns (result code, description). Only the referenced invoice is
+    loaded, by primary key.
+    """
+    if parse_amount(payload.get("TransAmount")) is None:
+        return C2B_INVALID_AMOUNT, "Rejected: invalid amount"
+
+    invoice_id = parse_account_number(payload.get("BillRefNumber"))
+    invoice = db.session.get(Invoice, invoice_id) if invoice_id else None
+    if (
+        not invoice
+        or invoice.is_deleted
+        or invoice.status in (InvoiceStatus.paid, InvoiceStatus.cancelled)
+    ):
+        return C2B_INVALID_ACCOUNT, "Rejected: invalid account number"
+
+    return C2B_ACCEPTED, "Accepted"
+
+
+def ingest_paybill_confirmations(payloads):
+    """
+    Record a batch of C2B confirmations in one transaction.
+
+    Receipts are deduplicated by TransID within the batch and against
+    ``paybill_transactions.transaction_code``. Confirmations whose
+    BillRefNumber matches an invoice are verified, linked to it with a
+    Payment and settle the invoice once its completed payments of every
+    kind cover it, late fee included; the rest are kept as pending for manual
+    reconciliation. Returns one of "created", "duplicate" or "invalid" per
+    payload, in order.
+    """
+    results = ["invalid"] * len(payloads)
+    candidates = {}
+    for index, payload in enumerate(payloads):
+        code = str(payload.get("TransID") or "").strip().upper()
+        if not code or parse_amount(payload.get("TransAmount")) is None:
+            continue
+        if code in candidates:
+            results[index] = "duplicate"
+            continue
+        candidates[code] = index
+
+    if not candidates:
+        return results
+
+    existing = {
+        code
+        for (code,) in db.session.query(PaybillTransaction.transaction_code).filter(
+            PaybillTransaction.transaction_code.in_(candidates)
+        )
+    }
+    for code in existing:
+        results[candidates.pop(code)] = "duplicate"
+
+    invoice_ids = {
+        parse_account_number(payloads[index].get("BillRefNumber"))
+        for index in candidates.values()
+    }
+    invoice_ids.discard(None)
+    invoices = {
+        invoice.id: invoice
+        for invoice in Invoice.query.filter(
+            Invoice.id.in_(invoice_ids), Invoice.is_deleted.is_(False)
+        )
+    }
+    paid_totals = completed_payment_totals(invoices)
+
+    now = datetime.now(timezone.utc)
+    matched = []
+    for code, index in candidates.items():
+        payload = payloads[index]
+        invoice = invoices.get(parse_account_number(payload.get("BillRefNumber")))
+        transaction = PaybillTransaction(
+            amount=parse_amount(payload.get("TransAmount")),
+            paybill_number=str(payload.get("BusinessShortCode") or "")[:20],
+            account_number=str(payload.get("BillRefNumber") or "")[:100],
+            provider="mpesa",
+            transaction_code=code,
+            phone_number=normalize_msisdn(payload.get("MSISDN")),
+            transaction_date=parse_trans_time(payload.get("TransTime")),
+            status=PaymentStatus.VERIFIED if invoice else PaymentStatus.PENDING,
+            confirmation_received=True,
+            confirmed_at=now,
+            raw_callback_data=payload,
+        )
+        db.session.add(transaction)
+        if invoice:
+            matched.append((transaction, invoice))
+        results[index] = "created"
+
+    # One flush assigns ids for the whole batch
+    db.session.flush()
+
+    for transaction, invoice in matched:
+        db.session.add(
+            Payment(
+                invoice_id=invoice.id,
+                payment_method=PaymentMethod.PAYBILL,
+                paybill_transaction_id=transaction.id,
+                created_at=now,
+            )
+        )
+        paid_totals[invoice.id] = (
+            paid_totals.get(invoice.id) or Decimal("0")
+        ) + transaction.amount
+        if paid_totals[invoice.id] >= invoice.amount_due:
+            invoice.status = InvoiceStatus.paid
+
+    db.session.commit()
+    return results
+
+
+def ingest_with_fallback(payloads):
+    """
+    Ingest a batch, retrying one at a time if the batch hits a duplicate
+    receipt inserted concurrently by another worker.
+    """
+    try:
+        return ingest_paybill_confirmations(payloads)
+    except IntegrityError:
+        db.session.rollback()
+
+    results = []
+    for payload in payloads:
+        try:
+            results.extend(ingest_paybill_confirmations([payload]))
+        except IntegrityError:
+            db.session.rollback()
+            results.append("duplicate")
+    return results
+
+
+class PaybillConfirmationBatcher:
+    """
+    Group commit for C2B confirmations.
+
+    Request threads hand their payload to a single writer thread and block
+    until it has been committed, so each request is only acknowledged once
+    durable while a burst of confirmations shares one INSERT batch and one
+    commit. Under testing, or with FLASK_PAYBILL_BATCHING=false, payloads
+    are ingested inline.
+    """
+
+    def __init__(self, batch_size=PAYBILL_BATCH_SIZE, wait_ms=PAYBILL_BATCH_WAIT_MS):
+        self.batch_size = batch_size
+        self.wait_seconds = wait_ms / 1000
+        self._pending = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self._app = None
+
+    def submit(self, payload, timeout=30):
+        """Queue ``payload`` and return its ingest result once committed."""
+        app = current_app._get_current_object()
+        if app.testing or not PAYBILL_BATCHING_ENABLED:
+            return ingest_with_fallback([payload])[0]
+
+        future = Future()
+        with self._condition:
+            self._ensure_started(app)
+            self._pending.append((payload, future))
+            self._condition.notify()
+        return future.result(timeout)
+
+    def _ensure_started(self, app):
+        if self._thread and self._thread.is_alive():
+            return
+        self._app = app
+        self._thread = threading.Thread(
+            target=self._run, name="paybill-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def _next_batch(self):
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending)
+            # Linger briefly so a burst fills the batch
+            self._condition.wait_for(
+                lambda: len(self._pending) >= self.batch_size, self.wait_seconds
+            )
+            batch = self._pending[: self.batch_size]
+            del self._pending[: self.batch_size]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            with self._app.app_context():
+                try:
+                    results = ingest_with_fallback([payload for payload, _ in batch])
+                except Exception as e:
+                    db.session.rollback()
+                    current_app.logger.exception("Error ingesting paybill batch")
+                    for _, future in batch:
+                        future.set_exception(e)
+                else:
+                    for (_, future), result in zip(batch, results):
+                        future.set_result(result)
+                finally:
+                    db.session.remove()
+
+
+# Global instance
+paybill_batcher = PaybillConfirmationBatcher()
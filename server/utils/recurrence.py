@@ -0,0 +1,154 @@
+import calendar
+from datetime import datetime, timedelta, timezone
+
+# Supported subset of RFC 5545 RRULE
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY")
+MAX_COUNT = 520
+MAX_INTERVAL = 52
+
+
+def as_utc(value):
+    """Normalize a datetime to aware UTC (SQLite returns naive values)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def parse_rrule(text):
+    """
+    Parse an RRULE such as ``FREQ=MONTHLY;INTERVAL=1;COUNT=12``.
+
+    Supports FREQ (DAILY, WEEKLY, MONTHLY), INTERVAL, COUNT and UNTIL; an
+    optional ``RRULE:`` prefix is ignored. Returns a dict with ``freq``,
+    ``interval``, ``count`` and ``until`` and raises ValueError otherwise.
+    """
+    if not text or not isinstance(text, str):
+        raise ValueError("Recurrence rule is required")
+
+    text = text.strip()
+    if text.upper().startswith("RRULE:"):
+        text = text[6:]
+
+    parts = {}
+    for part in text.split(";"):
+        name, sep, value = part.partition("=")
+        if not sep or not value:
+            raise ValueError(f"Invalid recurrence rule part '{part}'")
+        parts[name.strip().upper()] = value.strip()
+
+    unknown = set(parts) - {"FREQ", "INTERVAL", "COUNT", "UNTIL"}
+    if unknown:
+        raise ValueError(f"Unsupported recurrence rule part(s): {sorted(unknown)}")
+
+    freq = parts.get("FREQ", "").upper()
+    if freq not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+
+    try:
+        interval = int(parts.get("INTERVAL", 1))
+        count = int(parts["COUNT"]) if "COUNT" in parts else None
+    except ValueError:
+        raise ValueError("INTERVAL and COUNT must be integers")
+    if not 1 <= interval <= MAX_INTERVAL:
+        raise ValueError(f"INTERVAL must be between 1 and {MAX_INTERVAL}")
+    if count is not None and not 1 <= count <= MAX_COUNT:
+        raise ValueError(f"COUNT must be between 1 and {MAX_COUNT}")
+
+    until = None
+    if "UNTIL" in parts:
+        if count is not None:
+            raise ValueError("COUNT and UNTIL cannot be combined")
+        value = parts["UNTIL"]
+        try:
+            if len(value) == 8:
+                until = datetime.strptime(value, "%Y%m%d").replace(
+                    hour=23, minute=59, second=59, tzinfo=timezone.utc
+                )
+            else:
+                until = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S").replace(
+                    tzinfo=timezone.utc
+                )
+        except ValueError:
+            raise ValueError("UNTIL must be YYYYMMDD or YYYYMMDDTHHMMSSZ")
+
+    return {"freq": freq, "interval": interval, "count": count, "until": until}
+
+
+def format_rrule(rule):
+    """Canonical text form of a parsed rule."""
+    text = f"FREQ={rule['freq']};INTERVAL={rule['interval']}"
+    if rule["count"] is not None:
+        text += f";COUNT={rule['count']}"
+    if rule["until"] is not None:
+        text += f";UNTIL={rule['until'].strftime('%Y%m%dT%H%M%SZ')}"
+    return text
+
+
+def add_months(value, months):
+    """Shift by whole months, clamping the day to the end of shorter months."""
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def nth_occurrence(rule, dtstart, n):
+    """Start of the n-th (0-based) occurrence, ignoring COUNT and UNTIL."""
+    if rule["freq"] == "MONTHLY":
+        return add_months(dtstart, n * rule["interval"])
+    days = 7 if rule["freq"] == "WEEKLY" else 1
+    return dtstart + timedelta(days=days * rule["interval"] * n)
+
+
+def first_index_from(rule, dtstart, window_start):
+    """Index of the first occurrence that may start at or after window_start."""
+    if window_start <= dtstart:
+        return 0
+    if rule["freq"] == "MONTHLY":
+        months = (window_start.year - dtstart.year) * 12 + (
+            window_start.month - dtstart.month
+        )
+        return max(0, months // rule["interval"] - 1)
+    days = 7 if rule["freq"] == "WEEKLY" else 1
+    step = timedelta(days=days * rule["interval"])
+    return (window_start - dtstart) // step
+
+
+def last_occurrence(rule, dtstart):
+    """Start of the final occurrence, or None for an open-ended rule."""
+    if rule["count"] is not None:
+        return nth_occurrence(rule, dtstart, rule["count"] - 1)
+    if rule["until"] is not None:
+        if rule["until"] < dtstart:
+            return None
+        n = first_index_from(rule, dtstart, rule["until"])
+        while nth_occurrence(rule, dtstart, n + 1) <= rule["until"]:
+            n += 1
+        while n > 0 and nth_occurrence(rule, dtstart, n) > rule["until"]:
+            n -= 1
+        return nth_occurrence(rule, dtstart, n)
+    return None
+
+
+def iter_occurrences(rule, dtstart, window_start, window_end):
+    """
+    Yield occurrence starts in [window_start, window_end), in order.
+
+    Occurrences before the window are skipped arithmetically rather than
+    generated, so the cost depends only on the size of the window.
+    """
+    dtstart = as_utc(dtstart)
+    window_start = as_utc(window_start)
+    window_end = as_utc(window_end)
+
+    n = first_index_from(rule, dtstart, window_start)
+    while rule["count"] is None or n < rule["count"]:
+        occurrence = nth_occurrence(rule, dtstart, n)
+        if occurrence >= window_end or (
+            rule["until"] is not None and occurrence > rule["until"]
+        ):
+            return
+        if occurrence >= window_start:
+            yield occurrence
+        n += 1
@@ -0,0 +1,205 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from flask import Response, current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Responses kept by the in-process backend before the least recently used go
+RESPONSE_CACHE_SIZE = int(os.getenv("FLASK_RESPONSE_CACHE_SIZE", "512"))
+# Bounds staleness from writes made by other workers when each worker has its
+# own backend; with a shared backend versions already invalidate everywhere
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("FLASK_RESPONSE_CACHE_TTL_SECONDS", "60"))
+RESPONSE_CACHE_ENABLED = os.getenv("FLASK_RESPONSE_CACHE", "true").lower() in (
+    "1",
+    "true",
+)
+
+
+class CacheBackend:
+    """
+    Storage for cached responses and the data versions they are keyed by.
+
+    Keys are strings and values are plain tuples, so a backend shared by
+    all workers (Redis GET/SET for entries, INCR for versions) can take
+    the place of LRUBackend without touching the routes.
+    """
+
+    def get(self, key):
+        """The value stored under ``key``, or None."""
+        raise NotImplementedError
+
+    def set(self, key, value):
+        raise NotImplementedError
+
+    def version(self, group):
+        """Current data version of ``group``; 0 until first bumped."""
+        raise NotImplementedError
+
+    def bump(self, group):
+        """Move ``group`` to a new version, orphaning entries keyed by the old."""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class LRUBackend(CacheBackend):
+    """In-process backend holding the ``max_entries`` most recently used."""
+
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def version(self, group):
+        return self._versions.get(group, 0)
+
+    def bump(self, group):
+        with self._lock:
+            self._versions[group] = self._versions.get(group, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class ResponseCache:
+    """
+    Cache of whole GET responses for anonymous, visitor-independent routes.
+
+    Views opt in with ``@response_cache.cached(group, ...)``. Entries are
+    keyed by endpoint, path, sorted query string and the versions of the
+    view's data groups; ``bump_on_commit`` moves a group to a new version
+    when a commit writes one of its models, so cached bodies are served
+    until the rows behind them change and never after. Only 200 responses
+    are stored, as body, status and mimetype; per-request headers such as
+    CORS are added afresh on every hit.
+    """
+
+    def __init__(self, backend=None, ttl_seconds=RESPONSE_CACHE_TTL_SECONDS):
+        self.backend = backend or LRUBackend()
+        self.ttl_seconds = ttl_seconds
+        self._stats = {}  # endpoint -> [hits, misses]
+        self._stats_lock = threading.Lock()
+
+    def cached(self, *groups):
+        """Mark a view function or Resource method as cacheable."""
+
+        def decorator(view):
+            view.response_cache_groups = groups
+            return view
+
+        return decorator
+
+    def bump_on_commit(self, group, models):
+        """Bump ``group`` after every commit that writes one of ``models``."""
+        models = tuple(models)
+        info_key = f"response_cache_{id(self)}"
+
+        @event.listens_for(Session, "after_flush")
+        def collect(session, flush_context):
+            changed = list(session.new) + list(session.dirty) + list(session.deleted)
+            if any(isinstance(obj, models) for obj in changed):
+                session.info.setdefault(info_key, set()).add(group)
+
+        @event.listens_for(Session, "after_commit")
+        def apply(session):
+            for changed_group in session.info.pop(info_key, ()):
+                self.backend.bump(changed_group)
+
+        @event.listens_for(Session, "after_soft_rollback")
+        def discard(session, previous_transaction):
+            if not session.in_transaction():
+                session.info.pop(info_key, None)
+
+    def bump(self, group):
+        self.backend.bump(group)
+
+    def _groups(self):
+        view = current_app.view_functions.get(request.endpoint)
+        view_class = getattr(view, "view_class", None)
+        if view_class is not None:
+            view = getattr(view_class, request.method.lower(), None)
+        return getattr(view, "response_cache_groups", None)
+
+    def _count(self, hit):
+        with self._stats_lock:
+            counts = self._stats.setdefault(request.endpoint, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def _serve(self):
+        if not RESPONSE_CACHE_ENABLED or request.method != "GET":
+            return None
+        groups = self._groups()
+        if not groups:
+            return None
+
+        query = "&".join(sorted(request.query_string.decode().split("&")))
+        versions = ".".join(str(self.backend.version(group)) for group in groups)
+        key = f"{request.endpoint}|{request.path}?{query}|{versions}"
+        cached = self.backend.get(key)
+        if cached is not None:
+            stored_at, body, status, mimetype = cached
+            if time.time() - stored_at < self.ttl_seconds:
+                self._count(hit=True)
+                response = Response(body, status=status, mimetype=mimetype)
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+        self._count(hit=False)
+        g.response_cache_key = key
+        return None
+
+    def _store(self, response):
+        key = g.pop("response_cache_key", None)
+        if key is None:
+            return response
+        response.headers["X-Cache"] = "MISS"
+        if response.status_code == 200 and not response.is_streamed:
+            self.backend.set(
+                key,
+                (time.time(), response.get_data(), 200, response.mimetype),
+            )
+        return response
+
+    def init_app(self, app):
+        app.before_request(self._serve)
+        app.after_request(self._store)
+
+    def stats(self):
+        """{endpoint: {hits, misses, hit_ratio}} since start or ``clear``."""
+        with self._stats_lock:
+            return {
+                endpoint: {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_ratio": round(hits / (hits + misses), 3),
+                }
+                for endpoint, (hits, misses) in sorted(self._stats.items())
+            }
+
+    def clear(self):
+        self.backend.clear()
+        with self._stats_lock:
+            self._stats.clear()
+
+
+# Global instance
+response_cache = ResponseCache()
@@ -1,7 +1,10 @@
-def restful_response(status, data=None, message=None, status_code=200):
+def restful_response(status, data=None, message=None, status_code=200, pagination=None):
     """Standardize RESTful API responses"""
-    return {
+    body = {
         "data": data,
         "message": message,
         "status": status,
-    }, status_code
+    }
+    if pagination is not None:
+        body["pagination"] = pagination
+    return body, status_code
@@ -0,0 +1,253 @@
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, time as dt_time, timedelta, timezone
+from sqlalchemy import Date, delete, func, insert, literal_column, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from models import db
+from models.invoice import Invoice
+from models.payment import (
+    BankTransferTransaction,
+    CardTransaction,
+    CashTransaction,
+    MpesaTransaction,
+    Payment,
+    PaybillTransaction,
+    PaymentStatus,
+)
+from models.revenue_rollup import DailyRevenueRollup
+from models.service import Service
+
+# How often report requests bring the rollup up to date in this worker
+REVENUE_ROLLUP_REFRESH_SECONDS = float(
+    os.getenv("FLASK_REVENUE_ROLLUP_REFRESH_SECONDS", "300")
+)
+
+# Days before the latest rolled-up one that a refresh recomputes, so
+# payments recorded late for a recent day are still counted; anything older
+# needs `flask refresh-revenue-rollup --full`
+REVENUE_ROLLUP_WINDOW_DAYS = int(os.getenv("FLASK_REVENUE_ROLLUP_WINDOW_DAYS", "7"))
+
+TRANSACTIONS = (
+    (MpesaTransaction, Payment.mpesa_transaction_id),
+    (CashTransaction, Payment.cash_transaction_id),
+    (CardTransaction, Payment.card_transaction_id),
+    (BankTransferTransaction, Payment.bank_transfer_transaction_id),
+    (PaybillTransaction, Payment.paybill_transaction_id),
+)
+
+REPORT_GROUPS = {
+    "day": DailyRevenueRollup.day,
+    "service": DailyRevenueRollup.service_id,
+    "payment_method": DailyRevenueRollup.payment_method,
+}
+
+
+class utc_date(FunctionElement):
+    """SQL expression for the UTC calendar day of a timestamp."""
+
+    type = Date()
+    name = "utc_date"
+    inherit_cache = True
+
+
+@compiles(utc_date)
+def _utc_date(element, compiler, **kw):
+    # Not the session time zone, which date() of a timestamptz would use
+    (timestamp,) = element.clauses
+    return "CAST(timezone('UTC', {}) AS DATE)".format(compiler.process(timestamp, **kw))
+
+
+@compiles(utc_date, "sqlite")
+def _utc_date_sqlite(element, compiler, **kw):
+    # SQLite keeps the UTC wall time the application wrote
+    (timestamp,) = element.clauses
+    return "date({})".format(compiler.process(timestamp, **kw))
+
+
+# Amount of a payment, from whichever transaction it is linked to
+PAYMENT_AMOUNT = func.coalesce(*(model.amount for model, _ in TRANSACTIONS), 0)
+
+
+def completed_payments(query):
+    """
+    Outer-join a query over ``payments`` to the transaction tables and keep
+    only collected money: STK pushes not yet completed (or failed) and bank
+    transfers or paybill receipts not verified are left out.
+    """
+    for model, foreign_key in TRANSACTIONS:
+        query = query.outerjoin(model, foreign_key == model.id)
+    return query.filter(
+        or_(MpesaTransaction.id.is_(None), MpesaTransaction.status == "completed"),
+        or_(
+            BankTransferTransaction.id.is_(None),
+            BankTransferTransaction.status == PaymentStatus.VERIFIED,
+        ),
+        or_(
+            PaybillTransaction.id.is_(None),
+            PaybillTransaction.status == PaymentStatus.VERIFIED,
+        ),
+    )
+
+
+def payment_totals(since=None):
+    """
+    SELECT of rollup rows: completed payments grouped by day, service,
+    method and currency, with the amount taken from whichever transaction
+    is linked.
+    """
+    day = utc_date(Payment.created_at)
+    # Inline literal so PostgreSQL sees identical SELECT and GROUP BY expressions
+    currency = func.coalesce(
+        *(model.currency for model, _ in TRANSACTIONS), literal_column("'KES'")
+    )
+
+    query = select(
+        day,
+        Invoice.service_id,
+        Payment.payment_method,
+        currency,
+        func.count(Payment.id),
+        func.sum(PAYMENT_AMOUNT),
+    ).join(Invoice, Payment.invoice_id == Invoice.id)
+    query = completed_payments(query)
+    if since is not None:
+        query = query.where(Payment.created_at >= since)
+    return query.group_by(day, Invoice.service_id, Payment.payment_method, currency)
+
+
+def refresh_revenue_rollup(full=False, window_days=REVENUE_ROLLUP_WINDOW_DAYS):
+    """
+    Recompute the rollup from ``window_days`` before its latest day onwards
+    (UTC days), or from scratch when ``full`` is set or the table is empty.
+    Earlier days are final and are not read again. Returns the first
+    recomputed day (None for a rebuild).
+    """
+    since_day = (
+        None if full else db.session.query(func.max(DailyRevenueRollup.day)).scalar()
+    )
+    if since_day is not None:
+        since_day -= timedelta(days=window_days)
+
+    clear = delete(DailyRevenueRollup)
+    since = None
+    if since_day is not None:
+        clear = clear.where(DailyRevenueRollup.day >= since_day)
+        since = datetime.combine(since_day, dt_time.min, tzinfo=timezone.utc)
+
+    db.session.execute(clear)
+    db.session.execute(
+        insert(DailyRevenueRollup).from_select(
+            [
+                "day",
+                "service_id",
+                "payment_method",
+                "currency",
+                "payment_count",
+                "amount",
+            ],
+            payment_totals(since),
+        )
+    )
+    db.session.commit()
+    return since_day
+
+
+_refresh_lock = threading.Lock()
+_refreshed_at = None
+
+
+def ensure_revenue_rollup_fresh():
+    """Refresh the rollup if this worker has not done so recently."""
+    global _refreshed_at
+    with _refresh_lock:
+        if (
+            _refreshed_at is not None
+            and time.monotonic() - _refreshed_at < REVENUE_ROLLUP_REFRESH_SECONDS
+        ):
+            return
+        try:
+            refresh_revenue_rollup()
+        except IntegrityError:
+            # Another worker refreshed the same days first
+            db.session.rollback()
+        _refreshed_at = time.monotonic()
+
+
+def revenue_report(start_day, end_day, group_by):
+    """Payment count and amount per ``group_by`` key and currency."""
+    key = REPORT_GROUPS[group_by]
+    rows = (
+        db.session.query(
+            key,
+            DailyRevenueRollup.currency,
+            func.sum(DailyRevenueRollup.payment_count),
+            func.sum(DailyRevenueRollup.amount),
+        )
+        .filter(DailyRevenueRollup.day.between(start_day, end_day))
+        .group_by(key, DailyRevenueRollup.currency)
+        .order_by(key, DailyRevenueRollup.currency)
+        .all()
+    )
+
+    titles = {}
+    if group_by == "service":
+        ids = {row[0] for row in rows}
+        titles = dict(
+            db.session.query(Service.id, Service.title).filter(Service.id.in_(ids))
+        )
+
+    report = []
+    for value, currency, payment_count, amount in rows:
+        if group_by == "day":
+            item = {"day": value.isoformat()}
+        elif group_by == "service":
+            item = {"service_id": value, "service_title": titles.get(value)}
+        else:
+            item = {"payment_method": value.value}
+        item["currency"] = currency
+        item["payment_count"] = int(payment_count)
+        item["amount"] = float(amount)
+        report.append(item)
+    return report
+
+
+def collections_report(start_day, end_day):
+    """Amount collected per day and currency, split by payment method."""
+    rows = (
+        db.session.query(
+            DailyRevenueRollup.day,
+            DailyRevenueRollup.currency,
+            DailyRevenueRollup.payment_method,
+            func.sum(DailyRevenueRollup.payment_count),
+            func.sum(DailyRevenueRollup.amount),
+        )
+        .filter(DailyRevenueRollup.day.between(start_day, end_day))
+        .group_by(
+            DailyRevenueRollup.day,
+            DailyRevenueRollup.currency,
+            DailyRevenueRollup.payment_method,
+        )
+        .order_by(DailyRevenueRollup.day, DailyRevenueRollup.currency)
+        .all()
+    )
+
+    days = {}
+    for day, currency, method, payment_count, amount in rows:
+        entry = days.setdefault(
+            (day, currency),
+            {
+                "day": day.isoformat(),
+                "currency": currency,
+                "payment_count": 0,
+                "total": 0.0,
+                "by_method": defaultdict(float),
+            },
+        )
+        entry["payment_count"] += int(payment_count)
+        entry["total"] += float(amount)
+        entry["by_method"][method.value] += float(amount)
+    return [{**entry, "by_method": dict(entry["by_method"])} for entry in days.values()]
@@ -0,0 +1,77 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class SnapshotCache:
+    """
+    Thread-safe cache of computed payloads that expire after ``ttl_seconds``.
+
+    ``invalidate_on_commit`` drops entries as soon as a commit touches one of
+    the watched models, so the TTL only bounds staleness from writes made by
+    other workers.
+    """
+
+    def __init__(self, ttl_seconds):
+        self.ttl_seconds = ttl_seconds
+        self._entries = {}  # key -> (payload, stored_at)
+        self._lock = threading.Lock()
+        self._info_key = f"snapshot_cache_{id(self)}"
+
+    def get(self, key, build):
+        """Return the cached payload for ``key``, building it when missing."""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and time.monotonic() - cached[1] < self.ttl_seconds:
+                return cached[0]
+
+        payload = build()
+        with self._lock:
+            self._entries[key] = (payload, time.monotonic())
+        return payload
+
+    def invalidate(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate_on_commit(self, models, keys_for):
+        """
+        Drop the keys returned by ``keys_for(obj)`` for every committed
+        insert, update or delete of ``models``. ``keys_for`` may return None
+        to clear the whole cache.
+        """
+        models = tuple(models)
+
+        @event.listens_for(Session, "after_flush")
+        def collect(session, flush_context):
+            changed = [
+                obj
+                for obj in list(session.new) + list(session.dirty)
+                if isinstance(obj, models)
+            ]
+            changed += [obj for obj in session.deleted if isinstance(obj, models)]
+            if changed:
+                pending = session.info.setdefault(self._info_key, [])
+                for obj in changed:
+                    pending.append(keys_for(obj))
+
+        @event.listens_for(Session, "after_commit")
+        def apply(session):
+            pending = session.info.pop(self._info_key, None)
+            if not pending:
+                return
+            if any(keys is None for keys in pending):
+                self.clear()
+            else:
+                self.invalidate(*(key for keys in pending for key in keys))
+
+        @event.listens_for(Session, "after_soft_rollback")
+        def discard(session, previous_transaction):
+            if not session.in_transaction():
+                session.info.pop(self._info_key, None)
@@ -0,0 +1,201 @@
+import os
+import random
+from collections import Counter
+from sqlalchemy import and_, delete, event, func, inspect, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, object_session
+from models import db
+from models.blog import Blog
+from models.booking import Booking
+from models.document import Document
+from models.invoice import Invoice, InvoiceStatus
+from models.payment import Payment
+from models.service import Service
+from models.stats_counter import StatsCounter
+from models.ticket import Ticket, TicketStatus
+from models.user import User, Role
+
+# scope_id of counters that are not per client
+GLOBAL = 0
+# Rows each GLOBAL counter is spread over
+STATS_COUNTER_SLOTS = int(os.getenv("FLASK_STATS_COUNTER_SLOTS", "16"))
+
+
+def _value(value):
+    return getattr(value, "value", value)
+
+
+def booking_counters(row):
+    return [("bookings", GLOBAL), ("bookings.client", row["client_id"])]
+
+
+def user_counters(row):
+    return (
+        [("users.client", GLOBAL)] if _value(row["role"]) == Role.CLIENT.value else []
+    )
+
+
+def invoice_counters(row):
+    if _value(row["status"]) != InvoiceStatus.paid.value:
+        return []
+    return [("invoices.paid.client", row["client_id"])]
+
+
+def ticket_counters(row):
+    status = _value(row["status"])
+    return [
+        (f"tickets.{status}", GLOBAL),
+        (f"tickets.{status}.client", row["client_id"]),
+    ]
+
+
+# model -> (columns the counters depend on, row -> counter keys). Counters
+# move with ORM flushes only; bulk Query.update()/delete() calls that touch
+# these columns must be followed by `flask recompute-stats`.
+TRACKED = {
+    Booking: (("client_id",), booking_counters),
+    Service: ((), lambda row: [("services", GLOBAL)]),
+    Payment: ((), lambda row: [("payments", GLOBAL)]),
+    User: (("role",), user_counters),
+    Blog: ((), lambda row: [("blogs", GLOBAL)]),
+    Document: ((), lambda row: [("documents", GLOBAL)]),
+    Invoice: (("client_id", "status"), invoice_counters),
+    Ticket: (("client_id", "status"), ticket_counters),
+}
+
+
+def ticket_status_keys(client_id=None):
+    """Counter keys of every ticket status, for all tickets or one client's."""
+    if client_id is None:
+        return [(f"tickets.{s.value}", GLOBAL) for s in TicketStatus]
+    return [(f"tickets.{s.value}.client", client_id) for s in TicketStatus]
+
+
+def read_counters(keys):
+    """Values of the given (name, scope_id) counters, 0 for missing rows."""
+    keys = list(keys)
+    rows = (
+        db.session.query(
+            StatsCounter.name, StatsCounter.scope_id, func.sum(StatsCounter.value)
+        )
+        .filter(
+            or_(
+                *(
+                    and_(StatsCounter.name == name, StatsCounter.scope_id == scope_id)
+                    for name, scope_id in keys
+                )
+            )
+        )
+        .group_by(StatsCounter.name, StatsCounter.scope_id)
+    )
+    values = {(name, scope_id): value for name, scope_id, value in rows}
+    return [int(values.get(key) or 0) for key in keys]
+
+
+def bump_counters(connection, deltas):
+    """
+    Add ``deltas`` {(name, scope_id): delta} to the counters in one upsert.
+    GLOBAL counters go to a random slot, per-client counters to slot 0.
+    """
+    slot = random.randrange(max(STATS_COUNTER_SLOTS, 1))
+    rows = sorted(
+        (name, scope_id, slot if scope_id == GLOBAL else 0, delta)
+        for (name, scope_id), delta in deltas.items()
+        if delta
+    )
+    if not rows:
+        return
+
+    table = StatsCounter.__table__
+    insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(table).values(
+        [
+            {"name": name, "scope_id": scope_id, "slot": slot, "value": delta}
+            for name, scope_id, slot, delta in rows
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.name, table.c.scope_id, table.c.slot],
+        set_={"value": table.c.value + stmt.excluded.value},
+    )
+    connection.execute(stmt)
+
+
+def recompute_stats():
+    """Rebuild every counter from grouped counts of the tracked tables."""
+    totals = Counter()
+    for model, (columns, counters) in TRACKED.items():
+        group = [getattr(model, column) for column in columns]
+        query = db.session.query(*group, func.count()).select_from(model)
+        if group:
+            query = query.group_by(*group)
+        for *values, count in query:
+            for key in counters(dict(zip(columns, values))):
+                totals[key] += count
+
+    db.session.execute(delete(StatsCounter))
+    db.session.add_all(
+        StatsCounter(name=name, scope_id=scope_id, value=value)
+        for (name, scope_id), value in totals.items()
+    )
+    db.session.commit()
+    return len(totals)
+
+
+def _row(target, columns, previous=False):
+    state = inspect(target)
+    row = {}
+    for column in columns:
+        row[column] = getattr(target, column)
+        if previous:
+            deleted = state.attrs[column].history.deleted
+            if deleted:
+                row[column] = deleted[0]
+    return row
+
+
+def _pending(target):
+    return object_session(target).info.setdefault("stats_deltas", Counter())
+
+
+def _track(model, columns, counters):
+    # Load the old value on assignment so updates know which counters to move
+    for column in columns:
+        event.listen(
+            getattr(model, column), "set", lambda *args: None, active_history=True
+        )
+
+    @event.listens_for(model, "after_insert")
+    def after_insert(mapper, connection, target):
+        _pending(target).update(counters(_row(target, columns)))
+
+    @event.listens_for(model, "after_update")
+    def after_update(mapper, connection, target):
+        old = counters(_row(target, columns, previous=True))
+        new = counters(_row(target, columns))
+        if old != new:
+            deltas = _pending(target)
+            deltas.subtract(old)
+            deltas.update(new)
+
+    # The row is still there to read columns from before it is deleted
+    @event.listens_for(model, "before_delete")
+    def before_delete(mapper, connection, target):
+        _pending(target).subtract(counters(_row(target, columns)))
+
+
+for _model, (_columns, _counters) in TRACKED.items():
+    _track(_model, _columns, _counters)
+
+
+@event.listens_for(Session, "after_flush")
+def _write_stats_deltas(session, flush_context):
+    deltas = session.info.pop("stats_deltas", None)
+    if deltas:
+        bump_counters(session.connection(), deltas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stats_deltas(session):
+    session.info.pop("stats_deltas", None)